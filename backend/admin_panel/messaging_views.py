@@ -6,13 +6,13 @@ from django.views.decorators.csrf import csrf_exempt
 from django.db.models import Q, Max
 from core.models import User
 import json
-import mysql.connector
 from datetime import datetime
 import hashlib
 
 
 def get_mysql_connection():
     """Get a connection to the frontend MySQL database"""
+    import mysql.connector
     return mysql.connector.connect(
         host='localhost',
         user='root',
@@ -1,3 +1,109 @@
+from django.contrib.messages import get_messages
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
-# Create your tests here.
+from core import audit
+from core.bulk import bulk_update
+from core.models import AuditEvent, User
+from financial.models import LoanApplication
+from jobs.models import Company, Job
+
+
+class BulkActionTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(email='admin@example.com', password='password123', role='admin')
+        self.client.force_login(self.admin)
+        self.company = Company.objects.create(name='Acme', slug='acme')
+        self.addCleanup(audit.buffer.events.clear)
+
+    def make_jobs(self, count, status='draft'):
+        start = Job.objects.count()
+        return [
+            Job.objects.create(
+                title=f'Job {index}', slug=f'job-{index}', description='...', company=self.company,
+                location='Remote', job_type='full-time', status=status,
+            )
+            for index in range(start, start + count)
+        ]
+
+    def test_selected_ids_are_updated_and_logged(self):
+        drafts = self.make_jobs(3)
+        published = self.make_jobs(1, status='published')[0]
+        published_at = Job.objects.get(pk=published.pk).published_at
+
+        ids = ','.join(str(job.pk) for job in drafts + [published])
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/admin-panel/bulk/jobs/publish/', {'ids': ids})
+        audit.flush()
+
+        self.assertEqual([str(message) for message in get_messages(response.wsgi_request)], ['3 jobs published.'])
+        self.assertEqual(Job.objects.filter(status='published').count(), 4)
+        # Rows already in the target state are neither touched nor logged
+        self.assertEqual(Job.objects.get(pk=published.pk).published_at, published_at)
+        events = AuditEvent.objects.by_actor(self.admin)
+        self.assertEqual(sorted(event.entity_id for event in events), sorted(job.pk for job in drafts))
+        self.assertEqual({event.action for event in events}, {'publish'})
+        self.assertEqual(events[0].changes['status'], ['draft', 'published'])
+
+    def test_select_all_applies_the_list_filters(self):
+        drafts = self.make_jobs(2)
+        self.make_jobs(2, status='published')
+
+        self.client.post('/admin-panel/bulk/jobs/archive/', {'select': 'all', 'status': 'draft'})
+
+        self.assertEqual(set(Job.objects.filter(status='archived')), set(drafts))
+
+    def test_user_resources_only_reach_their_role(self):
+        employer = User.objects.create_user(email='boss@example.com', password='password123', role='employer')
+
+        self.client.post('/admin-panel/bulk/employers/suspend/', {
+            'ids': [employer.pk, self.admin.pk], 'reason': 'Spam',
+        })
+
+        self.assertTrue(User.objects.get(pk=employer.pk).is_suspended)
+        self.assertEqual(User.objects.get(pk=employer.pk).suspend_reason, 'Spam')
+        self.assertFalse(User.objects.get(pk=self.admin.pk).is_suspended)
+
+    def test_financial_actions_record_the_reviewer(self):
+        loan = LoanApplication.objects.create(
+            user=self.admin, loan_type='personal', amount=1000, credit_score_range='good',
+            full_name='Ada', email='ada@example.com', phone='1', address='-',
+            annual_income=1, monthly_rent_mortgage=1, employment_status='employed',
+        )
+
+        self.client.post('/admin-panel/bulk/loans/approve/', {'ids': loan.pk})
+
+        loan.refresh_from_db()
+        self.assertEqual((loan.status, loan.reviewed_by), ('approved', self.admin))
+        self.assertIsNotNone(loan.reviewed_at)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/admin-panel/loans/{loan.pk}/reject/')
+        audit.flush()
+        event = AuditEvent.objects.for_entity(loan).get()
+        self.assertEqual((event.action, event.actor_id), ('reject', self.admin.pk))
+        self.assertEqual(event.changes, {'status': ['approved', 'rejected']})
+
+    def test_queries_per_batch_do_not_grow_with_rows(self):
+        def queries_for(rows):
+            Job.objects.update(status='closed')
+            self.make_jobs(rows)
+            with CaptureQueriesContext(connection) as queries:
+                changed = bulk_update(Job.objects.filter(status='draft'), {'status': 'published'}, self.admin, 'publish')
+            self.assertEqual(changed, rows)
+            return len(queries)
+
+        self.assertEqual(queries_for(2), queries_for(20))
+
+    def test_batches_cover_a_selection_the_update_changes(self):
+        self.make_jobs(5)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            changed = bulk_update(
+                Job.objects.filter(status='draft'), {'status': 'closed'}, self.admin, 'close', batch_size=2,
+            )
+        audit.flush()
+
+        self.assertEqual(changed, 5)
+        self.assertEqual(AuditEvent.objects.filter(action='close').count(), 5)
@@ -79,4 +79,7 @@ urlpatterns = [
     path('employers/<int:user_id>/feature/', views.employer_feature, name='employer_feature'),
     path('employers/<int:user_id>/suspend/', views.employer_suspend, name='employer_suspend'),
     path('employers/<int:user_id>/delete/', views.employer_delete, name='employer_delete'),
+    
+    # Bulk actions (jobs, companies, job-seekers, employers, loans, withdrawals)
+    path('bulk/<slug:resource>/<slug:action>/', views.bulk_action, name='bulk_action'),
 ]
@@ -3,11 +3,19 @@ from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
 from django.db.models import Sum, Count, Q
-from django.http import HttpResponseForbidden
+from django.http import Http404, HttpResponseForbidden
+from django.utils import timezone
 
+from core import audit
+from core.bulk import bulk_update
+from core.cache import bump_version_on_commit, profile_namespace
+from core.db_router import replica_reads
 from core.models import User
-from jobs.models import Job, Company, Application
+from jobs.models import Job, Company, Application, Resume
 from financial.models import LoanApplication, Withdrawal, CreditCardDebt, TaxRefund
+from core.skills import resolve_skills, split_skills
+from jobs.skill_index import sync_job_skills
+from jobs.resume_index import search_resumes
 
 
 def is_admin(user):
@@ -46,6 +54,7 @@ def admin_logout(request):
 
 @login_required(login_url='/admin-panel/login/')
 @user_passes_test(is_admin, login_url='/admin-panel/login/')
+@replica_reads
 def dashboard(request):
     """Admin dashboard view"""
     # Get statistics
@@ -73,24 +82,20 @@ def dashboard(request):
     return render(request, 'admin_panel/dashboard.html', context)
 
 
-@login_required(login_url='/admin-panel/login/')
-@user_passes_test(is_admin, login_url='/admin-panel/login/')
-def jobs_list(request):
-    """Jobs list view with filtering"""
-    jobs = Job.objects.select_related('company', 'posted_by').order_by('-created_at')
-    
+def filter_jobs(jobs, params):
+    """Jobs list filters (``status``, ``type``, ``search``, ``featured``), shared with the bulk actions"""
     # Filter by status
-    status_filter = request.GET.get('status')
+    status_filter = params.get('status')
     if status_filter and status_filter != 'all':
         jobs = jobs.filter(status=status_filter)
     
     # Filter by job type
-    type_filter = request.GET.get('type')
+    type_filter = params.get('type')
     if type_filter and type_filter != 'all':
         jobs = jobs.filter(job_type=type_filter)
     
     # Search
-    search_query = request.GET.get('search')
+    search_query = params.get('search')
     if search_query:
         jobs = jobs.filter(
             Q(title__icontains=search_query) |
@@ -99,9 +104,21 @@ def jobs_list(request):
         )
     
     # Filter by featured
-    featured_filter = request.GET.get('featured')
-    if featured_filter == 'true':
+    if params.get('featured') == 'true':
         jobs = jobs.filter(is_featured=True)
+    return jobs
+
+
+@login_required(login_url='/admin-panel/login/')
+@user_passes_test(is_admin, login_url='/admin-panel/login/')
+@replica_reads
+def jobs_list(request):
+    """Jobs list view with filtering"""
+    jobs = filter_jobs(Job.objects.select_related('company', 'posted_by'), request.GET).order_by('-created_at')
+    status_filter = request.GET.get('status')
+    type_filter = request.GET.get('type')
+    search_query = request.GET.get('search')
+    featured_filter = request.GET.get('featured')
     
     # Get counts for stats
     all_jobs = Job.objects.all()
@@ -119,12 +136,14 @@ def jobs_list(request):
         'type_filter': type_filter or 'all',
         'search_query': search_query or '',
         'featured_filter': featured_filter or '',
+        'bulk_actions': list(BULK_ACTIONS['jobs']['actions']),
     }
     return render(request, 'admin_panel/jobs_list.html', context)
 
 
 @login_required(login_url='/admin-panel/login/')
 @user_passes_test(is_admin, login_url='/admin-panel/login/')
+@replica_reads
 def job_detail(request, job_id):
     """View job details"""
     job = get_object_or_404(Job.objects.select_related('company', 'posted_by'), id=job_id)
@@ -163,9 +182,9 @@ def job_create(request):
             is_featured = request.POST.get('is_featured') == 'on'
             is_urgent = request.POST.get('is_urgent') == 'on'
             
-            # Parse skills from comma-separated
-            skills_input = request.POST.get('skills', '')
-            skills = [s.strip() for s in skills_input.split(',') if s.strip()]
+            # Parse skills from comma-separated and map them to canonical names
+            skill_objects = resolve_skills(split_skills(request.POST.get('skills', '')))
+            skills = [skill.name for skill in skill_objects]
             
             company = Company.objects.get(id=company_id)
             
@@ -199,6 +218,8 @@ def job_create(request):
                 is_urgent=is_urgent,
             )
             
+            sync_job_skills(job, skill_objects)
+            
             if status == 'published':
                 job.publish()
             
@@ -244,9 +265,9 @@ def job_edit(request, job_id):
             job.salary_max = int(salary_max) if salary_max else None
             job.show_salary = request.POST.get('show_salary') == 'on'
             
-            # Parse skills
-            skills_input = request.POST.get('skills', '')
-            job.skills = [s.strip() for s in skills_input.split(',') if s.strip()]
+            # Parse skills and map them to canonical names
+            skill_objects = resolve_skills(split_skills(request.POST.get('skills', '')))
+            job.skills = [skill.name for skill in skill_objects]
             
             old_status = job.status
             job.status = request.POST.get('status', 'draft')
@@ -268,6 +289,7 @@ def job_edit(request, job_id):
                 job.publish()
             else:
                 job.save()
+            sync_job_skills(job, skill_objects)
             
             messages.success(request, f'Job "{job.title}" has been updated successfully.')
             return redirect('/admin-panel/jobs/')
@@ -350,20 +372,11 @@ def job_delete(request, job_id):
 
 # ============== COMPANIES MANAGEMENT ==============
 
-@login_required(login_url='/admin-panel/login/')
-@user_passes_test(is_admin, login_url='/admin-panel/login/')
-def companies_list(request):
-    """Companies list view with search, filters and stats"""
-    # Get filter parameters
-    search_query = request.GET.get('search', '')
-    status_filter = request.GET.get('status', 'all')
-    size_filter = request.GET.get('size', 'all')
-    
-    # Base queryset with jobs count
-    companies = Company.objects.annotate(
-        jobs_count=Count('jobs'),
-        active_jobs_count=Count('jobs', filter=Q(jobs__status='published'))
-    )
+def filter_companies(companies, params):
+    """Companies list filters (``search``, ``status``, ``size``), shared with the bulk actions"""
+    search_query = params.get('search', '')
+    status_filter = params.get('status', 'all')
+    size_filter = params.get('size', 'all')
     
     # Apply search filter
     if search_query:
@@ -384,8 +397,24 @@ def companies_list(request):
     # Apply size filter
     if size_filter != 'all':
         companies = companies.filter(company_size=size_filter)
+    return companies
+
+
+@login_required(login_url='/admin-panel/login/')
+@user_passes_test(is_admin, login_url='/admin-panel/login/')
+@replica_reads
+def companies_list(request):
+    """Companies list view with search, filters and stats"""
+    # Get filter parameters
+    search_query = request.GET.get('search', '')
+    status_filter = request.GET.get('status', 'all')
+    size_filter = request.GET.get('size', 'all')
     
-    companies = companies.order_by('-created_at')
+    # Base queryset with jobs count
+    companies = filter_companies(Company.objects.all(), request.GET).annotate(
+        jobs_count=Count('jobs'),
+        active_jobs_count=Count('jobs', filter=Q(jobs__status='published'))
+    ).order_by('-created_at')
     
     # Calculate stats
     stats = {
@@ -402,6 +431,7 @@ def companies_list(request):
         'status_filter': status_filter,
         'size_filter': size_filter,
         'company_sizes': Company.COMPANY_SIZE_CHOICES,
+        'bulk_actions': list(BULK_ACTIONS['companies']['actions']),
     }
     return render(request, 'admin_panel/companies_list.html', context)
 
@@ -525,6 +555,7 @@ def company_edit(request, company_id):
 
 @login_required(login_url='/admin-panel/login/')
 @user_passes_test(is_admin, login_url='/admin-panel/login/')
+@replica_reads
 def company_detail(request, company_id):
     """Company detail view with all jobs and stats"""
     company = get_object_or_404(Company, id=company_id)
@@ -608,6 +639,7 @@ def company_suspend(request, company_id):
         company = get_object_or_404(Company, id=company_id)
         # Close all published jobs
         closed_count = company.jobs.filter(status='published').update(status='closed')
+        bump_version_on_commit('jobs')
         company.is_verified = False
         company.save()
         messages.success(request, f'Company "{company.name}" has been suspended. {closed_count} jobs closed.')
@@ -628,6 +660,7 @@ def company_delete(request, company_id):
 
 @login_required(login_url='/admin-panel/login/')
 @user_passes_test(is_admin, login_url='/admin-panel/login/')
+@replica_reads
 def users_list(request):
     """Users list view"""
     users = User.objects.order_by('-created_at')
@@ -660,6 +693,7 @@ def user_deactivate(request, user_id):
 
 @login_required(login_url='/admin-panel/login/')
 @user_passes_test(is_admin, login_url='/admin-panel/login/')
+@replica_reads
 def applications_list(request):
     """Applications list view with stats"""
     from django.db.models import Count, Q
@@ -687,6 +721,7 @@ def applications_list(request):
 
 @login_required(login_url='/admin-panel/login/')
 @user_passes_test(is_admin, login_url='/admin-panel/login/')
+@replica_reads
 def application_detail(request, app_id):
     """Application detail view"""
     application = get_object_or_404(
@@ -732,10 +767,14 @@ def application_status(request, app_id):
 
 @login_required(login_url='/admin-panel/login/')
 @user_passes_test(is_admin, login_url='/admin-panel/login/')
+@replica_reads
 def loans_list(request):
     """Loan applications list view"""
     loans = LoanApplication.objects.select_related('user').order_by('-created_at')
-    return render(request, 'admin_panel/loans_list.html', {'loans': loans})
+    return render(request, 'admin_panel/loans_list.html', {
+        'loans': loans,
+        'bulk_actions': list(BULK_ACTIONS['loans']['actions']),
+    })
 
 
 @login_required(login_url='/admin-panel/login/')
@@ -744,8 +783,10 @@ def loan_approve(request, loan_id):
     """Approve a loan"""
     if request.method == 'POST':
         loan = get_object_or_404(LoanApplication, id=loan_id)
+        before = audit.snapshot(loan, 'status')
         loan.status = 'approved'
         loan.save()
+        audit.record(loan, 'approve', request.user, before)
         messages.success(request, f'Loan application #{loan.id} has been approved.')
     return redirect('/admin-panel/loans/')
 
@@ -756,18 +797,24 @@ def loan_reject(request, loan_id):
     """Reject a loan"""
     if request.method == 'POST':
         loan = get_object_or_404(LoanApplication, id=loan_id)
+        before = audit.snapshot(loan, 'status')
         loan.status = 'rejected'
         loan.save()
+        audit.record(loan, 'reject', request.user, before)
         messages.success(request, f'Loan application #{loan.id} has been rejected.')
     return redirect('/admin-panel/loans/')
 
 
 @login_required(login_url='/admin-panel/login/')
 @user_passes_test(is_admin, login_url='/admin-panel/login/')
+@replica_reads
 def withdrawals_list(request):
     """Withdrawals list view"""
     withdrawals = Withdrawal.objects.select_related('user', 'loan_application').order_by('-created_at')
-    return render(request, 'admin_panel/withdrawals_list.html', {'withdrawals': withdrawals})
+    return render(request, 'admin_panel/withdrawals_list.html', {
+        'withdrawals': withdrawals,
+        'bulk_actions': list(BULK_ACTIONS['withdrawals']['actions']),
+    })
 
 
 @login_required(login_url='/admin-panel/login/')
@@ -776,8 +823,10 @@ def withdrawal_process(request, withdrawal_id):
     """Process a withdrawal"""
     if request.method == 'POST':
         withdrawal = get_object_or_404(Withdrawal, id=withdrawal_id)
+        before = audit.snapshot(withdrawal, 'status')
         withdrawal.status = 'processing'
         withdrawal.save()
+        audit.record(withdrawal, 'process', request.user, before)
         messages.success(request, f'Withdrawal #{withdrawal.id} is now processing.')
     return redirect('/admin-panel/withdrawals/')
 
@@ -788,8 +837,10 @@ def withdrawal_complete(request, withdrawal_id):
     """Complete a withdrawal"""
     if request.method == 'POST':
         withdrawal = get_object_or_404(Withdrawal, id=withdrawal_id)
+        before = audit.snapshot(withdrawal, 'status')
         withdrawal.status = 'completed'
         withdrawal.save()
+        audit.record(withdrawal, 'complete', request.user, before)
         messages.success(request, f'Withdrawal #{withdrawal.id} has been completed.')
     return redirect('/admin-panel/withdrawals/')
 
@@ -800,14 +851,17 @@ def withdrawal_reject(request, withdrawal_id):
     """Reject a withdrawal"""
     if request.method == 'POST':
         withdrawal = get_object_or_404(Withdrawal, id=withdrawal_id)
+        before = audit.snapshot(withdrawal, 'status')
         withdrawal.status = 'rejected'
         withdrawal.save()
+        audit.record(withdrawal, 'reject', request.user, before)
         messages.success(request, f'Withdrawal #{withdrawal.id} has been rejected.')
     return redirect('/admin-panel/withdrawals/')
 
 
 @login_required(login_url='/admin-panel/login/')
 @user_passes_test(is_admin, login_url='/admin-panel/login/')
+@replica_reads
 def credit_cards_list(request):
     """Credit card debt applications list view"""
     applications = CreditCardDebt.objects.select_related('user').order_by('-created_at')
@@ -816,6 +870,7 @@ def credit_cards_list(request):
 
 @login_required(login_url='/admin-panel/login/')
 @user_passes_test(is_admin, login_url='/admin-panel/login/')
+@replica_reads
 def tax_refunds_list(request):
     """Tax refund applications list view"""
     applications = TaxRefund.objects.select_related('user').order_by('-created_at')
@@ -825,20 +880,12 @@ def tax_refunds_list(request):
 # ==================== USERS MANAGEMENT VIEWS ====================
 
 # Job Seekers Management
-@login_required(login_url='/admin-panel/login/')
-@user_passes_test(is_admin, login_url='/admin-panel/login/')
-def job_seekers_list(request):
-    """Job seekers list view with search and filters"""
-    # Base queryset for job seekers
-    seekers = User.objects.filter(role='job_seeker').annotate(
-        applications_count=Count('applications', distinct=True),
-        experiences_count=Count('experiences', distinct=True),
-        educations_count=Count('education', distinct=True),
-        skills_count=Count('skills', distinct=True)
-    )
+def filter_job_seekers(users, params):
+    """Job seekers list filters (``search``, ``resume_q``, ``status``), shared with the bulk actions"""
+    seekers = users.filter(role='job_seeker')
     
     # Search
-    search_query = request.GET.get('search', '')
+    search_query = params.get('search', '')
     if search_query:
         seekers = seekers.filter(
             Q(first_name__icontains=search_query) |
@@ -849,8 +896,14 @@ def job_seekers_list(request):
             Q(location__icontains=search_query)
         )
     
+    # Resume content search (uses the resume term index)
+    resume_query = params.get('resume_q', '')
+    if resume_query:
+        matching_resumes = search_resumes(resume_query).values('resume_id')
+        seekers = seekers.filter(id__in=Resume.objects.filter(id__in=matching_resumes).values('user_id'))
+    
     # Filters
-    status_filter = request.GET.get('status', '')
+    status_filter = params.get('status', '')
     if status_filter == 'verified':
         seekers = seekers.filter(is_verified=True)
     elif status_filter == 'unverified':
@@ -863,6 +916,24 @@ def job_seekers_list(request):
         seekers = seekers.filter(is_active=True, is_suspended=False)
     elif status_filter == 'open_to_work':
         seekers = seekers.filter(open_to_work=True)
+    return seekers
+
+
+@login_required(login_url='/admin-panel/login/')
+@user_passes_test(is_admin, login_url='/admin-panel/login/')
+@replica_reads
+def job_seekers_list(request):
+    """Job seekers list view with search and filters"""
+    # Base queryset for job seekers
+    seekers = filter_job_seekers(User.objects.all(), request.GET).annotate(
+        applications_count=Count('applications', distinct=True),
+        experiences_count=Count('experiences', distinct=True),
+        educations_count=Count('education', distinct=True),
+        skills_count=Count('skills', distinct=True)
+    )
+    search_query = request.GET.get('search', '')
+    resume_query = request.GET.get('resume_q', '')
+    status_filter = request.GET.get('status', '')
     
     # Ordering
     order_by = request.GET.get('order_by', '-created_at')
@@ -881,8 +952,10 @@ def job_seekers_list(request):
         'seekers': seekers,
         'stats': stats,
         'search_query': search_query,
+        'resume_query': resume_query,
         'status_filter': status_filter,
         'order_by': order_by,
+        'bulk_actions': list(BULK_ACTIONS['job-seekers']['actions']),
     }
     
     return render(request, 'admin_panel/job_seekers_list.html', context)
@@ -890,6 +963,7 @@ def job_seekers_list(request):
 
 @login_required(login_url='/admin-panel/login/')
 @user_passes_test(is_admin, login_url='/admin-panel/login/')
+@replica_reads
 def job_seeker_detail(request, user_id):
     """Job seeker detail view"""
     seeker = get_object_or_404(User, id=user_id, role='job_seeker')
@@ -963,6 +1037,7 @@ def job_seeker_suspend(request, user_id):
     """Suspend/unsuspend a job seeker"""
     if request.method == 'POST':
         seeker = get_object_or_404(User, id=user_id, role='job_seeker')
+        before = audit.snapshot(seeker, 'is_suspended', 'suspend_reason')
         seeker.is_suspended = not seeker.is_suspended
         
         if seeker.is_suspended:
@@ -971,6 +1046,7 @@ def job_seeker_suspend(request, user_id):
             seeker.suspend_reason = None
         
         seeker.save()
+        audit.record(seeker, 'suspend' if seeker.is_suspended else 'unsuspend', request.user, before)
         
         status = "suspended" if seeker.is_suspended else "reactivated"
         messages.success(request, f'{seeker.full_name} has been {status}.')
@@ -992,18 +1068,12 @@ def job_seeker_delete(request, user_id):
 
 
 # Employers Management
-@login_required(login_url='/admin-panel/login/')
-@user_passes_test(is_admin, login_url='/admin-panel/login/')
-def employers_list(request):
-    """Employers list view with search and filters"""
-    # Base queryset for employers
-    employers = User.objects.filter(role='employer').annotate(
-        jobs_count=Count('posted_jobs', distinct=True),
-        active_jobs_count=Count('posted_jobs', filter=Q(posted_jobs__status='published'), distinct=True)
-    )
+def filter_employers(users, params):
+    """Employers list filters (``search``, ``status``), shared with the bulk actions"""
+    employers = users.filter(role='employer')
     
     # Search
-    search_query = request.GET.get('search', '')
+    search_query = params.get('search', '')
     if search_query:
         employers = employers.filter(
             Q(first_name__icontains=search_query) |
@@ -1014,7 +1084,7 @@ def employers_list(request):
         )
     
     # Filters
-    status_filter = request.GET.get('status', '')
+    status_filter = params.get('status', '')
     if status_filter == 'verified':
         employers = employers.filter(is_verified=True)
     elif status_filter == 'unverified':
@@ -1025,6 +1095,21 @@ def employers_list(request):
         employers = employers.filter(is_suspended=True)
     elif status_filter == 'active':
         employers = employers.filter(is_active=True, is_suspended=False)
+    return employers
+
+
+@login_required(login_url='/admin-panel/login/')
+@user_passes_test(is_admin, login_url='/admin-panel/login/')
+@replica_reads
+def employers_list(request):
+    """Employers list view with search and filters"""
+    # Base queryset for employers
+    employers = filter_employers(User.objects.all(), request.GET).annotate(
+        jobs_count=Count('posted_jobs', distinct=True),
+        active_jobs_count=Count('posted_jobs', filter=Q(posted_jobs__status='published'), distinct=True)
+    )
+    search_query = request.GET.get('search', '')
+    status_filter = request.GET.get('status', '')
     
     # Ordering
     order_by = request.GET.get('order_by', '-created_at')
@@ -1045,6 +1130,7 @@ def employers_list(request):
         'search_query': search_query,
         'status_filter': status_filter,
         'order_by': order_by,
+        'bulk_actions': list(BULK_ACTIONS['employers']['actions']),
     }
     
     return render(request, 'admin_panel/employers_list.html', context)
@@ -1052,6 +1138,7 @@ def employers_list(request):
 
 @login_required(login_url='/admin-panel/login/')
 @user_passes_test(is_admin, login_url='/admin-panel/login/')
+@replica_reads
 def employer_detail(request, user_id):
     """Employer detail view"""
     employer = get_object_or_404(User, id=user_id, role='employer')
@@ -1128,6 +1215,7 @@ def employer_suspend(request, user_id):
     """Suspend/unsuspend an employer"""
     if request.method == 'POST':
         employer = get_object_or_404(User, id=user_id, role='employer')
+        before = audit.snapshot(employer, 'is_suspended', 'suspend_reason')
         employer.is_suspended = not employer.is_suspended
         
         if employer.is_suspended:
@@ -1136,6 +1224,7 @@ def employer_suspend(request, user_id):
             employer.suspend_reason = None
         
         employer.save()
+        audit.record(employer, 'suspend' if employer.is_suspended else 'unsuspend', request.user, before)
         
         status = "suspended" if employer.is_suspended else "reactivated"
         messages.success(request, f'{employer.full_name} has been {status}.')
@@ -1154,3 +1243,153 @@ def employer_delete(request, user_id):
         messages.success(request, f'{employer_name} account has been permanently deleted.')
     
     return redirect('/admin-panel/employers/')
+
+
+# ============== BULK ACTIONS ==============
+
+def _actor(request):
+    return request.user
+
+
+def _now(request):
+    return timezone.now()
+
+
+def _suspend_reason(request):
+    return request.POST.get('reason', '')
+
+
+def _status_filter(queryset):
+    def select(params):
+        status_filter = params.get('status', 'all')
+        return queryset if status_filter == 'all' else queryset.filter(status=status_filter)
+    return select
+
+
+def _flag_actions(field, on, off):
+    """Set and unset actions for a boolean ``field``; ``on``/``off`` are ``(action, past tense)``"""
+    return {
+        on[0]: {'values': {field: True}, 'skip': Q(**{field: True}), 'done': on[1]},
+        off[0]: {'values': {field: False}, 'skip': Q(**{field: False}), 'done': off[1]},
+    }
+
+
+def _user_actions():
+    return {
+        **_flag_actions('is_verified', ('verify', 'verified'), ('unverify', 'unverified')),
+        **_flag_actions('is_featured', ('feature', 'featured'), ('unfeature', 'unfeatured')),
+        'suspend': {
+            'values': {'is_suspended': True, 'suspend_reason': _suspend_reason},
+            'skip': Q(is_suspended=True), 'done': 'suspended',
+        },
+        'unsuspend': {
+            'values': {'is_suspended': False, 'suspend_reason': None},
+            'skip': Q(is_suspended=False), 'done': 'reactivated',
+        },
+    }
+
+
+def _user_namespaces(ids):
+    return [profile_namespace(user_id) for user_id in ids]
+
+
+# resource (URL prefix of its list page) -> how to select rows and the actions on them.
+# 'values' may hold functions of the request; rows matching 'skip' already are in the
+# target state and are neither updated nor logged.
+BULK_ACTIONS = {
+    'jobs': {
+        'select': lambda params: filter_jobs(Job.objects.all(), params),
+        'noun': 'jobs', 'namespaces': lambda ids: ['jobs'],
+        'actions': {
+            'publish': {
+                'values': {'status': 'published', 'published_at': _now},
+                'skip': Q(status='published'), 'done': 'published',
+            },
+            'close': {'values': {'status': 'closed'}, 'skip': Q(status='closed'), 'done': 'closed'},
+            'archive': {'values': {'status': 'archived'}, 'skip': Q(status='archived'), 'done': 'archived'},
+            **_flag_actions('is_featured', ('feature', 'featured'), ('unfeature', 'unfeatured')),
+        },
+    },
+    'companies': {
+        'select': lambda params: filter_companies(Company.objects.all(), params),
+        'noun': 'companies', 'namespaces': lambda ids: ['companies'],
+        'actions': {
+            **_flag_actions('is_verified', ('verify', 'verified'), ('unverify', 'unverified')),
+            **_flag_actions('is_featured', ('feature', 'featured'), ('unfeature', 'unfeatured')),
+        },
+    },
+    'job-seekers': {
+        'select': lambda params: filter_job_seekers(User.objects.all(), params),
+        'noun': 'job seekers', 'namespaces': _user_namespaces,
+        'actions': _user_actions(),
+    },
+    'employers': {
+        'select': lambda params: filter_employers(User.objects.all(), params),
+        'noun': 'employers', 'namespaces': _user_namespaces,
+        'actions': _user_actions(),
+    },
+    'loans': {
+        'select': _status_filter(LoanApplication.objects.all()),
+        'noun': 'loan applications', 'namespaces': None,
+        'actions': {
+            action: {
+                'values': {'status': status, 'reviewed_by': _actor, 'reviewed_at': _now},
+                'skip': Q(status=status), 'done': done,
+            }
+            for action, status, done in [
+                ('approve', 'approved', 'approved'),
+                ('reject', 'rejected', 'rejected'),
+                ('review', 'under_review', 'marked as under review'),
+            ]
+        },
+    },
+    'withdrawals': {
+        'select': _status_filter(Withdrawal.objects.all()),
+        'noun': 'withdrawals', 'namespaces': None,
+        'actions': {
+            action: {
+                'values': {'status': status, 'processed_by': _actor, 'processed_at': _now},
+                'skip': Q(status=status), 'done': done,
+            }
+            for action, status, done in [
+                ('process', 'processing', 'marked as processing'),
+                ('complete', 'completed', 'completed'),
+                ('fail', 'failed', 'marked as failed'),
+            ]
+        },
+    },
+}
+
+
+@login_required(login_url='/admin-panel/login/')
+@user_passes_test(is_admin, login_url='/admin-panel/login/')
+def bulk_action(request, resource, action):
+    """Apply one action to many rows with batched UPDATEs.
+
+    Acts on the posted ``ids`` (repeated or comma separated), or with
+    ``select=all`` on every row matching the list filters posted along.
+    """
+    spec = BULK_ACTIONS.get(resource)
+    if spec is None or action not in spec['actions']:
+        raise Http404
+    next_url = request.META.get('HTTP_REFERER', f'/admin-panel/{resource}/')
+    if request.method != 'POST':
+        return redirect(next_url)
+    
+    if request.POST.get('select') == 'all':
+        queryset = spec['select'](request.POST)
+    else:
+        ids = [int(pk) for value in request.POST.getlist('ids') for pk in value.split(',') if pk.strip().isdigit()]
+        if not ids:
+            messages.error(request, 'No items selected.')
+            return redirect(next_url)
+        # Selecting through the unfiltered list keeps e.g. admins out of the job seeker actions
+        queryset = spec['select']({}).filter(pk__in=ids)
+    
+    bulk = spec['actions'][action]
+    values = {name: value(request) if callable(value) else value for name, value in bulk['values'].items()}
+    changed = bulk_update(
+        queryset, values, request.user, action, skip=bulk['skip'], namespaces=spec['namespaces'],
+    )
+    messages.success(request, f"{changed} {spec['noun']} {bulk['done']}.")
+    return redirect(next_url)
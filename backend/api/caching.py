@@ -0,0 +1,128 @@
+"""
+Response caching for public, read-mostly endpoints.
+
+``CachedResponseMixin`` stores the rendered bytes of a GET response keyed on
+the view, the normalized query string and the viewer class (e.g. anonymous
+visitors and applicants see the same job list, employers do not). Keys embed
+the versions of the namespaces the view reads (see ``core.cache``), so a
+write to a job or company invalidates every cached page at once.
+
+Each entry carries a strong ETag computed from its bytes; ``If-None-Match``
+revalidation answers 304 without rendering anything. A cache hit for an
+anonymous visitor needs no database query. Misses go through
+``get_or_compute``, so an invalidated hot page is rebuilt once rather than
+by every worker at the same time.
+
+``profile_snapshot`` caches each user's serialized profile for ``MeView``
+under the user's own namespace, which any write to the user or their
+experiences, education, skills or certifications bumps.
+"""
+import hashlib
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+
+from core.cache import cache_key, get_or_compute, get_versions, profile_namespace
+
+from .renderers import dumps
+from .serializers import UserProfileSerializer
+
+
+def normalized_query(request):
+    """Query parameters in a canonical order, without empty values"""
+    params = sorted(
+        (key, value) for key, values in request.query_params.lists() for value in values if value != ''
+    )
+    return '&'.join(f"{key}={value}" for key, value in params)
+
+
+def content_etag(content):
+    return f'"{hashlib.sha256(content).hexdigest()[:40]}"'
+
+
+def etag_matches(request, etag):
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return False
+    tags = parse_etags(header)
+    # If-None-Match uses the weak comparison
+    return '*' in tags or etag.removeprefix('W/') in [tag.removeprefix('W/') for tag in tags]
+
+
+class CachedResponseMixin:
+    """Cache rendered ``list``/``retrieve`` responses of a viewset"""
+
+    # core.cache namespaces the response depends on
+    cache_namespaces = ()
+
+    def get_cache_viewer_class(self, request):
+        """Name of the group of viewers that all get the same response, or None to skip the cache"""
+        return 'public'
+
+    def response_cache_key(self, request, viewer):
+        versions = get_versions(*self.cache_namespaces)
+        parts = [
+            type(self).__name__, self.action, viewer,
+            request.scheme, request.get_host(), request.accepted_renderer.format,
+            ','.join(f"{key}={value}" for key, value in sorted(self.kwargs.items())),
+            ','.join(str(versions[namespace]) for namespace in self.cache_namespaces),
+            normalized_query(request),
+        ]
+        return cache_key('api-response', hashlib.sha1('|'.join(parts).encode()).hexdigest())
+
+    def cached_response(self, request, compute, *args, **kwargs):
+        viewer = self.get_cache_viewer_class(request)
+        if viewer is None or request.method != 'GET' or request.accepted_renderer.format != 'json':
+            return compute(request, *args, **kwargs)
+
+        uncached = []
+
+        def render():
+            response = compute(request, *args, **kwargs)
+            uncached.append(response)
+            if response.status_code != 200:
+                return None
+            response.accepted_renderer = request.accepted_renderer
+            response.accepted_media_type = request.accepted_media_type
+            response.renderer_context = self.get_renderer_context()
+            content = response.rendered_content
+            return {
+                'content': content,
+                'content_type': response['Content-Type'],
+                'etag': content_etag(content),
+            }
+
+        entry = get_or_compute(
+            self.response_cache_key(request, viewer), render,
+            timeout=getattr(settings, 'API_RESPONSE_CACHE_TIMEOUT', 300),
+        )
+        if entry is None:
+            return uncached[0]
+        status = 'MISS' if uncached else 'HIT'
+
+        if etag_matches(request, entry['etag']):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(entry['content'], content_type=entry['content_type'])
+        response['ETag'] = entry['etag']
+        response['Cache-Control'] = 'no-cache'
+        response['X-Cache'] = status
+        patch_vary_headers(response, ['Accept', 'Authorization'])
+        return response
+
+
+def profile_snapshot(user):
+    """``{'data': ..., 'etag': ...}`` of ``user``'s serialized profile, cached until the profile changes"""
+    namespace = profile_namespace(user.pk)
+    version = get_versions(namespace)[namespace]
+
+    def serialize():
+        data = UserProfileSerializer(user).data
+        return {'data': data, 'etag': content_etag(dumps(data))}
+
+    return get_or_compute(
+        cache_key('profile', user.pk, version), serialize,
+        timeout=getattr(settings, 'PROFILE_CACHE_TIMEOUT', 600),
+    )
@@ -0,0 +1,194 @@
+"""
+Compiled, read-only serialization for hot list endpoints.
+
+DRF renders a page by building a model instance per row and then walking
+every serializer field of every row. ``compile_serializer`` walks the
+(already sparse-field shaped) serializer once instead and produces a plan:
+the ``values()`` columns to select and a single row function that turns a
+values dict into exactly what the serializer would have returned. Per row it
+only does dictionary lookups plus the conversions DRF itself applies
+(``to_representation`` of date, choice and file fields), so the rendered
+JSON is byte-identical to the DRF path.
+
+Method fields opt in through the serializer's ``Meta``::
+
+    # the method is called with a light object carrying these columns
+    method_sources = {'salary_range': ('show_salary', 'salary_min', 'salary_max')}
+
+    # the value is selected with ``factory(prefix)`` instead of a query per row;
+    # ``prefix`` is the lookup of the row's object, e.g. '' or 'job__company__'
+    method_annotations = {'jobs_count': published_jobs_count}
+
+Serializers using anything else (to-many relations, dotted sources, other
+method or custom fields) are not compiled and callers fall back to DRF, as
+``CompiledListMixin`` does for a viewset's ``list`` action.
+"""
+from operator import itemgetter
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models.fields.files import FieldFile
+from rest_framework import serializers
+from rest_framework.response import Response
+
+
+# DRF fields whose to_representation() returns values of these model fields unchanged
+PASSTHROUGH_FIELDS = {
+    serializers.CharField: (models.CharField, models.TextField),
+    serializers.EmailField: models.EmailField,
+    serializers.SlugField: models.SlugField,
+    serializers.URLField: models.URLField,
+    serializers.IntegerField: models.IntegerField,
+    serializers.BooleanField: models.BooleanField,
+}
+
+# DRF fields whose to_representation() only depends on the value
+CONVERTED_FIELDS = frozenset({
+    *PASSTHROUGH_FIELDS,
+    serializers.ChoiceField, serializers.DateTimeField, serializers.DateField, serializers.TimeField,
+    serializers.DecimalField, serializers.FloatField, serializers.UUIDField, serializers.JSONField,
+})
+
+
+class NotCompilable(Exception):
+    """The serializer uses a field the compiler cannot reproduce"""
+
+
+class RowObject:
+    """Stand-in for a model instance, handed to method fields"""
+
+    def __init__(self, values):
+        self.__dict__.update(values)
+
+
+class CompiledSerializer:
+    """``values()`` columns and row function equivalent to a read-only serializer"""
+
+    def __init__(self, serializer):
+        self.columns = {}
+        self.annotations = {}
+        model = serializer.Meta.model
+        self.to_representation = self._compile(serializer, model, '')
+
+    def values(self, queryset):
+        # Prefetches cannot apply to dicts; joins come from the column lookups
+        return queryset.prefetch_related(None).values(*self.columns, **self.annotations)
+
+    def render(self, rows):
+        to_representation = self.to_representation
+        return [to_representation(row) for row in rows]
+
+    def _column(self, name):
+        self.columns[name] = None
+        return name
+
+    def _compile(self, serializer, model, prefix):
+        if not isinstance(serializer, serializers.ModelSerializer) or serializer.Meta.model is not model:
+            raise NotCompilable(type(serializer).__name__)
+        getters = tuple(
+            (name, self._getter(serializer, field, model, prefix))
+            for name, field in serializer.fields.items() if not field.write_only
+        )
+
+        def to_representation(row):
+            return {name: get(row) for name, get in getters}
+
+        return to_representation
+
+    def _getter(self, serializer, field, model, prefix):
+        if isinstance(field, serializers.SerializerMethodField):
+            return self._method_getter(serializer, field, model, prefix)
+        if isinstance(field, serializers.ListSerializer) or field.source == '*' or '.' in field.source:
+            raise NotCompilable(field.field_name)
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            raise NotCompilable(field.field_name)
+
+        if isinstance(field, serializers.BaseSerializer):
+            return self._nested_getter(field, model_field, prefix)
+        if model_field.is_relation:
+            raise NotCompilable(field.field_name)
+
+        column = self._column(prefix + field.source)
+        if isinstance(model_field, models.FileField):
+            # File fields are rendered from a FieldFile even when empty
+            to_representation = field.to_representation
+            return lambda row: to_representation(FieldFile(None, model_field, row[column]))
+        if isinstance(model_field, PASSTHROUGH_FIELDS.get(type(field), ())):
+            return itemgetter(column)
+        if type(field) not in CONVERTED_FIELDS:
+            # Custom fields may read more than the value
+            raise NotCompilable(field.field_name)
+        if isinstance(field, serializers.DateTimeField) and not hasattr(field, 'timezone'):
+            # Resolve the active timezone once per page rather than once per value
+            field.timezone = field.default_timezone()
+        to_representation = field.to_representation
+        return lambda row: None if (value := row[column]) is None else to_representation(value)
+
+    def _nested_getter(self, field, model_field, prefix):
+        if not (model_field.many_to_one or model_field.one_to_one) or not model_field.concrete:
+            raise NotCompilable(field.field_name)
+        related_model = model_field.related_model
+        nested_prefix = f'{prefix}{model_field.name}__'
+        to_representation = self._compile(field, related_model, nested_prefix)
+        if not model_field.null:
+            return to_representation
+        pk = self._column(nested_prefix + related_model._meta.pk.name)
+        return lambda row: None if row[pk] is None else to_representation(row)
+
+    def _method_getter(self, serializer, field, model, prefix):
+        meta = serializer.Meta
+        name = field.field_name
+        annotations = getattr(meta, 'method_annotations', {})
+        if name in annotations:
+            alias = f'compiled_{len(self.annotations)}'
+            self.annotations[alias] = annotations[name](prefix)
+            return itemgetter(alias)
+
+        sources = getattr(meta, 'method_sources', {}).get(name)
+        if sources is None:
+            raise NotCompilable(name)
+        attributes = []
+        for attribute in sources:
+            try:
+                model_field = model._meta.pk if attribute == 'pk' else model._meta.get_field(attribute)
+            except FieldDoesNotExist:
+                raise NotCompilable(name)
+            if model_field.is_relation:
+                raise NotCompilable(name)
+            column = self._column(prefix + model_field.name)
+            attributes.append((attribute, column, model_field if isinstance(model_field, models.FileField) else None))
+        method = getattr(serializer, field.method_name)
+
+        def get(row):
+            return method(RowObject({
+                attribute: row[column] if file_field is None else FieldFile(None, file_field, row[column])
+                for attribute, column, file_field in attributes
+            }))
+
+        return get
+
+
+def compile_serializer(serializer):
+    """A ``CompiledSerializer`` for ``serializer`` (or a list serializer's child), or None"""
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    try:
+        return CompiledSerializer(serializer)
+    except NotCompilable:
+        return None
+
+
+class CompiledListMixin:
+    """Render ``list`` from ``values()`` rows whenever the list serializer compiles"""
+
+    def list(self, request, *args, **kwargs):
+        compiled = compile_serializer(self.get_serializer(many=True))
+        if compiled is None:
+            return super().list(request, *args, **kwargs)
+        queryset = compiled.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(compiled.render(page))
+        return Response(compiled.render(queryset))
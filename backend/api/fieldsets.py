@@ -0,0 +1,173 @@
+"""
+Sparse fieldsets and expansion for API responses.
+
+``?fields=id,status,job.title,job.company.name`` limits a response to the
+listed fields. A nested field named on its own (``job``) keeps all of its
+own fields. ``?expand=applicant,job.company`` replaces a compact
+representation (a primary key or a list serializer) with the richer one the
+serializer declares in ``Meta.expandable_fields``, or adds a field that is
+not rendered by default. Paths are dotted from the top-level object; on list
+endpoints they apply to every item. Unknown names are ignored.
+
+Only safe (GET/HEAD) requests are shaped, so validation of input never
+loses fields.
+
+Views using ``ShapedQuerysetMixin`` derive ``select_related`` and
+``prefetch_related`` from the serializer that will actually render. A
+relation the client did not ask for is neither joined nor prefetched, and an
+expanded one is loaded in bulk instead of per row.
+"""
+import sys
+
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def parse_field_paths(value):
+    """``'id,job.title,job.company'`` -> ``{'id': {}, 'job': {'title': {}, 'company': {}}}``"""
+    tree = {}
+    for path in value.split(','):
+        node = tree
+        for part in filter(None, (part.strip() for part in path.split('.'))):
+            node = node.setdefault(part, {})
+    return tree
+
+
+def requested_shape(context):
+    """``(fields tree or None, expand tree)`` for the request in a serializer context"""
+    if '_requested_shape' not in context:
+        request = context.get('request')
+        fields, expand = None, {}
+        if request is not None and request.method in SAFE_METHODS:
+            params = getattr(request, 'query_params', request.GET)
+            if params.get('fields'):
+                fields = parse_field_paths(params['fields'])
+            expand = parse_field_paths(params.get('expand', ''))
+        context['_requested_shape'] = (fields, expand)
+    return context['_requested_shape']
+
+
+def serializer_path(serializer):
+    """Field names from the top-level serializer down to ``serializer``"""
+    names = []
+    node = serializer
+    while node.parent is not None:
+        if node.field_name:
+            names.append(node.field_name)
+        node = node.parent
+    return names[::-1]
+
+
+def _descend(tree, path):
+    for name in path:
+        if not tree:
+            return None
+        tree = tree.get(name)
+    return tree
+
+
+class SparseFieldsMixin:
+    """Apply the request's ``fields``/``expand`` parameters to a serializer and its nested serializers.
+
+    ``Meta.expandable_fields`` maps a field name to a serializer class (or its
+    name in this module, or a ``(class, kwargs)`` pair) used when the field
+    is expanded. ``Meta.related_lookups`` maps fields that read relations
+    without nesting a serializer (e.g. method fields) to the lookups
+    ``ShapedQuerysetMixin`` should ``select_related`` (or prefetch, for
+    to-many relations).
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested, expand = requested_shape(self.context)
+        if requested is None and not expand:
+            return fields
+
+        path = serializer_path(self)
+        expanded = _descend(expand, path)
+        if expanded:
+            expandable = getattr(self.Meta, 'expandable_fields', {})
+            for name in expanded:
+                if name in expandable:
+                    fields[name] = self._build_expanded_field(expandable[name])
+
+        selected = _descend(requested, path) if requested is not None else None
+        if selected:
+            fields = {name: field for name, field in fields.items() if name in selected}
+        return fields
+
+    def _build_expanded_field(self, spec):
+        serializer_class, kwargs = spec if isinstance(spec, tuple) else (spec, {})
+        if isinstance(serializer_class, str):
+            if '.' in serializer_class:
+                serializer_class = import_string(serializer_class)
+            else:
+                serializer_class = getattr(sys.modules[type(self).__module__], serializer_class)
+        return serializer_class(read_only=True, **kwargs)
+
+
+class SparseFieldsModelSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    pass
+
+
+def related_lookups(serializer, model):
+    """``(select_related, prefetch_related)`` lookups needed to render ``serializer`` for ``model`` rows"""
+    select, prefetch = set(), set()
+    _collect_lookups(serializer, model, '', False, select, prefetch)
+    return sorted(select), sorted(prefetch)
+
+
+def _collect_lookups(serializer, model, prefix, prefetching, select, prefetch):
+    meta = getattr(serializer, 'Meta', None)
+    for name, lookup in getattr(meta, 'related_lookups', {}).items():
+        if name in serializer.fields:
+            relation = model._meta.get_field(lookup.split('__', 1)[0])
+            many = relation.one_to_many or relation.many_to_many
+            (prefetch if prefetching or many else select).add(prefix + lookup)
+
+    for field in serializer.fields.values():
+        if isinstance(field, serializers.ListSerializer):
+            nested = field.child
+        elif isinstance(field, serializers.BaseSerializer):
+            nested = field
+        else:
+            continue
+        if field.source == '*' or '.' in field.source:
+            continue
+        try:
+            relation = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            continue
+        if not relation.is_relation or relation.related_model is None:
+            continue
+
+        lookup = prefix + field.source
+        many = relation.one_to_many or relation.many_to_many
+        if many or prefetching:
+            prefetch.add(lookup)
+        else:
+            select.add(lookup)
+        if not getattr(nested, 'loads_own_relations', False):
+            _collect_lookups(nested, relation.related_model, lookup + '__', many or prefetching, select, prefetch)
+
+
+def optimize_queryset(queryset, serializer):
+    """Add the joins and prefetches ``serializer`` needs to ``queryset``"""
+    select, prefetch = related_lookups(serializer, queryset.model)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+class ShapedQuerysetMixin:
+    """Load exactly the relations the response will render"""
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method in SAFE_METHODS:
+            queryset = optimize_queryset(queryset, self.get_serializer())
+        return queryset
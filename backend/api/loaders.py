@@ -0,0 +1,107 @@
+"""
+Batch loading of nested serializers with to-many fields.
+
+Rendering ``UserProfileSerializer`` costs a query per collection
+(experiences, education, skills, certifications) for every user, and a
+message list renders two users per row. Prefetching per relation path is
+not enough either: a user who is the sender of one message and the
+recipient of the next is still loaded and serialized twice.
+
+A serializer using ``BatchLoadedMixin`` loads, the first time it renders in
+a response, every instance it is about to render anywhere in the response:
+it walks the root serializer's instance along each path where the same
+serializer class is nested, keeps one instance per primary key (the
+identity map) and prefetches the collections the shaped serializer renders
+on those instances only. Each instance is then rendered once per path and
+the result reused for its repeats.
+"""
+from django.db.models import prefetch_related_objects
+from rest_framework import serializers
+
+from .fieldsets import serializer_path
+
+
+class IdentityMap:
+    """Instances and their representations for one response"""
+
+    def __init__(self):
+        self.instances = {}
+        self.representations = {}
+        self.loaded = set()
+
+
+def identity_map(context):
+    if '_identity_map' not in context:
+        context['_identity_map'] = IdentityMap()
+    return context['_identity_map']
+
+
+def nested_paths(serializer, serializer_class, prefix=()):
+    """``(source path, serializer)`` of every ``serializer_class`` nested in ``serializer``"""
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    if isinstance(serializer, serializer_class):
+        yield prefix, serializer
+        return
+    for field in serializer.fields.values():
+        if isinstance(field, serializers.BaseSerializer) and field.source != '*' and '.' not in field.source:
+            yield from nested_paths(field, serializer_class, prefix + (field.source,))
+
+
+def follow(objects, path):
+    """The objects reached from ``objects`` through the attributes in ``path``"""
+    for attribute in path:
+        reached = []
+        for obj in objects:
+            value = getattr(obj, attribute, None)
+            if value is None:
+                continue
+            if hasattr(value, 'all'):
+                reached.extend(value.all())
+            else:
+                reached.append(value)
+        objects = reached
+    return objects
+
+
+class BatchLoadedMixin:
+    """Load all instances of this serializer in a response at once, deduplicated by primary key"""
+
+    # Checked by ShapedQuerysetMixin, which then only joins this serializer's instances
+    loads_own_relations = True
+
+    def to_representation(self, instance):
+        identity = identity_map(self.context)
+        key = (type(self), instance.pk, tuple(serializer_path(self)))
+        if key in identity.representations:
+            return identity.representations[key]
+        if type(self) not in identity.loaded:
+            self.load_instances(identity)
+        canonical = identity.instances.get((type(self), instance.pk), instance)
+        representation = super().to_representation(canonical)
+        identity.representations[key] = representation
+        return representation
+
+    def load_instances(self, identity):
+        serializer_class = type(self)
+        identity.loaded.add(serializer_class)
+        root = self.root
+        roots = root.instance
+        if roots is None:
+            return
+        if not isinstance(root, serializers.ListSerializer):
+            roots = [roots]
+
+        instances = {}
+        collections = set()
+        for path, serializer in nested_paths(root, serializer_class):
+            for instance in follow(roots, path):
+                instances.setdefault(instance.pk, instance)
+            collections.update(
+                field.source for field in serializer.fields.values()
+                if isinstance(field, serializers.ListSerializer)
+            )
+        if collections:
+            prefetch_related_objects(list(instances.values()), *sorted(collections))
+        for pk, instance in instances.items():
+            identity.instances[(serializer_class, pk)] = instance
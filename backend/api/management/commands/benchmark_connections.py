@@ -0,0 +1,87 @@
+import time
+from wsgiref.util import setup_testing_defaults
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+
+from core.db_backends.mysql.base import DatabaseWrapper as MetricsDatabaseWrapper
+from core.db_metrics import metrics
+
+
+class Command(BaseCommand):
+    help = 'Compare per-request, persistent and pooled database connections on an API endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/jobs/', help='Endpoint to request (default: /api/jobs/)')
+        parser.add_argument('--requests', type=int, default=200, help='Timed requests per mode')
+
+    def handle(self, *args, **options):
+        connection = connections[DEFAULT_DB_ALIAS]
+        modes = [('per request', 0, None), ('persistent', 60, None)]
+        measured = isinstance(connection, MetricsDatabaseWrapper)
+        if measured:
+            modes.append(('pooled', 0, {'max_size': 4}))
+        else:
+            self.stdout.write(self.style.WARNING(
+                f"{connection.vendor} database: handshake times and the pooled mode need "
+                f"ENGINE 'core.db_backends.mysql'"
+            ))
+
+        settings_dict = connection.settings_dict
+        original = settings_dict['CONN_MAX_AGE'], settings_dict['OPTIONS'].get('pool')
+        opened = []
+
+        def count_opened(**kwargs):
+            opened.append(1)
+
+        connection_created.connect(count_opened)
+        handler = WSGIHandler()
+
+        self.stdout.write(f"{'mode':<14}{'per request':>13}{'connects':>10}{'per req':>9}{'handshake':>11}")
+        try:
+            stamp = int(time.time())
+            for run, (label, max_age, pool) in enumerate(modes):
+                connection.close()
+                settings_dict['CONN_MAX_AGE'] = max_age
+                settings_dict['OPTIONS'].pop('pool', None)
+                if pool:
+                    settings_dict['OPTIONS']['pool'] = pool
+                self._request(handler, options['path'], f'{stamp}-{run}-warmup')
+
+                del opened[:]
+                before = metrics.snapshot()
+                start = time.perf_counter()
+                for index in range(options['requests']):
+                    self._request(handler, options['path'], f'{stamp}-{run}-{index}')
+                elapsed = (time.perf_counter() - start) / options['requests']
+                after = metrics.snapshot()
+
+                # connection_created also fires for connections taken from the pool
+                connects = after['connects'] - before['connects'] if measured else len(opened)
+                handshake = (after['connect_ms'] - before['connect_ms']) / connects if connects else 0
+                self.stdout.write(
+                    f"{label:<14}{elapsed * 1000:>11.2f}ms{connects:>10}"
+                    f"{connects / options['requests']:>9.2f}{handshake:>9.1f}ms"
+                )
+        finally:
+            connection_created.disconnect(count_opened)
+            connection.close()
+            settings_dict['CONN_MAX_AGE'] = original[0]
+            settings_dict['OPTIONS'].pop('pool', None)
+            if original[1]:
+                settings_dict['OPTIONS']['pool'] = original[1]
+
+    def _request(self, handler, path, tag):
+        # A distinct query string per request keeps the response cache from answering
+        environ = {'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': f'benchmark={tag}'}
+        setup_testing_defaults(environ)
+        status = []
+        response = handler(environ, lambda code, headers, exc_info=None: status.append(code))
+        try:
+            b''.join(response)
+        finally:
+            response.close()
+        if not status[0].startswith('200'):
+            raise RuntimeError(f'{path} answered {status[0]}')
@@ -0,0 +1,78 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api import renderers
+from api.renderers import FastJSONParser, FastJSONRenderer
+from api.serializers import (
+    ApplicationDetailSerializer, JobListSerializer, LoanApplicationDetailSerializer, UserProfileSerializer,
+)
+from core.models import User
+from financial.models import LoanApplication
+from jobs.models import Application, Job
+
+
+class Command(BaseCommand):
+    help = 'Compare DRF JSON rendering/parsing with the orjson-backed renderer on the largest API payloads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20, help='Objects per payload (default: one page)')
+        parser.add_argument('--repeat', type=int, default=200, help='Timed iterations per payload')
+
+    def handle(self, *args, **options):
+        if renderers.orjson is None:
+            self.stdout.write(self.style.WARNING('orjson is not installed; FastJSONRenderer falls back to the stdlib'))
+
+        limit = options['limit']
+        payloads = {
+            'applications (detail)': lambda: ApplicationDetailSerializer(
+                Application.objects.select_related('job__company', 'applicant', 'resume')
+                .prefetch_related('applicant__experiences', 'applicant__education',
+                                  'applicant__skills', 'applicant__certifications')[:limit],
+                many=True,
+            ).data,
+            'profiles': lambda: UserProfileSerializer(
+                User.objects.prefetch_related('experiences', 'education', 'skills', 'certifications')[:limit],
+                many=True,
+            ).data,
+            'jobs (list page)': lambda: JobListSerializer(
+                Job.objects.select_related('company')[:limit], many=True,
+            ).data,
+            'loans (detail)': lambda: LoanApplicationDetailSerializer(
+                LoanApplication.objects.select_related('reviewed_by')[:limit], many=True,
+            ).data,
+        }
+
+        self.stdout.write(f"{'payload':<24}{'size':>10}{'stdlib':>11}{'orjson':>11}{'speedup':>9}"
+                          f"{'parse':>11}{'orjson':>11}{'speedup':>9}")
+        for label, build in payloads.items():
+            data = build()
+            if not data:
+                self.stdout.write(f"{label:<24}{'no rows':>10}")
+                continue
+
+            slow = JSONRenderer().render(data)
+            fast = FastJSONRenderer().render(data)
+            if slow != fast:
+                self.stderr.write(self.style.ERROR(f"{label}: output differs from JSONRenderer"))
+
+            render_slow = self._time(lambda: JSONRenderer().render(data), options['repeat'])
+            render_fast = self._time(lambda: FastJSONRenderer().render(data), options['repeat'])
+            parse_slow = self._time(lambda: JSONParser().parse(io.BytesIO(slow)), options['repeat'])
+            parse_fast = self._time(lambda: FastJSONParser().parse(io.BytesIO(slow)), options['repeat'])
+            self.stdout.write(
+                f"{label:<24}{len(slow) / 1024:>8.1f}KB"
+                f"{render_slow * 1000:>9.3f}ms{render_fast * 1000:>9.3f}ms{render_slow / render_fast:>8.1f}x"
+                f"{parse_slow * 1000:>9.3f}ms{parse_fast * 1000:>9.3f}ms{parse_slow / parse_fast:>8.1f}x"
+            )
+
+    def _time(self, func, repeat):
+        func()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - start) / repeat
+
@@ -0,0 +1,120 @@
+"""
+Fast JSON rendering and parsing for the REST API.
+
+``FastJSONRenderer`` and ``FastJSONParser`` use orjson when it is installed
+and fall back to DRF's stdlib-based implementations otherwise, so the
+package stays optional. Output matches what ``JSONRenderer`` produces
+with the default settings (compact, UTF-8, U+2028/U+2029 escaped): orjson
+serializes str, int, float, bool, None, dicts, lists and UUIDs itself, and
+hands datetimes, dates, times, Decimals, timedeltas and lazy translation
+strings to DRF's encoder so that they are formatted exactly as before. The
+one difference is the exponent of floats of 1e16 and above (``1e16`` rather
+than ``1e+16``), which decodes to the same number. orjson writes NaN and
+Infinity as ``null``; like ``JSONRenderer`` with ``STRICT_JSON``, ``dumps``
+raises ``ValueError`` for them instead.
+
+Run ``python manage.py benchmark_json`` to compare both on real payloads.
+"""
+import math
+from decimal import Decimal
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is not installed
+    orjson = None
+
+
+_encoder = JSONEncoder()
+
+LINE_SEPARATOR = '\u2028'.encode()
+PARAGRAPH_SEPARATOR = '\u2029'.encode()
+
+
+def _default(obj):
+    # Datetimes are passed through so they keep DRF's millisecond/'Z' formatting
+    return _encoder.default(obj)
+
+
+def has_non_finite_number(data):
+    """Whether ``data`` contains NaN or an infinity anywhere in its values"""
+    stack = [data]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, float):
+            if not math.isfinite(obj):
+                return True
+        elif isinstance(obj, dict):
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+        elif isinstance(obj, Decimal) and not obj.is_finite():
+            return True
+    return False
+
+
+def can_use_orjson():
+    """orjson only reproduces DRF's output with the default compact, UTF-8, strict settings"""
+    return (
+        orjson is not None and api_settings.COMPACT_JSON and api_settings.UNICODE_JSON
+        and api_settings.STRICT_JSON
+    )
+
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(data):
+    """Serialize ``data`` to JSON bytes exactly as DRF's ``JSONRenderer`` would"""
+    if not can_use_orjson():
+        return JSONRenderer().render(data)
+    try:
+        ret = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+    except orjson.JSONEncodeError:
+        # e.g. integers wider than 64 bits; the stdlib handles (or reports) these
+        return JSONRenderer().render(data)
+    if b'null' in ret and has_non_finite_number(data):
+        raise ValueError('Out of range float values are not JSON compliant')
+    if LINE_SEPARATOR in ret or PARAGRAPH_SEPARATOR in ret:
+        # Same JavaScript-safety escaping as JSONRenderer
+        ret = ret.replace(LINE_SEPARATOR, b'\\u2028').replace(PARAGRAPH_SEPARATOR, b'\\u2029')
+    return ret
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer backed by orjson"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        if not can_use_orjson() or self.get_indent(accepted_media_type, renderer_context):
+            # Indented output (e.g. "Accept: application/json; indent=4") keeps the stdlib path
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser backed by orjson"""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None or not self.strict:
+            return super().parse(stream, media_type, parser_context)
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            data = stream.read() if stream is not None else b''
+            if encoding.lower().replace('-', '') != 'utf8':
+                data = data.decode(encoding)
+            return orjson.loads(data)
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
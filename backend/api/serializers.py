@@ -1,15 +1,57 @@
+import os
+from functools import partial
+
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from core.models import User, Experience, Education, Skill, Certification
-from jobs.models import Company, Job, Application, Resume, SavedJob, Message
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.urls import reverse
+from django.utils import timezone
+from core.models import User, Experience, Education, Skill, Certification, UploadSession
+from jobs.models import Company, Job, Application, Resume, SavedJob, Message, SavedSearch, JobAlertDigest
+from jobs.alerts import normalize_filters
+from jobs.counters import live_count, live_count_expression
+from jobs.resume_index import make_snippet
+from taskqueue.models import Task
 from financial.models import LoanApplication, Withdrawal, CreditCardDebt, TaxRefund
+from core.skills import canonical_skill_name, resolve_skills, split_skills
+from jobs.skill_index import sync_job_skills
+from core.images import thumbnail_url, thumbnail_urls
+from core.uploads import UPLOAD_CHUNK_SIZE, UPLOAD_EXTENSIONS, max_upload_size
+
+from .fieldsets import SparseFieldsModelSerializer
+from .loaders import BatchLoadedMixin
 
 User = get_user_model()
 
 
+class ThumbnailField(serializers.Field):
+    """Read-only URL of an image derivative (or ``{size: {format: url}}`` when no size is given)"""
+    
+    def __init__(self, kind, size=None, **kwargs):
+        self.kind = kind
+        self.size = size
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+    
+    def to_representation(self, value):
+        if not value:
+            return None
+        if self.size:
+            return self._absolute(thumbnail_url(value, self.kind, self.size))
+        return {
+            size: {fmt: self._absolute(url) for fmt, url in urls.items()}
+            for size, urls in thumbnail_urls(value, self.kind).items()
+        }
+    
+    def _absolute(self, url):
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request is not None else url
+
+
 # ============ USER SERIALIZERS ============
 
-class UserRegistrationSerializer(serializers.ModelSerializer):
+class UserRegistrationSerializer(SparseFieldsModelSerializer):
     password = serializers.CharField(write_only=True, min_length=8)
     password_confirm = serializers.CharField(write_only=True)
     
@@ -36,7 +78,7 @@ class UserLoginSerializer(serializers.Serializer):
     password = serializers.CharField(write_only=True)
 
 
-class ExperienceSerializer(serializers.ModelSerializer):
+class ExperienceSerializer(SparseFieldsModelSerializer):
     class Meta:
         model = Experience
         fields = ['id', 'company', 'title', 'location', 'description', 'achievements', 
@@ -44,7 +86,7 @@ class ExperienceSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class EducationSerializer(serializers.ModelSerializer):
+class EducationSerializer(SparseFieldsModelSerializer):
     class Meta:
         model = Education
         fields = ['id', 'institution', 'degree', 'field_of_study', 'description',
@@ -52,14 +94,27 @@ class EducationSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class SkillSerializer(serializers.ModelSerializer):
+class SkillSerializer(SparseFieldsModelSerializer):
     class Meta:
         model = Skill
         fields = ['id', 'name', 'skill_type', 'proficiency', 'years_of_experience']
         read_only_fields = ['id']
+    
+    def validate_name(self, value):
+        # Unknown skills are added to the taxonomy on save, not while validating
+        return canonical_skill_name(value, create=False)
+    
+    def create(self, validated_data):
+        resolve_skills([validated_data['name']])
+        return super().create(validated_data)
+    
+    def update(self, instance, validated_data):
+        if 'name' in validated_data:
+            resolve_skills([validated_data['name']])
+        return super().update(instance, validated_data)
 
 
-class CertificationSerializer(serializers.ModelSerializer):
+class CertificationSerializer(SparseFieldsModelSerializer):
     class Meta:
         model = Certification
         fields = ['id', 'name', 'issuing_organization', 'credential_id', 'credential_url',
@@ -67,16 +122,19 @@ class CertificationSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(BatchLoadedMixin, SparseFieldsModelSerializer):
+    """Full profile; the collections of every user in a response are loaded in one batch (api/loaders.py)"""
+    
     experiences = ExperienceSerializer(many=True, read_only=True)
-    educations = EducationSerializer(many=True, read_only=True)
+    educations = EducationSerializer(source='education', many=True, read_only=True)
     skills = SkillSerializer(many=True, read_only=True)
     certifications = CertificationSerializer(many=True, read_only=True)
     full_name = serializers.SerializerMethodField()
+    avatar_thumbnails = ThumbnailField('avatar', source='avatar')
     
     class Meta:
         model = User
-        fields = ['id', 'email', 'first_name', 'last_name', 'full_name', 'phone', 'avatar',
+        fields = ['id', 'email', 'first_name', 'last_name', 'full_name', 'phone', 'avatar', 'avatar_thumbnails',
                   'role', 'headline', 'bio', 'location', 'website', 'linkedin',
                   'open_to_work', 'desired_salary_min', 'desired_salary_max',
                   'desired_job_types', 'desired_locations',
@@ -88,7 +146,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
         return f"{obj.first_name} {obj.last_name}".strip()
 
 
-class UserUpdateSerializer(serializers.ModelSerializer):
+class UserUpdateSerializer(SparseFieldsModelSerializer):
     class Meta:
         model = User
         fields = ['first_name', 'last_name', 'phone', 'avatar', 'headline', 'bio',
@@ -98,27 +156,42 @@ class UserUpdateSerializer(serializers.ModelSerializer):
 
 # ============ COMPANY SERIALIZERS ============
 
-class CompanyListSerializer(serializers.ModelSerializer):
+def published_jobs_count(prefix):
+    """``jobs_count`` of the company at lookup ``prefix`` as a subquery (see api/compiled.py)"""
+    jobs = (
+        Job.objects.filter(company=OuterRef(f'{prefix}pk'), status='published')
+        .order_by().values('company').annotate(count=Count('pk')).values('count')
+    )
+    return Coalesce(Subquery(jobs), 0)
+
+
+class CompanyListSerializer(SparseFieldsModelSerializer):
+    logo = ThumbnailField('logo', size='sm')
     jobs_count = serializers.SerializerMethodField()
     
     class Meta:
         model = Company
         fields = ['id', 'name', 'slug', 'logo', 'industry', 'company_size', 
                   'headquarters', 'is_verified', 'is_featured', 'jobs_count']
+        method_annotations = {'jobs_count': published_jobs_count}
     
     def get_jobs_count(self, obj):
         return obj.jobs.filter(status='published').count()
 
 
-class CompanyDetailSerializer(serializers.ModelSerializer):
+class CompanyDetailSerializer(SparseFieldsModelSerializer):
+    logo_thumbnails = ThumbnailField('logo', source='logo')
+    cover_thumbnails = ThumbnailField('cover', source='cover_image')
     jobs_count = serializers.SerializerMethodField()
     
     class Meta:
         model = Company
-        fields = ['id', 'name', 'slug', 'logo', 'cover_image', 'description', 'website',
+        fields = ['id', 'name', 'slug', 'logo', 'logo_thumbnails', 'cover_image', 'cover_thumbnails',
+                  'description', 'website',
                   'industry', 'company_size', 'founded_year', 'headquarters',
                   'linkedin', 'twitter', 'facebook', 'benefits',
                   'is_verified', 'is_featured', 'jobs_count', 'created_at']
+        method_annotations = {'jobs_count': published_jobs_count}
     
     def get_jobs_count(self, obj):
         return obj.jobs.filter(status='published').count()
@@ -126,9 +199,11 @@ class CompanyDetailSerializer(serializers.ModelSerializer):
 
 # ============ JOB SERIALIZERS ============
 
-class JobListSerializer(serializers.ModelSerializer):
+class JobListSerializer(SparseFieldsModelSerializer):
     company = CompanyListSerializer(read_only=True)
     salary_range = serializers.SerializerMethodField()
+    views_count = serializers.SerializerMethodField()
+    applications_count = serializers.SerializerMethodField()
     
     class Meta:
         model = Job
@@ -136,6 +211,13 @@ class JobListSerializer(serializers.ModelSerializer):
                   'location', 'is_remote', 'salary_range', 'skills',
                   'is_featured', 'is_urgent', 'views_count', 'applications_count',
                   'application_deadline', 'created_at']
+        expandable_fields = {'company': CompanyDetailSerializer}
+        method_sources = {'salary_range': ('show_salary', 'salary_min', 'salary_max')}
+        method_annotations = {
+            'views_count': partial(live_count_expression, 'views'),
+            'applications_count': partial(live_count_expression, 'applications'),
+        }
+        related_lookups = {'views_count': 'counter_shards', 'applications_count': 'counter_shards'}
     
     def get_salary_range(self, obj):
         if obj.show_salary and obj.salary_min and obj.salary_max:
@@ -145,13 +227,21 @@ class JobListSerializer(serializers.ModelSerializer):
         elif obj.show_salary and obj.salary_max:
             return f"Up to ${obj.salary_max:,}"
         return None
+    
+    def get_views_count(self, obj):
+        return live_count(obj, 'views')
+    
+    def get_applications_count(self, obj):
+        return live_count(obj, 'applications')
 
 
-class JobDetailSerializer(serializers.ModelSerializer):
+class JobDetailSerializer(SparseFieldsModelSerializer):
     company = CompanyDetailSerializer(read_only=True)
     salary_range = serializers.SerializerMethodField()
     is_saved = serializers.SerializerMethodField()
     has_applied = serializers.SerializerMethodField()
+    views_count = serializers.SerializerMethodField()
+    applications_count = serializers.SerializerMethodField()
     
     class Meta:
         model = Job
@@ -162,6 +252,7 @@ class JobDetailSerializer(serializers.ModelSerializer):
                   'is_featured', 'is_urgent', 'views_count', 'applications_count',
                   'application_deadline', 'is_saved', 'has_applied',
                   'created_at', 'published_at']
+        related_lookups = {'views_count': 'counter_shards', 'applications_count': 'counter_shards'}
     
     def get_salary_range(self, obj):
         if obj.show_salary and obj.salary_min and obj.salary_max:
@@ -172,6 +263,12 @@ class JobDetailSerializer(serializers.ModelSerializer):
             return f"Up to ${obj.salary_max:,}"
         return None
     
+    def get_views_count(self, obj):
+        return live_count(obj, 'views')
+    
+    def get_applications_count(self, obj):
+        return live_count(obj, 'applications')
+    
     def get_is_saved(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
@@ -185,25 +282,71 @@ class JobDetailSerializer(serializers.ModelSerializer):
         return False
 
 
-class JobCreateUpdateSerializer(serializers.ModelSerializer):
+class RecommendedJobSerializer(JobListSerializer):
+    match_score = serializers.SerializerMethodField()
+    
+    class Meta(JobListSerializer.Meta):
+        fields = JobListSerializer.Meta.fields + ['match_score']
+    
+    def get_match_score(self, obj):
+        return self.context.get('match_scores', {}).get(obj.id)
+
+
+class JobCreateUpdateSerializer(SparseFieldsModelSerializer):
     class Meta:
         model = Job
         fields = ['title', 'company', 'description', 'requirements', 'responsibilities',
                   'benefits', 'job_type', 'experience_level', 'location', 'is_remote',
                   'salary_min', 'salary_max', 'salary_currency', 'show_salary',
                   'skills', 'status', 'is_featured', 'is_urgent', 'application_deadline']
+    
+    def create(self, validated_data):
+        skills = self._canonicalize_skills(validated_data)
+        if validated_data.get('status') == 'published':
+            validated_data['published_at'] = timezone.now()
+        job = super().create(validated_data)
+        if skills is not None:
+            sync_job_skills(job, skills)
+        return job
+    
+    def update(self, instance, validated_data):
+        skills = self._canonicalize_skills(validated_data)
+        if validated_data.get('status') == 'published' and instance.status != 'published':
+            # Saved-search alerts pick jobs up by the time they went live
+            validated_data['published_at'] = timezone.now()
+        job = super().update(instance, validated_data)
+        if skills is not None:
+            sync_job_skills(job, skills)
+        return job
+    
+    def _canonicalize_skills(self, validated_data):
+        if 'skills' not in validated_data:
+            return None
+        skills = resolve_skills(split_skills(validated_data['skills']))
+        validated_data['skills'] = [skill.name for skill in skills]
+        return skills
 
 
 # ============ APPLICATION SERIALIZERS ============
 
-class ResumeSerializer(serializers.ModelSerializer):
+class ResumeSerializer(SparseFieldsModelSerializer):
+    download_url = serializers.SerializerMethodField()
+    
     class Meta:
         model = Resume
-        fields = ['id', 'name', 'file', 'is_primary', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        fields = ['id', 'name', 'file', 'download_url', 'is_primary', 'extraction_status', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'extraction_status', 'created_at', 'updated_at']
+        method_sources = {'download_url': ('pk', 'file')}
+    
+    def get_download_url(self, obj):
+        if not obj.pk or not obj.file:
+            return None
+        url = reverse('resume-download', kwargs={'pk': obj.pk})
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request is not None else url
 
 
-class ApplicationListSerializer(serializers.ModelSerializer):
+class ApplicationListSerializer(SparseFieldsModelSerializer):
     job = JobListSerializer(read_only=True)
     resume = ResumeSerializer(read_only=True)
     
@@ -211,9 +354,10 @@ class ApplicationListSerializer(serializers.ModelSerializer):
         model = Application
         fields = ['id', 'job', 'status', 'resume', 'interview_date', 'interview_type',
                   'interview_location', 'created_at', 'updated_at']
+        expandable_fields = {'job': JobDetailSerializer, 'applicant': 'CandidateSerializer'}
 
 
-class ApplicationDetailSerializer(serializers.ModelSerializer):
+class ApplicationDetailSerializer(SparseFieldsModelSerializer):
     job = JobDetailSerializer(read_only=True)
     applicant = UserProfileSerializer(read_only=True)
     resume = ResumeSerializer(read_only=True)
@@ -225,13 +369,64 @@ class ApplicationDetailSerializer(serializers.ModelSerializer):
                   'applicant_notes', 'employer_notes', 'created_at', 'updated_at']
 
 
-class ApplicationCreateSerializer(serializers.ModelSerializer):
+class CandidateSerializer(SparseFieldsModelSerializer):
+    avatar = ThumbnailField('avatar', size='sm')
+    full_name = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = User
+        fields = ['id', 'email', 'first_name', 'last_name', 'full_name', 'avatar',
+                  'headline', 'location', 'open_to_work']
+        method_sources = {'full_name': ('first_name', 'last_name')}
+    
+    def get_full_name(self, obj):
+        return f"{obj.first_name} {obj.last_name}".strip()
+
+
+class CandidateMatchSerializer(SparseFieldsModelSerializer):
+    application_id = serializers.IntegerField(source='id', read_only=True)
+    applicant = CandidateSerializer(read_only=True)
+    match_score = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = Application
+        fields = ['application_id', 'applicant', 'status', 'match_score', 'created_at']
+    
+    def get_match_score(self, obj):
+        return self.context.get('match_scores', {}).get(obj.id)
+
+
+class CandidateSearchResultSerializer(SparseFieldsModelSerializer):
+    resume_id = serializers.IntegerField(source='id', read_only=True)
+    resume_name = serializers.CharField(source='name', read_only=True)
+    applicant = CandidateSerializer(source='user', read_only=True)
+    score = serializers.SerializerMethodField()
+    snippet = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = Resume
+        fields = ['resume_id', 'resume_name', 'applicant', 'score', 'snippet']
+    
+    def get_score(self, obj):
+        return self.context.get('search_scores', {}).get(obj.id)
+    
+    def get_snippet(self, obj):
+        return make_snippet(obj.text, self.context.get('query', ''))
+
+
+class ApplicationCreateSerializer(SparseFieldsModelSerializer):
     class Meta:
         model = Application
         fields = ['job', 'resume', 'cover_letter', 'screening_answers']
+    
+    def validate_resume(self, value):
+        # Employers may download the resume of an application to their job
+        if value is not None and value.user_id != self.context['request'].user.id:
+            raise serializers.ValidationError('You can only apply with your own resume.')
+        return value
 
 
-class ApplicationUpdateSerializer(serializers.ModelSerializer):
+class ApplicationUpdateSerializer(SparseFieldsModelSerializer):
     class Meta:
         model = Application
         fields = ['status', 'interview_date', 'interview_type', 'interview_location',
@@ -240,7 +435,7 @@ class ApplicationUpdateSerializer(serializers.ModelSerializer):
 
 # ============ SAVED JOB SERIALIZERS ============
 
-class SavedJobSerializer(serializers.ModelSerializer):
+class SavedJobSerializer(SparseFieldsModelSerializer):
     job = JobListSerializer(read_only=True)
     
     class Meta:
@@ -248,9 +443,33 @@ class SavedJobSerializer(serializers.ModelSerializer):
         fields = ['id', 'job', 'created_at']
 
 
+# ============ SAVED SEARCH SERIALIZERS ============
+
+class SavedSearchSerializer(SparseFieldsModelSerializer):
+    class Meta:
+        model = SavedSearch
+        fields = ['id', 'name', 'filters', 'is_active', 'last_matched_at', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'last_matched_at', 'created_at', 'updated_at']
+    
+    def validate_filters(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError('Filters must be an object of job search parameters.')
+        cleaned = normalize_filters(value)
+        if not cleaned:
+            raise serializers.ValidationError('At least one supported filter is required.')
+        return cleaned
+
+
+class JobAlertDigestSerializer(SparseFieldsModelSerializer):
+    class Meta:
+        model = JobAlertDigest
+        fields = ['id', 'matches', 'jobs_count', 'is_read', 'created_at']
+        read_only_fields = fields
+
+
 # ============ MESSAGE SERIALIZERS ============
 
-class MessageSerializer(serializers.ModelSerializer):
+class MessageSerializer(SparseFieldsModelSerializer):
     sender = UserProfileSerializer(read_only=True)
     recipient = UserProfileSerializer(read_only=True)
     
@@ -258,9 +477,10 @@ class MessageSerializer(serializers.ModelSerializer):
         model = Message
         fields = ['id', 'sender', 'recipient', 'application', 'subject', 'content',
                   'is_read', 'read_at', 'created_at']
+        expandable_fields = {'application': ApplicationListSerializer}
 
 
-class MessageCreateSerializer(serializers.ModelSerializer):
+class MessageCreateSerializer(SparseFieldsModelSerializer):
     class Meta:
         model = Message
         fields = ['recipient', 'application', 'subject', 'content']
@@ -268,14 +488,14 @@ class MessageCreateSerializer(serializers.ModelSerializer):
 
 # ============ FINANCIAL SERIALIZERS ============
 
-class LoanApplicationListSerializer(serializers.ModelSerializer):
+class LoanApplicationListSerializer(SparseFieldsModelSerializer):
     class Meta:
         model = LoanApplication
         fields = ['id', 'application_number', 'loan_type', 'amount', 'status',
                   'created_at', 'reviewed_at']
 
 
-class LoanApplicationDetailSerializer(serializers.ModelSerializer):
+class LoanApplicationDetailSerializer(SparseFieldsModelSerializer):
     reviewed_by_name = serializers.SerializerMethodField()
     
     class Meta:
@@ -287,6 +507,7 @@ class LoanApplicationDetailSerializer(serializers.ModelSerializer):
                   'annual_revenue', 'years_in_business',
                   'status', 'admin_notes', 'reviewed_by_name', 'reviewed_at',
                   'created_at', 'updated_at']
+        related_lookups = {'reviewed_by_name': 'reviewed_by'}
     
     def get_reviewed_by_name(self, obj):
         if obj.reviewed_by:
@@ -294,7 +515,7 @@ class LoanApplicationDetailSerializer(serializers.ModelSerializer):
         return None
 
 
-class LoanApplicationCreateSerializer(serializers.ModelSerializer):
+class LoanApplicationCreateSerializer(SparseFieldsModelSerializer):
     class Meta:
         model = LoanApplication
         fields = ['loan_type', 'amount', 'credit_score_range', 'full_name', 'email',
@@ -303,7 +524,7 @@ class LoanApplicationCreateSerializer(serializers.ModelSerializer):
                   'business_address', 'annual_revenue', 'years_in_business']
 
 
-class WithdrawalSerializer(serializers.ModelSerializer):
+class WithdrawalSerializer(SparseFieldsModelSerializer):
     class Meta:
         model = Withdrawal
         fields = ['id', 'withdrawal_number', 'loan_application', 'amount',
@@ -311,16 +532,17 @@ class WithdrawalSerializer(serializers.ModelSerializer):
                   'status', 'admin_notes', 'processed_at', 'created_at']
         read_only_fields = ['id', 'withdrawal_number', 'status', 'admin_notes', 
                            'processed_at', 'created_at']
+        expandable_fields = {'loan_application': LoanApplicationListSerializer}
 
 
-class WithdrawalCreateSerializer(serializers.ModelSerializer):
+class WithdrawalCreateSerializer(SparseFieldsModelSerializer):
     class Meta:
         model = Withdrawal
         fields = ['loan_application', 'amount', 'bank_name', 'account_holder_name',
                   'account_number', 'routing_number']
 
 
-class CreditCardDebtSerializer(serializers.ModelSerializer):
+class CreditCardDebtSerializer(SparseFieldsModelSerializer):
     class Meta:
         model = CreditCardDebt
         fields = ['id', 'application_number', 'full_name', 'email', 'phone', 'address',
@@ -328,14 +550,14 @@ class CreditCardDebtSerializer(serializers.ModelSerializer):
                   'status', 'admin_notes', 'reviewed_at', 'created_at', 'updated_at']
 
 
-class CreditCardDebtCreateSerializer(serializers.ModelSerializer):
+class CreditCardDebtCreateSerializer(SparseFieldsModelSerializer):
     class Meta:
         model = CreditCardDebt
         fields = ['full_name', 'email', 'phone', 'address', 'credit_card_limit',
                   'current_debt', 'bank_name', 'card_type']
 
 
-class TaxRefundSerializer(serializers.ModelSerializer):
+class TaxRefundSerializer(SparseFieldsModelSerializer):
     class Meta:
         model = TaxRefund
         fields = ['id', 'application_number', 'full_name', 'email', 'phone', 'address',
@@ -344,11 +566,59 @@ class TaxRefundSerializer(serializers.ModelSerializer):
                   'business_name', 'business_ein', 'business_revenue',
                   'documents', 'status', 'admin_notes', 'reviewed_at',
                   'created_at', 'updated_at']
+        # Documents are only ever appended by a completed upload session
+        read_only_fields = ['documents']
 
 
-class TaxRefundCreateSerializer(serializers.ModelSerializer):
+class TaxRefundCreateSerializer(SparseFieldsModelSerializer):
     class Meta:
         model = TaxRefund
         fields = ['full_name', 'email', 'phone', 'address', 'ssn_last_four',
                   'filing_type', 'tax_year', 'employment_status', 'annual_income',
                   'business_name', 'business_ein', 'business_revenue']
+
+
+# ============ UPLOAD SERIALIZERS ============
+
+class UploadSessionSerializer(SparseFieldsModelSerializer):
+    chunk_size = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'purpose', 'target_id', 'filename', 'size', 'offset', 'chunk_size',
+                  'content_hash', 'status', 'expires_at', 'created_at', 'updated_at']
+        read_only_fields = fields
+    
+    def get_chunk_size(self, obj):
+        return UPLOAD_CHUNK_SIZE
+
+
+class UploadSessionCreateSerializer(serializers.Serializer):
+    purpose = serializers.ChoiceField(choices=UploadSession.PURPOSE_CHOICES)
+    filename = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=1)
+    target_id = serializers.IntegerField(required=False, allow_null=True)
+    name = serializers.CharField(max_length=100, required=False, help_text='Display name of the resume')
+    
+    def validate_size(self, value):
+        if value > max_upload_size():
+            raise serializers.ValidationError(f"Files may be at most {max_upload_size()} bytes")
+        return value
+    
+    def validate(self, data):
+        extension = os.path.splitext(data['filename'])[1].lower()
+        if extension not in UPLOAD_EXTENSIONS[data['purpose']]:
+            raise serializers.ValidationError({'filename': f"Unsupported file type {extension or '(none)'}"})
+        if data['purpose'] == 'tax_document' and not data.get('target_id'):
+            raise serializers.ValidationError({'target_id': 'Tax documents must name the tax refund application'})
+        return data
+
+
+# ============ TASK SERIALIZERS ============
+
+class TaskStatusSerializer(SparseFieldsModelSerializer):
+    class Meta:
+        model = Task
+        fields = ['id', 'name', 'status', 'priority', 'attempts', 'max_attempts', 'run_at',
+                  'result', 'last_error', 'created_at', 'updated_at', 'finished_at']
+        read_only_fields = fields
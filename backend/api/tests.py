@@ -1,3 +1,462 @@
-from django.test import TestCase
+import datetime
+import decimal
+import io
+import json
+import uuid
+import os
+import re
+import tempfile
+import unittest
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.db.models import Q
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from core.models import Experience, Skill, UploadSession, User
+from core.storage import blob_hash
+from core.uploads import partial_path
+from financial.models import LoanApplication, TaxRefund, Withdrawal
+from jobs.counters import fold_buffered_views, increment
+from jobs.models import Company, Job, Application, Message, Resume
+
+from .compiled import compile_serializer
+from .fieldsets import optimize_queryset, parse_field_paths, related_lookups
+from .renderers import FastJSONParser, FastJSONRenderer, orjson
+from .serializers import (
+    ApplicationDetailSerializer, ApplicationListSerializer, CompanyListSerializer, JobListSerializer,
+    MessageSerializer, UserProfileSerializer,
+)
+
+
+class CompiledSerializerConformanceTests(TestCase):
+    """The compiled list path must render exactly what the DRF serializers render"""
+
+    @classmethod
+    def setUpTestData(cls):
+        verified = Company.objects.create(
+            name='Acme', slug='acme', industry='Software', company_size='51-200', is_verified=True,
+        )
+        Company.objects.filter(pk=verified.pk).update(logo='company_logos/acme.png')
+        plain = Company.objects.create(name='Plain   Co', slug='plain')
+
+        salaries = [(50000, 90000, True), (50000, None, True), (None, 120000, True), (None, None, True),
+                    (60000, 80000, False)]
+        jobs = []
+        for index, (salary_min, salary_max, show_salary) in enumerate(salaries):
+            jobs.append(Job.objects.create(
+                title=f'Engineer {index}', slug=f'engineer-{index}', description='...',
+                company=verified if index % 2 else plain, location='Remote', job_type='full-time',
+                salary_min=salary_min, salary_max=salary_max, show_salary=show_salary,
+                skills=['Python', 'Django'] if index else [], status='published' if index < 4 else 'draft',
+                is_featured=index == 1, application_deadline=datetime.date(2030, 1, index + 1),
+            ))
+
+        for _ in range(3):
+            increment(jobs[0].pk, 'views')
+        increment(jobs[1].pk, 'applications', 2)
+
+        applicant = User.objects.create_user(
+            email='ada@example.com', password='password123', first_name='Ada', last_name='Lovelace',
+        )
+        User.objects.filter(pk=applicant.pk).update(avatar='avatars/ada.png')
+        resume = Resume.objects.create(user=applicant, name='CV')
+        Resume.objects.filter(pk=resume.pk).update(file='resumes/cv.pdf')
+        Application.objects.create(job=jobs[0], applicant=applicant, resume=resume, status='interview',
+                                   interview_date=timezone.now(), interview_type='video')
+        Application.objects.create(job=jobs[1], applicant=applicant)
+
+    def assertConforms(self, serializer_class, queryset, query=''):
+        context = {'request': Request(APIRequestFactory().get('/api/' + query))}
+        expected = FastJSONRenderer().render(serializer_class(queryset, many=True, context=context).data)
+        compiled = compile_serializer(serializer_class(many=True, context=context))
+        self.assertIsNotNone(compiled)
+        actual = FastJSONRenderer().render(compiled.render(compiled.values(queryset)))
+        self.assertEqual(actual, expected)
+
+    def test_job_list(self):
+        self.assertConforms(JobListSerializer, Job.objects.order_by('id'))
+
+    def test_job_list_expanded_company(self):
+        self.assertConforms(JobListSerializer, Job.objects.order_by('id'), '?expand=company')
+
+    def test_job_list_sparse_fields(self):
+        self.assertConforms(JobListSerializer, Job.objects.order_by('id'), '?fields=id,salary_range,company.name')
+
+    def test_application_list(self):
+        self.assertConforms(ApplicationListSerializer, Application.objects.order_by('id'))
+
+    def test_application_list_expanded(self):
+        self.assertConforms(
+            ApplicationListSerializer, Application.objects.order_by('id'),
+            '?expand=applicant,job.company&fields=id,status,applicant,job.title,job.company.jobs_count,resume',
+        )
+
+    def test_company_list(self):
+        self.assertConforms(CompanyListSerializer, Company.objects.order_by('id'))
+
+    def test_uncompilable_serializer_falls_back(self):
+        self.assertIsNone(compile_serializer(ApplicationDetailSerializer(many=True)))
+
+    def test_dashboard_recent_applications(self):
+        applicant = User.objects.get(email='ada@example.com')
+        client = APIClient()
+        client.force_authenticate(applicant)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/dashboard/stats/')
+
+        applications = Application.objects.filter(applicant=applicant).order_by('-created_at')
+        expected = ApplicationListSerializer(applications, many=True).data
+        self.assertEqual(response.json()['recent_applications'], json.loads(FastJSONRenderer().render(expected)))
+        # One query renders the recent applications, whatever their number
+        self.assertEqual(sum('jobs_jobcountershard' in query['sql'] for query in queries.captured_queries), 1)
+
+    def test_list_endpoints(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.get(email='ada@example.com'))
+        for url in ['/api/jobs/', '/api/companies/', '/api/applications/']:
+            response = client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+        self.assertEqual(len(response.json()['results']), 2)
+
+
+@unittest.skipUnless(
+    connection.vendor in ('sqlite', 'postgresql'),
+    'MySQL picks full scans for the tiny test tables whatever the indexes',
+)
+class QueryIndexTests(TestCase):
+    """The hot queries of the API and the admin panel must be answered from an index"""
+
+    # (query, index expected in the plan) in the shape the views run them;
+    # counts are explained as their unordered filter
+    HOT_QUERIES = [
+        # api/views.py
+        (Job.objects.filter(status='published').order_by('-is_featured', '-created_at'), 'jobs_job_listing_idx'),
+        (Job.objects.filter(company=1, status='published').order_by(), 'jobs_job_company_status_idx'),
+        (Application.objects.filter(applicant=1).order_by('-created_at'), 'jobs_app_applicant_created_idx'),
+        (Application.objects.filter(applicant=1, status='interview').order_by(), 'jobs_app_applicant_status_idx'),
+        # Bounded by one employer's jobs, so sorting after the join is fine
+        (Application.objects.filter(job__posted_by=1).order_by('-created_at'), None),
+        (Message.objects.filter(Q(sender=1) | Q(recipient=1)).order_by('-created_at'), None),
+        (Message.objects.filter(recipient=1, is_read=False).order_by(), 'jobs_message_unread_idx'),
+        (LoanApplication.objects.filter(user=1).order_by('-created_at'), 'financial_loan_user_idx'),
+        (LoanApplication.objects.filter(user=1, status='pending').order_by(), 'financial_loan_user_status_idx'),
+        (Withdrawal.objects.filter(user=1).order_by('-created_at'), 'financial_wd_user_idx'),
+        # admin_panel/views.py
+        (LoanApplication.objects.filter(status='pending').order_by(), 'financial_loan_status_idx'),
+        (LoanApplication.objects.order_by('-created_at')[:5], 'financial_loan_created_idx'),
+        (Withdrawal.objects.filter(status='pending').order_by(), 'financial_wd_pending_idx'),
+        (Withdrawal.objects.order_by('-created_at')[:20], 'financial_wd_created_idx'),
+        (Job.objects.order_by('-created_at')[:20], 'jobs_job_created_idx'),
+        (Job.objects.filter(status='draft').order_by('-created_at'), 'jobs_job_status_created_idx'),
+        (Job.objects.filter(posted_by=1).order_by('-created_at'), 'jobs_job_poster_created_idx'),
+        (Application.objects.order_by('-created_at')[:20], 'jobs_app_created_idx'),
+        (Application.objects.filter(status='submitted').order_by(), 'jobs_app_status_created_idx'),
+        (User.objects.order_by('-created_at')[:20], 'core_user_created_idx'),
+        (User.objects.filter(role='job_seeker').order_by('-created_at'), 'core_user_role_created_idx'),
+        (User.objects.filter(role='job_seeker', is_verified=True).order_by(), 'core_user_role_verified_idx'),
+        (User.objects.filter(role='employer', is_suspended=True).order_by(), 'core_user_suspended_idx'),
+    ]
+
+    def plan(self, queryset):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                # Empty tables are cheapest to scan; ask for the plan the index allows
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.values('pk').explain() if not queryset.ordered else queryset.explain()
+
+    def assertUsesIndex(self, queryset, index):
+        plan = self.plan(queryset)
+        if connection.vendor == 'sqlite':
+            full_scan = re.search(r'\bSCAN (TABLE )?\w+$', plan, re.MULTILINE)
+            sort = 'TEMP B-TREE FOR ORDER BY' in plan
+        else:
+            full_scan = 'Seq Scan' in plan
+            sort = 'Sort Key' in plan
+        self.assertFalse(full_scan, plan)
+        if index:
+            self.assertIn(index, plan)
+            if queryset.ordered:
+                self.assertFalse(sort, plan)
+
+    def test_hot_queries_use_indexes(self):
+        for queryset, index in self.HOT_QUERIES:
+            with self.subTest(index=index, query=str(queryset.query)):
+                self.assertUsesIndex(queryset, index)
+
+
+class ResumeAccessTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(email='owner@example.com', password='password123')
+        self.resume = Resume.objects.create(user=self.owner, name='CV')
+        self.attacker = User.objects.create_user(email='mallory@example.com', password='password123', role='employer')
+        company = Company.objects.create(name='Shell', slug='shell')
+        self.job = Job.objects.create(
+            title='Bait', slug='bait', description='...', company=company, location='Remote',
+            status='published', posted_by=self.attacker,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.attacker)
+
+    def test_cannot_apply_with_someone_elses_resume(self):
+        response = self.client.post('/api/applications/', {'job': self.job.pk, 'resume': self.resume.pk})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('resume', response.json())
+        self.assertFalse(Application.objects.exists())
+
+    def test_employer_cannot_download_a_resume_attached_by_another_applicant(self):
+        Application.objects.create(job=self.job, applicant=self.attacker, resume=self.resume)
+
+        response = self.client.get(f'/api/resumes/{self.resume.pk}/download/')
+
+        self.assertEqual(response.status_code, 403)
+
+
+class TaxDocumentTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        media = override_settings(MEDIA_ROOT=directory.name)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.owner = User.objects.create_user(email='owner@example.com', password='password123')
+        self.refund = TaxRefund.objects.create(
+            user=self.owner, full_name='Owner', email='owner@example.com', phone='555', address='Street',
+            ssn_last_four='1234', filing_type='individual', tax_year=2025, employment_status='employed',
+            annual_income=50000,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def upload(self, content, filename='w2.pdf', before_complete=None):
+        response = self.client.post('/api/uploads/', {
+            'purpose': 'tax_document', 'filename': filename, 'size': len(content), 'target_id': self.refund.pk,
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        url = f"/api/uploads/{response.json()['id']}/"
+        response = self.client.patch(url, content, content_type='application/octet-stream', HTTP_UPLOAD_OFFSET='0')
+        self.assertEqual(response.status_code, 200)
+        if before_complete:
+            before_complete()
+        return self.client.post(f'{url}complete/')
+
+    def download(self, index):
+        return self.client.get(f'/api/tax-refunds/{self.refund.pk}/documents/{index}/download/')
+
+    def test_uploaded_document_is_attached_and_served(self):
+        self.assertEqual(self.upload(b'%PDF- w2').status_code, 201)
+
+        response = self.download(0)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'%PDF- w2')
+
+    def test_completing_for_a_missing_application_keeps_the_upload(self):
+        response = self.upload(b'%PDF- w2', before_complete=self.refund.delete)
+
+        self.assertEqual(response.status_code, 404)
+        session = UploadSession.objects.get()
+        self.assertEqual(session.status, 'active')
+        self.assertTrue(os.path.exists(partial_path(session)))
+
+    def test_documents_cannot_be_written_through_the_api(self):
+        response = self.client.patch(
+            f'/api/tax-refunds/{self.refund.pk}/', {'documents': [{'file': 'resumes/other.pdf'}]}, format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.refund.refresh_from_db()
+        self.assertEqual(self.refund.documents, [])
+
+    def test_entries_not_uploaded_for_this_application_are_not_served(self):
+        other = User.objects.create_user(email='other@example.com', password='password123')
+        resume = Resume.objects.create(user=other, name='CV', file=ContentFile(b'%PDF- private', name='cv.pdf'))
+        TaxRefund.objects.filter(pk=self.refund.pk).update(documents=[
+            {'name': 'cv.pdf', 'file': resume.file.name, 'sha256': blob_hash(resume.file.name)},
+            {'name': 'cv.pdf', 'file': resume.file.name},
+            'resumes/cv.pdf',
+        ])
+
+        for index in range(3):
+            self.assertEqual(self.download(index).status_code, 404)
+
+
+class JobResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        company = Company.objects.create(name='Acme', slug='acme')
+        self.job = Job.objects.create(
+            title='Engineer', slug='engineer', description='...', company=company, location='Remote',
+            status='published',
+        )
+        self.client = APIClient()
+        self.url = f'/api/jobs/{self.job.slug}/'
+
+    def test_hits_and_revalidations_need_no_queries(self):
+        first = self.client.get(self.url)
+        self.assertEqual((first.status_code, first['X-Cache']), (200, 'MISS'))
+
+        with self.assertNumQueries(0):
+            hit = self.client.get(self.url)
+            not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual((hit.status_code, hit['X-Cache']), (200, 'HIT'))
+        self.assertEqual(hit.content, first.content)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], first['ETag'])
+
+    def test_saving_the_job_changes_the_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.title = 'Senior Engineer'
+            self.job.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['title'], 'Senior Engineer')
+
+    def test_views_are_buffered_until_the_rollup(self):
+        etag = self.client.get(self.url)['ETag']
+        self.client.get(self.url)
+        self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.client.get('/api/jobs/no-such-job/')
+        self.assertEqual(Job.objects.get(pk=self.job.pk).views_count, 0)
+
+        self.assertEqual(fold_buffered_views(), 1)
+        self.assertEqual(Job.objects.get(pk=self.job.pk).views_count, 3)
+        # Folded views are not counted twice
+        self.assertEqual(fold_buffered_views(), 0)
+        self.assertEqual(Job.objects.get(pk=self.job.pk).views_count, 3)
+
+
+@unittest.skipIf(orjson is None, 'orjson is not installed')
+class FastJSONRendererTests(SimpleTestCase):
+    def test_output_matches_the_stdlib_renderer(self):
+        data = {
+            'text': 'caf\u00e9 \u2028 "quoted"', 'int': 2 ** 40, 'float': 1.5, 'none': None, 'flag': True,
+            'when': datetime.datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc),
+            'day': datetime.date(2026, 1, 2), 'amount': decimal.Decimal('12.50'),
+            'id': uuid.UUID('12345678-1234-5678-1234-567812345678'), 'nested': [{'a': [1, 2]}, ()], 7: 'key',
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+        # Integers orjson cannot represent take the stdlib path
+        self.assertEqual(FastJSONRenderer().render([2 ** 70]), JSONRenderer().render([2 ** 70]))
+
+    def test_non_finite_numbers_raise_like_strict_json(self):
+        for value in (float('nan'), float('inf'), -float('inf'), decimal.Decimal('NaN')):
+            for data in (value, [1, {'score': value}]):
+                with self.assertRaises(ValueError):
+                    JSONRenderer().render(data)
+                with self.assertRaises(ValueError):
+                    FastJSONRenderer().render(data)
+
+    def test_indented_output_uses_the_stdlib_renderer(self):
+        data = {'a': [1, 2]}
+        media_type = 'application/json; indent=2'
+        self.assertEqual(
+            FastJSONRenderer().render(data, media_type), JSONRenderer().render(data, media_type),
+        )
+
+    def test_parser_round_trips(self):
+        content = FastJSONRenderer().render({'name': 'caf\u00e9', 'values': [1, 2.5, None]})
+        self.assertEqual(FastJSONParser().parse(io.BytesIO(content)), {'name': 'caf\u00e9', 'values': [1, 2.5, None]})
+
+
+class SparseFieldsetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        company = Company.objects.create(name='Acme', slug='acme', description='Rockets')
+        job = Job.objects.create(
+            title='Engineer', slug='engineer', description='...', company=company, location='Remote',
+            status='published',
+        )
+        applicant = User.objects.create_user(email='ada@example.com', password='password123')
+        cls.application = Application.objects.create(job=job, applicant=applicant)
+
+    def serializer(self, query, method='get'):
+        request = Request(getattr(APIRequestFactory(), method)(f'/api/applications/?{query}'))
+        return ApplicationListSerializer(self.application, context={'request': request})
+
+    def test_parse_field_paths(self):
+        self.assertEqual(
+            parse_field_paths('id, job.title,job.company.name,,job'),
+            {'id': {}, 'job': {'title': {}, 'company': {'name': {}}}},
+        )
+
+    def test_fields_limit_nested_output(self):
+        data = self.serializer('fields=id,status,job.title,job.company.name,unknown').data
+        self.assertEqual(data, {
+            'id': self.application.pk, 'status': self.application.status, 'job': {'title': 'Engineer', 'company': {'name': 'Acme'}},
+        })
+        # A nested field named on its own keeps all of its fields
+        data = self.serializer('fields=job').data
+        self.assertEqual(list(data), ['job'])
+        self.assertIn('salary_range', data['job'])
+
+    def test_expand_swaps_in_the_detailed_serializer(self):
+        self.assertNotIn('description', self.serializer('').data['job']['company'])
+        data = self.serializer('expand=job.company,applicant&fields=id,job.company.description,applicant').data
+        self.assertEqual(data['job'], {'company': {'description': 'Rockets'}})
+        self.assertEqual(data['applicant']['email'], 'ada@example.com')
+
+    def test_unsafe_requests_are_not_shaped(self):
+        self.assertIn('resume', self.serializer('fields=id', method='post').data)
+
+    def test_querysets_load_only_the_requested_relations(self):
+        self.assertEqual(related_lookups(self.serializer('fields=id,status'), Application), ([], []))
+        self.assertEqual(related_lookups(self.serializer('fields=id,job.title'), Application), (['job'], []))
+        self.assertEqual(
+            related_lookups(self.serializer(''), Application),
+            (['job', 'job__company', 'resume'], ['job__counter_shards']),
+        )
+
+        queryset = optimize_queryset(Application.objects.all(), self.serializer('expand=applicant'))
+        # The applications, then the prefetched counter shards; every join is in the first query
+        with self.assertNumQueries(2):
+            rows = [(row.job.company.name, row.applicant.email) for row in queryset]
+        self.assertEqual(rows, [('Acme', 'ada@example.com')])
+
+
+class BatchLoaderTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.ada = User.objects.create_user(email='ada@example.com', password='password123', first_name='Ada')
+        cls.bob = User.objects.create_user(email='bob@example.com', password='password123', first_name='Bob')
+        for user in (cls.ada, cls.bob):
+            Skill.objects.create(user=user, name=f'{user.first_name} skill')
+            Experience.objects.create(
+                user=user, company='Acme', title='Engineer', start_date=datetime.date(2020, 1, 1),
+            )
+        for sender, recipient in ((cls.ada, cls.bob), (cls.bob, cls.ada), (cls.ada, cls.bob)):
+            Message.objects.create(sender=sender, recipient=recipient, content='Hi')
+
+    def render(self, query=''):
+        request = Request(APIRequestFactory().get(f'/api/messages/?{query}'))
+        messages = list(Message.objects.select_related('sender', 'recipient').order_by('id'))
+        with CaptureQueriesContext(connection) as queries:
+            data = MessageSerializer(messages, many=True, context={'request': request}).data
+        return data, len(queries)
+
+    def test_collections_load_once_for_every_user_in_the_response(self):
+        data, queries = self.render()
+        # One query per collection, however many messages and users there are
+        self.assertEqual(queries, 4)
+        self.assertEqual(data[0]['sender'], UserProfileSerializer(self.ada).data)
+        self.assertEqual(data[1]['sender'], UserProfileSerializer(self.bob).data)
+        self.assertEqual(data[2]['recipient'], data[1]['sender'])
+        self.assertEqual([skill['name'] for skill in data[1]['recipient']['skills']], ['Ada skill'])
+
+    def test_only_requested_collections_are_loaded(self):
+        data, queries = self.render('fields=id,sender.skills,recipient.email')
+        self.assertEqual(queries, 1)
+        self.assertEqual(list(data[0]['sender']), ['skills'])
+        self.assertEqual(data[0]['recipient'], {'email': 'bob@example.com'})
+        self.assertEqual([skill['name'] for skill in data[0]['sender']['skills']], ['Ada skill'])
@@ -6,10 +6,11 @@ from .views import (
     RegisterView, LoginView, LogoutView, MeView,
     ExperienceViewSet, EducationViewSet, SkillViewSet, CertificationViewSet,
     CompanyViewSet, JobViewSet,
-    ApplicationViewSet, ResumeViewSet, SavedJobViewSet,
+    ApplicationViewSet, ResumeViewSet, ResumeDownloadView, CandidateSearchView, SavedJobViewSet,
+    SavedSearchViewSet, JobAlertDigestViewSet,
     MessageViewSet,
     LoanApplicationViewSet, WithdrawalViewSet, CreditCardDebtViewSet, TaxRefundViewSet,
-    DashboardStatsView,
+    UploadSessionViewSet, DashboardStatsView, TaskStatusViewSet,
 )
 
 router = DefaultRouter()
@@ -28,6 +29,8 @@ router.register(r'jobs', JobViewSet, basename='job')
 router.register(r'applications', ApplicationViewSet, basename='application')
 router.register(r'resumes', ResumeViewSet, basename='resume')
 router.register(r'saved-jobs', SavedJobViewSet, basename='saved-job')
+router.register(r'saved-searches', SavedSearchViewSet, basename='saved-search')
+router.register(r'job-alerts', JobAlertDigestViewSet, basename='job-alert')
 
 # Message routes
 router.register(r'messages', MessageViewSet, basename='message')
@@ -38,6 +41,12 @@ router.register(r'withdrawals', WithdrawalViewSet, basename='withdrawal')
 router.register(r'credit-card-debt', CreditCardDebtViewSet, basename='credit-card-debt')
 router.register(r'tax-refunds', TaxRefundViewSet, basename='tax-refund')
 
+# Chunked uploads
+router.register(r'uploads', UploadSessionViewSet, basename='upload')
+
+# Background task status
+router.register(r'tasks', TaskStatusViewSet, basename='task')
+
 urlpatterns = [
     # Authentication
     path('auth/register/', RegisterView.as_view(), name='register'),
@@ -46,6 +55,12 @@ urlpatterns = [
     path('auth/me/', MeView.as_view(), name='me'),
     path('auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     
+    # Protected downloads
+    path('resumes/<int:pk>/download/', ResumeDownloadView.as_view(), name='resume-download'),
+    
+    # Candidate resume search
+    path('candidates/search/', CandidateSearchView.as_view(), name='candidate-search'),
+    
     # Dashboard
     path('dashboard/stats/', DashboardStatsView.as_view(), name='dashboard-stats'),
     
@@ -1,30 +1,56 @@
-from rest_framework import viewsets, status, generics, filters
+import os
+
+from rest_framework import viewsets, status, generics, filters, serializers
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate, get_user_model
+from django.db import transaction
 from django.db.models import Q
+from django.http import HttpResponseNotModified
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.cache import patch_vary_headers
 from django_filters.rest_framework import DjangoFilterBackend
 
-from core.models import User, Experience, Education, Skill, Certification
-from jobs.models import Company, Job, Application, Resume, SavedJob, Message
+from core.db_router import ReplicaReadsMixin
+from core.models import User, Experience, Education, Skill, Certification, UploadSession
+from core.downloads import serve_file
+from core.storage import add_references, blob_hash, get_content_storage
+from core.uploads import (
+    OffsetMismatch, UploadError, abort_upload, complete_upload, parse_checksum, start_upload, write_chunk,
+)
+from jobs.models import Company, Job, Application, Resume, SavedJob, Message, SavedSearch, JobAlertDigest
+from jobs.applications import AlreadyApplied, submit_application
+from jobs.counters import record_view
+from jobs.matching import recommend_jobs, rank_candidates
+from jobs.resume_index import search_resumes
+from jobs.skill_index import filter_jobs_by_skills
+from jobs.tasks import render_resume
 from financial.models import LoanApplication, Withdrawal, CreditCardDebt, TaxRefund
+from taskqueue.models import Task
+from taskqueue.registry import enqueue
 
+from .caching import CachedResponseMixin, etag_matches, profile_snapshot
+from .compiled import CompiledListMixin, compile_serializer
+from .fieldsets import ShapedQuerysetMixin, optimize_queryset
 from .serializers import (
     UserRegistrationSerializer, UserLoginSerializer, UserProfileSerializer, UserUpdateSerializer,
     ExperienceSerializer, EducationSerializer, SkillSerializer, CertificationSerializer,
     CompanyListSerializer, CompanyDetailSerializer,
-    JobListSerializer, JobDetailSerializer, JobCreateUpdateSerializer,
+    JobListSerializer, JobDetailSerializer, JobCreateUpdateSerializer, RecommendedJobSerializer,
     ApplicationListSerializer, ApplicationDetailSerializer, ApplicationCreateSerializer, ApplicationUpdateSerializer,
-    ResumeSerializer, SavedJobSerializer,
+    CandidateMatchSerializer, CandidateSearchResultSerializer,
+    ResumeSerializer, SavedJobSerializer, SavedSearchSerializer, JobAlertDigestSerializer,
     MessageSerializer, MessageCreateSerializer,
     LoanApplicationListSerializer, LoanApplicationDetailSerializer, LoanApplicationCreateSerializer,
     WithdrawalSerializer, WithdrawalCreateSerializer,
     CreditCardDebtSerializer, CreditCardDebtCreateSerializer,
     TaxRefundSerializer, TaxRefundCreateSerializer,
+    UploadSessionSerializer, UploadSessionCreateSerializer,
+    TaskStatusSerializer,
 )
 
 User = get_user_model()
@@ -63,7 +89,8 @@ class LoginView(APIView):
             if user:
                 refresh = RefreshToken.for_user(user)
                 return Response({
-                    'user': UserProfileSerializer(user).data,
+                    # Also warms the cache for the app's first /auth/me/ call
+                    'user': profile_snapshot(user)['data'],
                     'tokens': {
                         'refresh': str(refresh),
                         'access': str(refresh.access_token),
@@ -91,20 +118,30 @@ class MeView(APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
-        serializer = UserProfileSerializer(request.user)
-        return Response(serializer.data)
+        snapshot = profile_snapshot(request.user)
+        if etag_matches(request, snapshot['etag']):
+            return self.snapshot_response(HttpResponseNotModified(), snapshot)
+        return self.snapshot_response(Response(snapshot['data']), snapshot)
     
     def patch(self, request):
         serializer = UserUpdateSerializer(request.user, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
-            return Response(UserProfileSerializer(request.user).data)
+            # Serialized once here and served from the cache on the next app load
+            snapshot = profile_snapshot(request.user)
+            return self.snapshot_response(Response(snapshot['data']), snapshot)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    def snapshot_response(self, response, snapshot):
+        response['ETag'] = snapshot['etag']
+        response['Cache-Control'] = 'private, no-cache'
+        patch_vary_headers(response, ['Authorization'])
+        return response
 
 
 # ============ USER PROFILE VIEWS ============
 
-class ExperienceViewSet(viewsets.ModelViewSet):
+class ExperienceViewSet(ReplicaReadsMixin, ShapedQuerysetMixin, viewsets.ModelViewSet):
     serializer_class = ExperienceSerializer
     permission_classes = [IsAuthenticated]
     
@@ -115,7 +152,7 @@ class ExperienceViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class EducationViewSet(viewsets.ModelViewSet):
+class EducationViewSet(ReplicaReadsMixin, ShapedQuerysetMixin, viewsets.ModelViewSet):
     serializer_class = EducationSerializer
     permission_classes = [IsAuthenticated]
     
@@ -126,7 +163,7 @@ class EducationViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class SkillViewSet(viewsets.ModelViewSet):
+class SkillViewSet(ReplicaReadsMixin, ShapedQuerysetMixin, viewsets.ModelViewSet):
     serializer_class = SkillSerializer
     permission_classes = [IsAuthenticated]
     
@@ -137,7 +174,7 @@ class SkillViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class CertificationViewSet(viewsets.ModelViewSet):
+class CertificationViewSet(ReplicaReadsMixin, ShapedQuerysetMixin, viewsets.ModelViewSet):
     serializer_class = CertificationSerializer
     permission_classes = [IsAuthenticated]
     
@@ -150,35 +187,46 @@ class CertificationViewSet(viewsets.ModelViewSet):
 
 # ============ COMPANY VIEWS ============
 
-class CompanyViewSet(viewsets.ReadOnlyModelViewSet):
+class CompanyViewSet(ReplicaReadsMixin, CachedResponseMixin, CompiledListMixin, ShapedQuerysetMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Company.objects.all()
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['name', 'industry', 'headquarters']
     ordering_fields = ['name', 'created_at']
     lookup_field = 'slug'
+    # Company cards include the count of published jobs
+    cache_namespaces = ('companies', 'jobs')
+    replica_actions = ('list', 'retrieve', 'jobs')
     
     def get_serializer_class(self):
         if self.action == 'retrieve':
             return CompanyDetailSerializer
         return CompanyListSerializer
     
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, super().list, *args, **kwargs)
+    
     @action(detail=True, methods=['get'])
     def jobs(self, request, slug=None):
         company = self.get_object()
         jobs = company.jobs.filter(status='published')
+        compiled = compile_serializer(JobListSerializer(many=True))
+        if compiled is not None:
+            return Response(compiled.render(compiled.values(jobs)))
         serializer = JobListSerializer(jobs, many=True)
         return Response(serializer.data)
 
 
 # ============ JOB VIEWS ============
 
-class JobViewSet(viewsets.ModelViewSet):
+class JobViewSet(ReplicaReadsMixin, CachedResponseMixin, CompiledListMixin, ShapedQuerysetMixin, viewsets.ModelViewSet):
     queryset = Job.objects.all()
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['title', 'description', 'location', 'company__name']
     ordering_fields = ['created_at', 'salary_min', 'views_count']
     filterset_fields = ['job_type', 'experience_level', 'is_remote', 'status', 'is_featured']
     lookup_field = 'slug'
+    cache_namespaces = ('jobs', 'companies')
+    replica_actions = ('list', 'retrieve', 'recommended', 'candidates')
     
     def get_serializer_class(self):
         if self.action == 'retrieve':
@@ -188,10 +236,18 @@ class JobViewSet(viewsets.ModelViewSet):
         return JobListSerializer
     
     def get_permissions(self):
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'recommended', 'candidates']:
             return [IsAuthenticated()]
         return [AllowAny()]
     
+    def get_cache_viewer_class(self, request):
+        if self.action == 'retrieve':
+            # Details carry the viewer's is_saved/has_applied flags
+            return None if request.user.is_authenticated else 'anonymous'
+        if request.user.is_authenticated and request.user.role == 'employer':
+            return 'employer'
+        return 'public'
+    
     def get_queryset(self):
         queryset = Job.objects.all()
         
@@ -205,6 +261,7 @@ class JobViewSet(viewsets.ModelViewSet):
         location = self.request.query_params.get('location')
         salary_min = self.request.query_params.get('salary_min')
         salary_max = self.request.query_params.get('salary_max')
+        skills = self.request.query_params.get('skills')
         
         if job_type:
             queryset = queryset.filter(job_type=job_type)
@@ -216,24 +273,62 @@ class JobViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(salary_min__gte=salary_min)
         if salary_max:
             queryset = queryset.filter(salary_max__lte=salary_max)
+        if skills:
+            queryset = filter_jobs_by_skills(queryset, skills.split(','))
         
         return queryset.order_by('-is_featured', '-created_at')
     
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, super().list, *args, **kwargs)
+    
     def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        # Increment view count
-        instance.views_count += 1
-        instance.save(update_fields=['views_count'])
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        response = self.cached_response(request, super().retrieve, *args, **kwargs)
+        if response.status_code in (200, 304):
+            # Buffered in the shared cache so cached and 304 responses stay off the database
+            record_view(kwargs['slug'])
+        return response
     
     def perform_create(self, serializer):
         serializer.save(posted_by=self.request.user)
+    
+    @action(detail=False, methods=['get'])
+    def recommended(self, request):
+        limit = _parse_limit(request, default=20, maximum=100)
+        matches = recommend_jobs(request.user, limit=limit)
+        scores = dict(matches)
+        jobs = Job.objects.select_related('company').prefetch_related('counter_shards').in_bulk(
+            [job_id for job_id, _ in matches]
+        )
+        ranked = [jobs[job_id] for job_id, _ in matches if job_id in jobs]
+        serializer = RecommendedJobSerializer(ranked, many=True, context={'request': request, 'match_scores': scores})
+        return Response(serializer.data)
+    
+    @action(detail=True, methods=['get'])
+    def candidates(self, request, slug=None):
+        job = get_object_or_404(Job, slug=slug)
+        if job.posted_by_id != request.user.id and request.user.role != 'admin' and not request.user.is_staff:
+            return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
+        limit = _parse_limit(request, default=50, maximum=200)
+        matches = rank_candidates(job, limit=limit)
+        scores = {application.id: score for application, score in matches}
+        serializer = CandidateMatchSerializer(
+            [application for application, _ in matches], many=True,
+            context={'request': request, 'match_scores': scores},
+        )
+        return Response(serializer.data)
+
+
+def _parse_limit(request, default, maximum):
+    try:
+        limit = int(request.query_params.get('limit', default))
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(limit, maximum))
 
 
 # ============ APPLICATION VIEWS ============
 
-class ApplicationViewSet(viewsets.ModelViewSet):
+class ApplicationViewSet(ReplicaReadsMixin, CompiledListMixin, ShapedQuerysetMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     
     def get_serializer_class(self):
@@ -254,16 +349,10 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         return Application.objects.filter(applicant=user).order_by('-created_at')
     
     def perform_create(self, serializer):
-        job = serializer.validated_data['job']
-        # Check if already applied
-        if Application.objects.filter(applicant=self.request.user, job=job).exists():
+        try:
+            serializer.instance = submit_application(self.request.user, **serializer.validated_data)
+        except AlreadyApplied:
             raise serializers.ValidationError({'error': 'You have already applied to this job'})
-        
-        # Increment application count
-        job.applications_count += 1
-        job.save(update_fields=['applications_count'])
-        
-        serializer.save(applicant=self.request.user)
     
     @action(detail=True, methods=['post'])
     def withdraw(self, request, pk=None):
@@ -277,7 +366,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
 
 # ============ RESUME VIEWS ============
 
-class ResumeViewSet(viewsets.ModelViewSet):
+class ResumeViewSet(ReplicaReadsMixin, ShapedQuerysetMixin, viewsets.ModelViewSet):
     serializer_class = ResumeSerializer
     permission_classes = [IsAuthenticated]
     
@@ -297,11 +386,80 @@ class ResumeViewSet(viewsets.ModelViewSet):
         resume.is_primary = True
         resume.save()
         return Response({'message': 'Resume set as primary'})
+    
+    @action(detail=False, methods=['post'])
+    def generate(self, request):
+        """Queue rendering of a primary resume PDF from the user's profile"""
+        task = Task.objects.filter(
+            name=render_resume.task_name, user=request.user, status__in=['queued', 'running'],
+        ).first()
+        if task is None:
+            task = enqueue(render_resume, request.user.id, user=request.user)
+        return Response(TaskStatusSerializer(task).data, status=status.HTTP_202_ACCEPTED)
+
+
+class ResumeDownloadView(APIView):
+    """Download a resume file (owner, admins, or employers it was submitted to)"""
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request, pk):
+        resume = get_object_or_404(Resume, pk=pk)
+        user = request.user
+        allowed = (
+            resume.user_id == user.id or user.is_staff or user.role == 'admin'
+            or Application.objects.filter(resume=resume, applicant_id=resume.user_id, job__posted_by=user).exists()
+        )
+        if not allowed:
+            return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
+        if not resume.file:
+            return Response({'error': 'Resume has no file'}, status=status.HTTP_404_NOT_FOUND)
+        extension = os.path.splitext(resume.file.name)[1]
+        return serve_file(request, resume.file.path, resume.file.name, filename=f"{resume.name}{extension}")
+
+
+class CandidateSearchView(APIView):
+    """Full-text search over candidates' resumes for employers"""
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        user = request.user
+        if user.role not in ('employer', 'admin') and not user.is_staff:
+            return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = _parse_limit(request, default=20, maximum=100)
+        
+        resumes = Resume.objects.filter(user__role__in=User.JOB_SEEKER_ROLES, user__is_active=True)
+        if user.role != 'admin' and not user.is_staff:
+            # Employers see candidates open to work and anyone who applied to their jobs
+            resumes = resumes.filter(
+                Q(user__open_to_work=True) | Q(user__applications__job__posted_by=user)
+            )
+        ranked = list(search_resumes(query, resumes=resumes.values('id'))[:limit * 5])
+        scores = {row['resume_id']: row['score'] for row in ranked}
+        found = Resume.objects.select_related('user').in_bulk(scores)
+        
+        # Keep each candidate's best-scoring resume only
+        results = []
+        seen_users = set()
+        for row in ranked:
+            resume = found.get(row['resume_id'])
+            if resume is None or resume.user_id in seen_users:
+                continue
+            seen_users.add(resume.user_id)
+            results.append(resume)
+            if len(results) >= limit:
+                break
+        serializer = CandidateSearchResultSerializer(
+            results, many=True, context={'request': request, 'search_scores': scores, 'query': query},
+        )
+        return Response(serializer.data)
 
 
 # ============ SAVED JOB VIEWS ============
 
-class SavedJobViewSet(viewsets.ModelViewSet):
+class SavedJobViewSet(ReplicaReadsMixin, ShapedQuerysetMixin, viewsets.ModelViewSet):
     serializer_class = SavedJobSerializer
     permission_classes = [IsAuthenticated]
     
@@ -338,10 +496,42 @@ class SavedJobViewSet(viewsets.ModelViewSet):
         return Response({'error': 'Saved job not found'}, status=status.HTTP_404_NOT_FOUND)
 
 
+# ============ SAVED SEARCH VIEWS ============
+
+class SavedSearchViewSet(ReplicaReadsMixin, ShapedQuerysetMixin, viewsets.ModelViewSet):
+    serializer_class = SavedSearchSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        return SavedSearch.objects.filter(user=self.request.user).order_by('-created_at')
+    
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+
+class JobAlertDigestViewSet(ReplicaReadsMixin, ShapedQuerysetMixin, viewsets.ReadOnlyModelViewSet):
+    serializer_class = JobAlertDigestSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        queryset = JobAlertDigest.objects.filter(user=self.request.user)
+        if self.request.query_params.get('unread') == 'true':
+            queryset = queryset.filter(is_read=False)
+        return queryset.order_by('-created_at')
+    
+    @action(detail=True, methods=['post'])
+    def mark_read(self, request, pk=None):
+        digest = self.get_object()
+        digest.is_read = True
+        digest.save(update_fields=['is_read'])
+        return Response({'message': 'Marked as read'})
+
+
 # ============ MESSAGE VIEWS ============
 
-class MessageViewSet(viewsets.ModelViewSet):
+class MessageViewSet(ReplicaReadsMixin, ShapedQuerysetMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
+    replica_actions = ('list', 'retrieve', 'unread_count')
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -375,7 +565,7 @@ class MessageViewSet(viewsets.ModelViewSet):
 
 # ============ FINANCIAL VIEWS ============
 
-class LoanApplicationViewSet(viewsets.ModelViewSet):
+class LoanApplicationViewSet(ReplicaReadsMixin, ShapedQuerysetMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     
     def get_serializer_class(self):
@@ -392,7 +582,7 @@ class LoanApplicationViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class WithdrawalViewSet(viewsets.ModelViewSet):
+class WithdrawalViewSet(ReplicaReadsMixin, ShapedQuerysetMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     
     def get_serializer_class(self):
@@ -415,7 +605,7 @@ class WithdrawalViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class CreditCardDebtViewSet(viewsets.ModelViewSet):
+class CreditCardDebtViewSet(ReplicaReadsMixin, ShapedQuerysetMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     
     def get_serializer_class(self):
@@ -430,7 +620,7 @@ class CreditCardDebtViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class TaxRefundViewSet(viewsets.ModelViewSet):
+class TaxRefundViewSet(ReplicaReadsMixin, ShapedQuerysetMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     
     def get_serializer_class(self):
@@ -443,6 +633,156 @@ class TaxRefundViewSet(viewsets.ModelViewSet):
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+    
+    @action(detail=True, methods=['get'], url_path=r'documents/(?P<index>\d+)/download')
+    def download_document(self, request, pk=None, index=None):
+        refund = get_object_or_404(TaxRefund, pk=pk)
+        user = request.user
+        if refund.user_id != user.id and refund.assigned_to_id != user.id and not user.is_staff and user.role != 'admin':
+            return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
+        document = refund.get_document(int(index))
+        # Only serve blobs that a completed upload stored for this application,
+        # whatever else the list may have come to contain
+        if document is None or not self._uploaded_here(refund, document):
+            return Response({'error': 'Document not found'}, status=status.HTTP_404_NOT_FOUND)
+        storage = get_content_storage()
+        return serve_file(request, storage.path(document['file']), document['file'], filename=document['name'])
+    
+    def _uploaded_here(self, refund, document):
+        if not document['sha256'] or blob_hash(document['file']) != document['sha256']:
+            return False
+        return UploadSession.objects.filter(
+            purpose='tax_document', target_id=refund.pk, status='completed', result=document['file'],
+        ).exists()
+
+
+# ============ UPLOAD VIEWS ============
+
+class UploadSessionViewSet(viewsets.GenericViewSet):
+    """Chunked, resumable uploads of resumes and tax documents.
+
+    POST creates a session, PATCH appends the request body at the
+    ``Upload-Offset`` header, GET reports the offset to resume from and
+    ``complete`` attaches the finished file.
+    """
+    serializer_class = UploadSessionSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        return UploadSession.objects.filter(user=self.request.user)
+    
+    def create(self, request):
+        serializer = UploadSessionCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        if data['purpose'] == 'tax_document':
+            if not TaxRefund.objects.filter(pk=data['target_id'], user=request.user).exists():
+                return Response({'error': 'Tax refund application not found'}, status=status.HTTP_404_NOT_FOUND)
+        metadata = {'name': data['name']} if data.get('name') else {}
+        session = start_upload(
+            request.user, data['purpose'], data['filename'], data['size'],
+            target_id=data.get('target_id'), metadata=metadata,
+        )
+        return Response(self._session_data(session), status=status.HTTP_201_CREATED,
+                        headers={'Upload-Offset': session.offset})
+    
+    def retrieve(self, request, pk=None):
+        session = self.get_object()
+        return Response(self._session_data(session), headers={'Upload-Offset': session.offset})
+    
+    def partial_update(self, request, pk=None):
+        """Append one chunk; the raw body is streamed to disk, never parsed"""
+        session = self.get_object()
+        try:
+            offset = int(request.META['HTTP_UPLOAD_OFFSET'])
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except (KeyError, ValueError):
+            return Response({'error': 'Upload-Offset and Content-Length headers are required'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            checksum = parse_checksum(request.META.get('HTTP_UPLOAD_CHECKSUM'))
+            write_chunk(session, offset, request.stream, length, checksum=checksum)
+        except OffsetMismatch as e:
+            return Response({'error': str(e), 'offset': e.offset}, status=status.HTTP_409_CONFLICT,
+                            headers={'Upload-Offset': e.offset})
+        except UploadError as e:
+            return Response({'error': str(e), 'offset': session.offset}, status=status.HTTP_400_BAD_REQUEST,
+                            headers={'Upload-Offset': session.offset})
+        return Response(self._session_data(session), headers={'Upload-Offset': session.offset})
+    
+    def destroy(self, request, pk=None):
+        session = self.get_object()
+        if session.status == 'completed':
+            return Response({'error': 'Upload is already complete'}, status=status.HTTP_400_BAD_REQUEST)
+        abort_upload(session)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    
+    @action(detail=True, methods=['post'])
+    def complete(self, request, pk=None):
+        """Store the received file and attach it to a resume or tax refund application"""
+        with transaction.atomic():
+            session = get_object_or_404(self.get_queryset().select_for_update(), pk=pk)
+            if session.status == 'completed':
+                # Retried request; the file was attached the first time
+                return Response(self._attached_data(session))
+            if session.purpose == 'tax_document':
+                # Look the target up before the file is moved into storage
+                refund = get_object_or_404(TaxRefund.objects.select_for_update(), pk=session.target_id, user=request.user)
+            try:
+                name = complete_upload(session)
+            except OffsetMismatch as e:
+                return Response({'error': 'Upload is incomplete', 'offset': e.offset},
+                                status=status.HTTP_409_CONFLICT)
+            except UploadError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            
+            if session.purpose == 'resume':
+                resume = Resume(
+                    user=request.user,
+                    name=session.metadata.get('name') or os.path.splitext(session.filename)[0][:100],
+                    is_primary=not Resume.objects.filter(user=request.user).exists(),
+                )
+                resume.file.name = name
+                resume.save()
+                session.target_id = resume.pk
+                session.save(update_fields=['target_id', 'updated_at'])
+            else:
+                refund.documents = list(refund.documents or []) + [{
+                    'name': session.filename,
+                    'file': name,
+                    'size': session.size,
+                    'sha256': session.content_hash,
+                    'uploaded_at': timezone.now().isoformat(),
+                }]
+                refund.save(update_fields=['documents', 'updated_at'])
+                transaction.on_commit(lambda: add_references([name]))
+        return Response(self._attached_data(session), status=status.HTTP_201_CREATED)
+    
+    def _session_data(self, session):
+        return UploadSessionSerializer(session, context=self.get_serializer_context()).data
+    
+    def _attached_data(self, session):
+        data = {'upload': self._session_data(session)}
+        if session.purpose == 'resume':
+            resume = Resume.objects.filter(pk=session.target_id).first()
+            data['resume'] = ResumeSerializer(resume, context=self.get_serializer_context()).data if resume else None
+        else:
+            refund = TaxRefund.objects.filter(pk=session.target_id).first()
+            data['tax_refund'] = TaxRefundSerializer(refund).data if refund else None
+        return data
+
+
+# ============ TASK STATUS VIEWS ============
+
+class TaskStatusViewSet(ShapedQuerysetMixin, viewsets.ReadOnlyModelViewSet):
+    serializer_class = TaskStatusSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        user = self.request.user
+        if user.is_staff or user.role == 'admin':
+            return Task.objects.all().order_by('-created_at')
+        return Task.objects.filter(user=user).order_by('-created_at')
 
 
 # ============ DASHBOARD STATS VIEW ============
@@ -462,9 +802,16 @@ class DashboardStatsView(APIView):
             'approved_loans': LoanApplication.objects.filter(user=user, status='approved').count(),
         }
         
-        # Recent applications
-        recent_applications = Application.objects.filter(applicant=user).order_by('-created_at')[:5]
-        stats['recent_applications'] = ApplicationListSerializer(recent_applications, many=True).data
+        # Recent applications, rendered from one values() query: the DRF path
+        # would read each job's counter shards and company jobs_count per row
+        recent_applications = Application.objects.filter(applicant=user).order_by('-created_at')
+        serializer = ApplicationListSerializer(many=True)
+        compiled = compile_serializer(serializer)
+        if compiled is not None:
+            stats['recent_applications'] = compiled.render(compiled.values(recent_applications)[:5])
+        else:
+            recent_applications = optimize_queryset(recent_applications, serializer.child)[:5]
+            stats['recent_applications'] = ApplicationListSerializer(recent_applications, many=True).data
         
         # Application status breakdown
         stats['application_status'] = {
@@ -1,7 +1,11 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.contrib.contenttypes.models import ContentType
 from django.utils.html import format_html
-from .models import User, Experience, Education, Skill, Certification
+from .images import thumbnail_url
+from .models import (
+    User, Experience, Education, Skill, Certification, CanonicalSkill, SkillAlias, StoredBlob, UploadSession, AuditEvent,
+)
 
 
 class ExperienceInline(admin.TabularInline):
@@ -56,7 +60,8 @@ class UserAdmin(BaseUserAdmin):
     
     def avatar_preview(self, obj):
         if obj.avatar:
-            return format_html('<img src="{}" width="40" height="40" style="border-radius: 50%; object-fit: cover;" />', obj.avatar.url)
+            return format_html('<img src="{}" width="40" height="40" style="border-radius: 50%; object-fit: cover;" />',
+                               thumbnail_url(obj.avatar, 'avatar', 'sm'))
         return format_html('<span style="color: #999;">No avatar</span>')
     avatar_preview.short_description = 'Avatar'
 
@@ -94,3 +99,66 @@ class CertificationAdmin(admin.ModelAdmin):
     search_fields = ['user__email', 'user__first_name', 'user__last_name', 'name', 'issuing_organization']
     ordering = ['-issue_date']
     raw_id_fields = ['user']
+
+
+class SkillAliasInline(admin.TabularInline):
+    model = SkillAlias
+    extra = 0
+    fields = ['key']
+
+
+@admin.register(CanonicalSkill)
+class CanonicalSkillAdmin(admin.ModelAdmin):
+    list_display = ['name', 'key', 'created_at']
+    search_fields = ['name', 'key', 'aliases__key']
+    ordering = ['name']
+    inlines = [SkillAliasInline]
+
+
+@admin.register(SkillAlias)
+class SkillAliasAdmin(admin.ModelAdmin):
+    list_display = ['key', 'skill']
+    search_fields = ['key', 'skill__name']
+    ordering = ['key']
+    raw_id_fields = ['skill']
+
+
+@admin.register(StoredBlob)
+class StoredBlobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'size', 'ref_count', 'created_at', 'updated_at']
+    list_filter = ['created_at']
+    search_fields = ['name', 'content_hash']
+    ordering = ['-created_at']
+    readonly_fields = ['name', 'content_hash', 'size', 'ref_count', 'created_at', 'updated_at']
+
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+    list_display = ['filename', 'user', 'purpose', 'offset', 'size', 'status', 'expires_at', 'created_at']
+    list_filter = ['purpose', 'status', 'created_at']
+    search_fields = ['filename', 'user__email', 'content_hash']
+    ordering = ['-created_at']
+    readonly_fields = ['id', 'user', 'purpose', 'target_id', 'filename', 'metadata', 'size', 'offset',
+                       'content_hash', 'status', 'result', 'expires_at', 'created_at', 'updated_at']
+
+
+@admin.register(AuditEvent)
+class AuditEventAdmin(admin.ModelAdmin):
+    list_display = ['id', 'created_at', 'action', 'entity', 'entity_id', 'actor_id', 'changes']
+    list_filter = ['action']
+    search_fields = ['=entity_id', '=actor_id']
+    ordering = ['-id']
+    show_full_result_count = False
+    
+    def entity(self, obj):
+        return ContentType.objects.get_for_id(obj.entity_type).model_class()._meta.verbose_name
+    entity.short_description = 'Entity'
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -4,3 +4,20 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.core.signals import request_finished
+        from .audit import flush_request_events
+        from .cache import invalidate_on_change, profile_namespace
+        from .db_metrics import count_request
+        from .images import register_image_derivatives
+        from .models import User, Experience, Education, Skill, Certification
+        from .storage import track_blob_references
+        track_blob_references(User, 'avatar')
+        register_image_derivatives(User, 'avatar', 'avatar')
+        # Cached profile snapshots (api.caching.profile_snapshot)
+        invalidate_on_change(User, lambda user: profile_namespace(user.pk), ignore_fields={'last_login'})
+        for model in (Experience, Education, Skill, Certification):
+            invalidate_on_change(model, lambda item: profile_namespace(item.user_id))
+        request_finished.connect(count_request, dispatch_uid='core.db_metrics.count_request')
+        request_finished.connect(flush_request_events, dispatch_uid='core.audit.flush_request_events')
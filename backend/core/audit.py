@@ -0,0 +1,246 @@
+"""
+Append-only audit log: who changed what, on which row.
+
+``record`` turns an admin action into a compact ``AuditEvent`` (actor id,
+content type and id of the row, action name, ``{field: [old, new]}``) and
+appends it to an in-process buffer when the surrounding transaction commits,
+so the action itself pays for building a small object, not for an INSERT.
+The buffer is written with one multi-row INSERT at the end of the request
+that recorded the events (however many a bulk action produced), when it holds
+``AUDIT_BUFFER_SIZE`` events, and at process exit. Outside requests
+(management commands, the task worker) a daemon timer writes it
+``AUDIT_FLUSH_SECONDS`` after the first event was added, so events never sit
+in memory indefinitely; only those recorded in the last moments before a
+process is killed can be lost.
+
+Event ids are generated here rather than by the database: 41 bits of
+milliseconds since ``EPOCH``, 12 bits of node (host and pid) and 10 bits of
+sequence. They sort by time, need no round trip before the batched INSERT,
+and are the partitioning key: on MySQL the table is partitioned by month on
+``id`` (``manage.py audit_partitions``), so time range queries read only
+their months and expired months are dropped as whole partitions.
+"""
+import atexit
+import datetime
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import zlib
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, connections, models, router, transaction
+
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+NODE_BITS = 12
+SEQUENCE_BITS = 10
+TIME_SHIFT = NODE_BITS + SEQUENCE_BITS
+
+
+def id_at(moment):
+    """Smallest event id at ``moment`` (an aware datetime); for time range filters and partition bounds"""
+    return int((moment - EPOCH).total_seconds() * 1000) << TIME_SHIFT
+
+
+def time_of(event_id):
+    return EPOCH + datetime.timedelta(milliseconds=event_id >> TIME_SHIFT)
+
+
+def _add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_plan(existing, now, months_ahead=3, retain_months=None):
+    """Monthly partitions ``pYYYYMM`` to add, as ``[(name, upper id bound)]``, and names to drop.
+
+    ``existing`` are the current partition names; months up to ``months_ahead``
+    after the one of ``now`` should exist, months over ``retain_months`` old not.
+    """
+    current = now.astimezone(datetime.timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    months = sorted(name for name in existing if len(name) == 7 and name[1:].isdigit())
+    start = current
+    if months:
+        latest = current.replace(year=int(months[-1][1:5]), month=int(months[-1][5:]))
+        start = max(start, _add_months(latest, 1))
+    to_add = []
+    while start <= _add_months(current, months_ahead):
+        to_add.append((f'p{start:%Y%m}', id_at(_add_months(start, 1))))
+        start = _add_months(start, 1)
+    to_drop = []
+    if retain_months is not None:
+        oldest_kept = f'p{_add_months(current, -retain_months):%Y%m}'
+        to_drop = [name for name in months if name < oldest_kept]
+    return to_add, to_drop
+
+
+class EventIds:
+    """Time-ordered event ids of this process"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pid = None
+        self.last_ms = -1
+        self.issued = 0
+
+    def next(self):
+        with self.lock:
+            if self.pid != os.getpid():
+                self.pid = os.getpid()
+                host = f'{socket.gethostname()}:{self.pid}'.encode()
+                self.node = zlib.crc32(host) & ((1 << NODE_BITS) - 1)
+            now = int((time.time() - EPOCH.timestamp()) * 1000)
+            if now > self.last_ms:
+                self.last_ms, self.issued = now, 0
+                # A random start makes processes that share a node unlikely to collide
+                self.start = random.getrandbits(SEQUENCE_BITS)
+            elif self.issued == 1 << SEQUENCE_BITS:
+                # Sequence used up (or the clock went back): borrow the next millisecond
+                self.last_ms, self.issued = self.last_ms + 1, 0
+            sequence = (self.start + self.issued) & ((1 << SEQUENCE_BITS) - 1)
+            self.issued += 1
+            return self.last_ms << TIME_SHIFT | self.node << SEQUENCE_BITS | sequence
+
+
+ids = EventIds()
+
+
+class AuditBuffer:
+    """Events recorded by this process and not yet written"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+        self.events = []
+        self.oldest = None
+
+    def _own_events(self):
+        if self.pid != os.getpid():
+            # Forked: the parent writes what it had buffered
+            self.pid = os.getpid()
+            self.events = []
+        return self.events
+
+    def add(self, events):
+        with self.lock:
+            buffered = self._own_events()
+            if not buffered:
+                self.oldest = time.monotonic()
+                self._schedule()
+            buffered.extend(events)
+            full = len(buffered) >= getattr(settings, 'AUDIT_BUFFER_SIZE', 500)
+        if full:
+            self.flush()
+
+    def _schedule(self):
+        timer = threading.Timer(getattr(settings, 'AUDIT_FLUSH_SECONDS', 1), self._flush_from_timer)
+        timer.daemon = True
+        timer.start()
+
+    def _flush_from_timer(self):
+        # An earlier timer may fire after the buffer was written and refilled
+        if not self.due():
+            return
+        try:
+            self.flush()
+        finally:
+            connections.close_all()
+
+    def due(self):
+        with self.lock:
+            age = time.monotonic() - self.oldest if self._own_events() else None
+        return age is not None and age >= getattr(settings, 'AUDIT_FLUSH_SECONDS', 1)
+
+    def flush(self):
+        """Write the buffered events; returns how many"""
+        from .models import AuditEvent
+
+        with self.lock:
+            events = self._own_events()
+            self.events = []
+        if not events:
+            return 0
+        try:
+            try:
+                with transaction.atomic(using=router.db_for_write(AuditEvent)):
+                    AuditEvent.objects.bulk_create(events)
+            except IntegrityError:
+                # Two processes drew the same node and sequence in one millisecond
+                for event in events:
+                    event.id = ids.next()
+                AuditEvent.objects.bulk_create(events)
+        except Exception:
+            logger.exception('Could not write %s audit events; retrying in the background', len(events))
+            with self.lock:
+                if not self.events:
+                    self.oldest = time.monotonic()
+                self.events[:0] = events
+                self._schedule()
+            return 0
+        return len(events)
+
+
+buffer = AuditBuffer()
+atexit.register(buffer.flush)
+
+
+def flush():
+    return buffer.flush()
+
+
+def flush_request_events(**kwargs):
+    """``request_finished`` receiver: write what the request recorded before it is forgotten"""
+    buffer.flush()
+
+
+def plain(value):
+    """JSON-friendly value of a field: model instances become their pk"""
+    return value.pk if isinstance(value, models.Model) else value
+
+
+def snapshot(instance, *fields):
+    """Current values of ``fields``, to pass to ``record`` as ``before`` once they have changed"""
+    return {name: getattr(instance, instance._meta.get_field(name).attname) for name in fields}
+
+
+def record(entity, action, actor=None, before=None):
+    """Log ``action`` on the model instance ``entity``, with the ``before`` snapshot fields it changed"""
+    changes = {}
+    for name, old in (before or {}).items():
+        new = getattr(entity, entity._meta.get_field(name).attname)
+        if new != old:
+            changes[name] = [old, new]
+    record_many(type(entity), [(entity.pk, changes)], action, actor)
+
+
+def record_many(model, rows, action, actor=None):
+    """Log ``action`` on many rows of ``model``; ``rows`` is ``[(pk, {field: (old, new)})]``"""
+    from .models import AuditEvent
+
+    entity_type = ContentType.objects.get_for_model(model).pk
+    actor_id = actor.pk if actor is not None and actor.is_authenticated else None
+    events = [
+        AuditEvent(
+            id=ids.next(), entity_type=entity_type, entity_id=pk, actor_id=actor_id, action=action,
+            changes={name: [plain(old), plain(new)] for name, (old, new) in (changes or {}).items()},
+        )
+        for pk, changes in rows
+    ]
+    # Nothing is logged for a transaction that rolls back
+    transaction.on_commit(lambda: buffer.add(events), using=router.db_for_write(model))
+
+
+class AuditedAdminMixin:
+    """``ModelAdmin`` mixin logging the fields changed through the change form"""
+
+    def save_model(self, request, obj, form, change):
+        concrete = {field.name for field in obj._meta.concrete_fields}
+        before = {name: form.initial.get(name) for name in form.changed_data if name in concrete} if change else {}
+        super().save_model(request, obj, form, change)
+        record(obj, 'change' if change else 'add', request.user, before)
@@ -0,0 +1,180 @@
+"""
+Cache helpers shared by the API, stats and profile caches.
+
+Keys are namespaced (``cache_key('api-response', digest)``) so unrelated
+features cannot collide and a whole feature can be invalidated at once.
+
+Cached values that depend on a group of tables embed the current version of
+each namespace they read in their keys. Writers bump the version instead of
+hunting down keys, so stale entries are simply never read again and age out
+on their own::
+
+    versions = get_versions('jobs', 'companies')
+    key = f"job-list:{versions['jobs']}:{versions['companies']}:..."
+
+Versions start at the current time in milliseconds rather than 1, so a
+version key that is evicted and recreated cannot collide with a version
+still embedded in older entries. Version keys are read and bumped on the
+shared tier only: a copy in one process's local tier would keep that process
+serving the old version, and answering ETag checks with it, for up to
+``LOCAL_TIMEOUT`` seconds after another process bumped it.
+
+``get_or_compute`` adds stampede protection: when a popular entry expires
+or is invalidated, one caller recomputes it while the others wait for the
+result instead of all hitting the database at once.
+"""
+import hashlib
+import threading
+import time
+
+from django.core.cache import cache, caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .cache_backends import METRIC_NAMES, metrics
+
+
+# Longest key passed to the backend; longer keys are hashed
+MAX_KEY_LENGTH = 200
+
+# One lock per stripe serializes recomputation of a key within this process
+_lock_stripes = [threading.Lock() for _ in range(64)]
+
+_MISSING = object()
+
+
+def cache_key(namespace, *parts):
+    """``namespace:part:part``, with over-long keys shortened to a hash"""
+    key = ':'.join([namespace, *map(str, parts)])
+    if len(key) > MAX_KEY_LENGTH:
+        key = f"{namespace}:{hashlib.sha1(key.encode()).hexdigest()}"
+    return key
+
+
+def get_or_compute(key, compute, timeout=None, lock_timeout=30, wait=5.0):
+    """Return the cached value of ``key``, calling ``compute()`` at most once across processes on a miss.
+
+    ``timeout`` of None keeps the cache's default timeout. A ``None`` result
+    is returned but not cached. Callers that find another process computing
+    poll for up to ``wait`` seconds before computing themselves.
+    """
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    with _lock_stripes[hash(key) % len(_lock_stripes)]:
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        lock_key = cache_key('compute-lock', key)
+        if cache.add(lock_key, 1, timeout=lock_timeout):
+            try:
+                return _compute_and_store(key, compute, timeout)
+            finally:
+                cache.delete(lock_key)
+
+        metrics.record('waits')
+        deadline = time.monotonic() + wait
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            value = cache.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+        return _compute_and_store(key, compute, timeout)
+
+
+def _compute_and_store(key, compute, timeout):
+    metrics.record('computations')
+    value = compute()
+    if value is not None:
+        if timeout is None:
+            cache.set(key, value)
+        else:
+            cache.set(key, value, timeout)
+    return value
+
+
+def cache_stats(shared=True):
+    """Cache counters: summed over all processes from the shared tier, or this process only"""
+    if not shared:
+        return metrics.snapshot()
+    metrics.flush()
+    backend = metrics.shared or caches['default']
+    keys = {f'cache-metrics:{name}': name for name in METRIC_NAMES}
+    found = backend.get_many(list(keys))
+    return {name: found.get(key, 0) for key, name in keys.items()}
+
+
+def reset_cache_stats():
+    backend = metrics.shared or caches['default']
+    backend.delete_many([f'cache-metrics:{name}' for name in METRIC_NAMES])
+
+
+def _initial_version():
+    return int(time.time() * 1000)
+
+
+def shared_cache():
+    """The shared tier of TieredCache, or the cache itself when it has one tier"""
+    return getattr(cache, 'shared', cache)
+
+
+def get_versions(*namespaces):
+    """Current version of each namespace as ``{namespace: version}``, in one cache round trip"""
+    backend = shared_cache()
+    keys = {cache_key('ns-version', namespace): namespace for namespace in namespaces}
+    found = backend.get_many(list(keys))
+    versions = {}
+    for key, namespace in keys.items():
+        if key not in found:
+            backend.add(key, _initial_version(), timeout=None)
+            found[key] = backend.get(key)
+        versions[namespace] = found[key]
+    return versions
+
+
+def bump_version(*namespaces):
+    """Invalidate everything cached under ``namespaces``"""
+    backend = shared_cache()
+    for namespace in namespaces:
+        key = cache_key('ns-version', namespace)
+        try:
+            backend.incr(key)
+        except ValueError:
+            backend.set(key, _initial_version(), timeout=None)
+
+
+def bump_version_on_commit(*namespaces):
+    # Bumping before commit would let a reader cache the old rows under the new version
+    transaction.on_commit(lambda: bump_version(*namespaces))
+
+
+def profile_namespace(user_id):
+    """Namespace of everything cached about one user's profile"""
+    return f'profile:{user_id}'
+
+
+def invalidate_on_change(model, namespace, ignore_fields=()):
+    """Bump ``namespace`` whenever a ``model`` row is saved or deleted.
+
+    ``namespace`` may also be a function of the instance, for caches kept per
+    object (e.g. ``lambda skill: profile_namespace(skill.user_id)``).
+    Saves limited to ``ignore_fields`` (e.g. counters) leave the version alone.
+    Queryset ``update()`` calls bypass signals and must call
+    ``bump_version_on_commit`` themselves.
+    """
+    ignore_fields = frozenset(ignore_fields)
+    namespace_of = namespace if callable(namespace) else (lambda instance: namespace)
+
+    def saved(sender, instance, raw=False, update_fields=None, **kwargs):
+        if raw or (update_fields and set(update_fields) <= ignore_fields):
+            return
+        bump_version_on_commit(namespace_of(instance))
+
+    def deleted(sender, instance, **kwargs):
+        bump_version_on_commit(namespace_of(instance))
+
+    uid = f"cache-version:{model._meta.label}:{getattr(namespace, '__qualname__', namespace)}"
+    post_save.connect(saved, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(deleted, sender=model, weak=False, dispatch_uid=uid)
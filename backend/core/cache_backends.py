@@ -0,0 +1,244 @@
+"""
+Two-tier cache backend.
+
+``TieredCache`` puts a small per-process LRU (``LocMemCache``) in front of a
+cache shared by every worker on the box (``FileBasedCache`` by default,
+Redis when ``REDIS_URL`` is set). Reads are answered from process memory
+when possible and fall through to the shared tier otherwise; writes go to
+both. Local copies live for at most ``LOCAL_TIMEOUT`` seconds, which bounds
+how long another process can keep serving a value after it was changed or
+deleted elsewhere.
+
+Counters (``incr``/``decr``) and ``add`` are always evaluated by the shared
+tier so that they stay consistent across processes. Django's file cache
+implements them as a read followed by a write, so two processes could both
+win an ``add`` or lose an increment; ``FileBasedCache`` below runs them
+under an exclusive file lock instead; Redis does both atomically. Its
+``incr`` also keeps the key's expiry, as Redis does, where Django's resets
+it to the default timeout.
+
+Hit and miss counts are kept per process and periodically added to counters
+in the shared tier, where ``manage.py cache_stats`` reads them.
+"""
+import os
+import pickle
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+
+from django.core.cache import caches
+from django.core.cache.backends import filebased
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.files import locks
+from django.utils.functional import cached_property
+
+
+_MISSING = object()
+
+METRIC_NAMES = ('local_hits', 'shared_hits', 'misses', 'sets', 'deletes', 'computations', 'waits')
+
+# Seconds between pushes of this process's counters to the shared tier
+METRICS_FLUSH_INTERVAL = 30
+
+
+class CacheMetrics:
+    """Hit/miss counters of this process"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = dict.fromkeys(METRIC_NAMES, 0)
+        self.pending = dict.fromkeys(METRIC_NAMES, 0)
+        self.last_flush = time.monotonic()
+        self.shared = None
+
+    def record(self, name, count=1):
+        with self.lock:
+            self.counts[name] += count
+            self.pending[name] += count
+            due = self.shared is not None and time.monotonic() - self.last_flush > METRICS_FLUSH_INTERVAL
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            pending, self.pending = self.pending, dict.fromkeys(METRIC_NAMES, 0)
+            self.last_flush = time.monotonic()
+        if self.shared is None:
+            return
+        for name, count in pending.items():
+            if not count:
+                continue
+            key = f'cache-metrics:{name}'
+            self.shared.add(key, 0, timeout=None)
+            try:
+                self.shared.incr(key, count)
+            except ValueError:
+                self.shared.set(key, count, timeout=None)
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.counts)
+
+
+metrics = CacheMetrics()
+
+
+class TieredCache(BaseCache):
+    """Per-process LRU in front of a shared cache.
+
+    OPTIONS:
+        LOCAL: alias of the in-process cache (default ``'local'``)
+        SHARED: alias of the shared cache (default ``'shared'``)
+        LOCAL_TIMEOUT: seconds a value is kept in process memory (default 5)
+    """
+
+    def __init__(self, location, params):
+        options = dict(params.get('OPTIONS', {}))
+        self.local_alias = options.pop('LOCAL', 'local')
+        self.shared_alias = options.pop('SHARED', 'shared')
+        self.local_timeout = options.pop('LOCAL_TIMEOUT', 5)
+        super().__init__({**params, 'OPTIONS': options})
+
+    @cached_property
+    def local(self):
+        return caches[self.local_alias]
+
+    @cached_property
+    def shared(self):
+        if metrics.shared is None:
+            metrics.shared = caches[self.shared_alias]
+        return caches[self.shared_alias]
+
+    def _local_timeout(self, timeout):
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.shared.default_timeout
+        if timeout is None:
+            return self.local_timeout
+        return min(timeout, self.local_timeout)
+
+    def get(self, key, default=None, version=None):
+        value = self.local.get(key, _MISSING, version=version)
+        if value is not _MISSING:
+            metrics.record('local_hits')
+            return value
+        value = self.shared.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            metrics.record('misses')
+            return default
+        metrics.record('shared_hits')
+        self.local.set(key, value, self.local_timeout, version=version)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = self.local.get_many(keys, version=version)
+        missing = [key for key in keys if key not in found]
+        if found:
+            metrics.record('local_hits', len(found))
+        if missing:
+            shared = self.shared.get_many(missing, version=version)
+            if shared:
+                metrics.record('shared_hits', len(shared))
+                self.local.set_many(shared, self.local_timeout, version=version)
+                found.update(shared)
+            if len(shared) < len(missing):
+                metrics.record('misses', len(missing) - len(shared))
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        metrics.record('sets')
+        self.shared.set(key, value, timeout, version=version)
+        self.local.set(key, value, self._local_timeout(timeout), version=version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        metrics.record('sets', len(data))
+        failed = self.shared.set_many(data, timeout, version=version)
+        self.local.set_many(data, self._local_timeout(timeout), version=version)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.shared.add(key, value, timeout, version=version)
+        if added:
+            self.local.set(key, value, self._local_timeout(timeout), version=version)
+        else:
+            # Whatever this process remembers may be older than the shared value
+            self.local.delete(key, version=version)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        self.local.touch(key, self._local_timeout(timeout), version=version)
+        return self.shared.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        metrics.record('deletes')
+        self.local.delete(key, version=version)
+        return self.shared.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        metrics.record('deletes', len(keys))
+        self.local.delete_many(keys, version=version)
+        self.shared.delete_many(keys, version=version)
+
+    def has_key(self, key, version=None):
+        return self.local.has_key(key, version=version) or self.shared.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self.local.delete(key, version=version)
+        return self.shared.incr(key, delta, version=version)
+
+    def decr(self, key, delta=1, version=None):
+        self.local.delete(key, version=version)
+        return self.shared.decr(key, delta, version=version)
+
+    def clear(self):
+        self.local.clear()
+        self.shared.clear()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
+
+
+class FileBasedCache(filebased.FileBasedCache):
+    """Django's file cache with ``add``, ``incr`` and ``decr`` atomic across processes.
+
+    Each key hashes to one of 256 lock files under ``<LOCATION>/locks``, so the
+    number of lock files stays fixed however many keys are locked. ``flock``
+    locks are released when their holder dies, so a crash cannot leave a key
+    locked.
+    """
+
+    @contextmanager
+    def _locked(self, key, version=None):
+        # Cache file names are md5 hex digests; their first two characters pick the stripe
+        stripe = os.path.basename(self._key_to_file(key, version))[:2]
+        lock_dir = os.path.join(self._dir, 'locks')
+        os.makedirs(lock_dir, 0o700, exist_ok=True)
+        with open(os.path.join(lock_dir, f'{stripe}.lock'), 'ab') as lock_file:
+            locks.lock(lock_file, locks.LOCK_EX)
+            try:
+                yield
+            finally:
+                locks.unlock(lock_file)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        with self._locked(key, version):
+            return super().add(key, value, timeout, version)
+
+    def incr(self, key, delta=1, version=None):
+        # decr() is incr(-delta). Unlike BaseCache.incr, which stores the result
+        # with the default timeout, the key keeps its expiry, as in Redis.
+        with self._locked(key, version):
+            try:
+                with open(self._key_to_file(key, version), 'rb') as f:
+                    expiry = pickle.load(f)
+                    value = pickle.loads(zlib.decompress(f.read()))
+            except (FileNotFoundError, EOFError):
+                raise ValueError(f"Key '{key}' not found")
+            remaining = None if expiry is None else expiry - time.time()
+            if remaining is not None and remaining <= 0:
+                raise ValueError(f"Key '{key}' not found")
+            value += delta
+            self.set(key, value, remaining, version)
+            return value
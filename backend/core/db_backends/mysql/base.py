@@ -0,0 +1,133 @@
+"""
+Django's MySQL backend with connection metrics and an optional pool.
+
+Use ``'ENGINE': 'core.db_backends.mysql'``. Every connection it opens is
+counted and timed in ``core.db_metrics``. With ``OPTIONS['pool']`` set,
+closing a connection (at the end of a request when ``CONN_MAX_AGE`` is 0)
+puts it back into a per-process pool instead of closing the socket, and the
+next connection is taken from there, so requests and threads skip the TCP
+and authentication handshake::
+
+    'OPTIONS': {
+        'charset': 'utf8mb4',
+        # Idle connections kept per process; connections idle longer than
+        # max_idle seconds are closed, those idle over ping_after are pinged
+        'pool': {'max_size': 10, 'max_idle': 300, 'ping_after': 5},
+    }
+
+Connections closed inside a transaction or after a database error are never
+pooled.
+"""
+import os
+import queue
+import threading
+import time
+
+import pymysql
+
+# Django's backend imports MySQLdb; PyMySQL stands in for it. Installed here
+# rather than in settings so that processes not using MySQL never load it.
+pymysql.install_as_MySQLdb()
+
+from django.db.backends.mysql import base  # noqa: E402
+
+from core.db_metrics import metrics
+
+
+class ConnectionPool:
+    """Idle connections of one database alias in this process, most recently used first"""
+
+    def __init__(self, max_size=10, max_idle=300, ping_after=5):
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.ping_after = ping_after
+        self.idle = queue.LifoQueue()
+
+    def get(self):
+        """An idle connection that still works, or None"""
+        while True:
+            try:
+                connection, returned_at = self.idle.get_nowait()
+            except queue.Empty:
+                return None
+            idle_for = time.monotonic() - returned_at
+            if idle_for > self.max_idle:
+                self.discard(connection)
+                continue
+            if idle_for > self.ping_after:
+                try:
+                    connection.ping(reconnect=False)
+                except base.Database.Error:
+                    metrics.record('health_check_failures')
+                    self.discard(connection)
+                    continue
+            return connection
+
+    def put(self, connection):
+        if self.idle.qsize() >= self.max_size:
+            self.discard(connection)
+        else:
+            self.idle.put((connection, time.monotonic()))
+
+    def discard(self, connection):
+        metrics.record('closes')
+        try:
+            connection.close()
+        except base.Database.Error:
+            pass
+
+
+# (pid, alias) -> ConnectionPool; sockets must not be shared with forked children
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    @property
+    def pool(self):
+        options = self.settings_dict['OPTIONS'].get('pool')
+        if not options:
+            return None
+        key = (os.getpid(), self.alias)
+        with _pools_lock:
+            if key not in _pools:
+                _pools[key] = ConnectionPool(**options)
+            return _pools[key]
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pool', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is not None:
+            connection = pool.get()
+            if connection is not None:
+                metrics.record('reuses')
+                return connection
+        start = time.perf_counter()
+        connection = super().get_new_connection(conn_params)
+        metrics.record('connects')
+        metrics.record('connect_ms', round((time.perf_counter() - start) * 1000))
+        return connection
+
+    def is_usable(self):
+        usable = super().is_usable()
+        if not usable:
+            metrics.record('health_check_failures')
+        return usable
+
+    def _close(self):
+        pool = self.pool
+        if pool is None or self.connection is None or self.in_atomic_block or self.errors_occurred:
+            if self.connection is not None:
+                metrics.record('closes')
+            return super()._close()
+        try:
+            if not self.autocommit:
+                self.connection.rollback()
+        except base.Database.Error:
+            pool.discard(self.connection)
+            return
+        pool.put(self.connection)
@@ -0,0 +1,91 @@
+"""
+Database connection metrics of this worker process.
+
+``core.db_backends.mysql`` counts the connections it opens and the time spent
+opening them, the pooled connections it hands out again and the health
+checks that fail. ``requests`` counts finished HTTP requests, so
+``connects / requests`` is the share of requests that paid for a handshake.
+
+Every ``METRICS_FLUSH_INTERVAL`` seconds a worker publishes its counters to
+the cache under its own key, where ``manage.py db_connection_stats`` lists
+them. A worker that stops publishing drops out after ``WORKER_TTL`` seconds.
+"""
+import os
+import socket
+import threading
+import time
+
+from django.core.cache import cache
+
+from .cache import cache_key
+
+
+METRIC_NAMES = ('requests', 'connects', 'connect_ms', 'reuses', 'health_check_failures', 'closes')
+
+# Seconds between publications of this process's counters
+METRICS_FLUSH_INTERVAL = 30
+
+# Seconds a published snapshot outlives its worker
+WORKER_TTL = 5 * 60
+
+WORKERS_KEY = cache_key('db-metrics', 'workers')
+
+
+def worker_key(worker):
+    return cache_key('db-metrics', 'worker', worker)
+
+
+class ConnectionMetrics:
+    """Connection counters of this process, since it started"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+        self.counts = dict.fromkeys(METRIC_NAMES, 0)
+        self.last_flush = time.monotonic()
+
+    @property
+    def worker(self):
+        return f'{socket.gethostname()}:{os.getpid()}'
+
+    def record(self, name, count=1):
+        with self.lock:
+            if self.pid != os.getpid():
+                # Forked from a process that had already counted
+                self.pid = os.getpid()
+                self.counts = dict.fromkeys(METRIC_NAMES, 0)
+            self.counts[name] += count
+            due = time.monotonic() - self.last_flush > METRICS_FLUSH_INTERVAL
+            if due:
+                self.last_flush = time.monotonic()
+        if due:
+            self.flush()
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.counts)
+
+    def flush(self):
+        worker = self.worker
+        cache.set(worker_key(worker), {**self.snapshot(), 'updated': time.time()}, timeout=WORKER_TTL)
+        workers = cache.get(WORKERS_KEY) or []
+        if worker not in workers:
+            cache.set(WORKERS_KEY, [*workers, worker], timeout=None)
+
+
+metrics = ConnectionMetrics()
+
+
+def count_request(**kwargs):
+    """``request_finished`` receiver"""
+    metrics.record('requests')
+
+
+def worker_stats():
+    """``{worker: counters}`` of every worker that published in the last ``WORKER_TTL`` seconds"""
+    workers = cache.get(WORKERS_KEY) or []
+    found = cache.get_many([worker_key(worker) for worker in workers])
+    stats = {worker: found[worker_key(worker)] for worker in workers if worker_key(worker) in found}
+    if len(stats) < len(workers):
+        cache.set(WORKERS_KEY, list(stats), timeout=None)
+    return stats
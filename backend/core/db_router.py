@@ -0,0 +1,200 @@
+"""
+Read-replica routing.
+
+Replicas are the ``DATABASES`` aliases listed in ``DATABASE_REPLICAS`` with
+a weight each. Nothing is read from them unless a request opts in:
+``ReplicaReadsMixin`` does for the list and retrieve actions of a viewset,
+``replica_reads`` for a function view (admin lists and stats). Such a request
+reads from one replica, picked by weight among the healthy ones, and
+everything else (writes, other actions, cron jobs and tasks) uses
+``default``.
+
+Read-your-writes: once a request writes, its remaining reads go to
+``default``, and ``ReplicaRoutingMiddleware`` keeps the writer's following
+requests on ``default`` for ``DATABASE_REPLICA_STICKY_SECONDS``, which
+should exceed the lag replicas are allowed. A replica is taken out of
+rotation when it cannot be reached or (MySQL) lags more than
+``DATABASE_REPLICA_MAX_LAG`` seconds; health is checked at most every
+``DATABASE_REPLICA_CHECK_INTERVAL`` seconds per process.
+"""
+import logging
+import random
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, DEFAULT_DB_ALIAS, connections
+
+from .cache import cache_key
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# alias -> (healthy, time.monotonic() of the check)
+_health = {}
+
+
+class RoutingState:
+    """Routing decisions of the current request"""
+
+    def __init__(self):
+        self.replica_reads = False
+        self.replica = None
+        self.wrote = False
+
+
+_state = ContextVar('replica_routing', default=None)
+
+
+def replica_weights():
+    return getattr(settings, 'DATABASE_REPLICAS', {})
+
+
+def replica_setting(name, default):
+    return getattr(settings, f'DATABASE_REPLICA_{name}', default)
+
+
+def replication_lag(cursor, vendor):
+    """Seconds the replica behind ``cursor`` lags its source, or None if it is not replicating"""
+    if vendor != 'mysql':
+        return None
+    try:
+        cursor.execute('SHOW REPLICA STATUS')
+    except DatabaseError:
+        # MySQL before 8.0.22, or an account without REPLICATION CLIENT
+        return None
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    columns = [column[0] for column in cursor.description]
+    lag = dict(zip(columns, row)).get('Seconds_Behind_Source')
+    # NULL while the replication threads are stopped
+    return float('inf') if lag is None else lag
+
+
+def check_replica(alias):
+    connection = connections[alias]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            lag = replication_lag(cursor, connection.vendor)
+    except DatabaseError:
+        logger.warning('Database replica %s is unreachable', alias, exc_info=True)
+        connection.close()
+        return False
+    max_lag = replica_setting('MAX_LAG', 5)
+    if lag is not None and lag > max_lag:
+        logger.warning('Database replica %s lags %ss (limit %ss)', alias, lag, max_lag)
+        return False
+    return True
+
+
+def replica_is_healthy(alias):
+    healthy, checked_at = _health.get(alias, (None, 0.0))
+    now = time.monotonic()
+    if healthy is None or now - checked_at >= replica_setting('CHECK_INTERVAL', 10):
+        healthy = check_replica(alias)
+        _health[alias] = (healthy, now)
+    return healthy
+
+
+def pick_replica():
+    """A healthy replica chosen by weight, or None"""
+    healthy = [
+        (alias, weight) for alias, weight in replica_weights().items()
+        if weight > 0 and replica_is_healthy(alias)
+    ]
+    if not healthy:
+        return None
+    aliases, weights = zip(*healthy)
+    return random.choices(aliases, weights)[0]
+
+
+def sticky_key(user_id):
+    return cache_key('db-sticky', user_id)
+
+
+def is_sticky(user):
+    return bool(user and user.is_authenticated and cache.get(sticky_key(user.pk)))
+
+
+def use_replicas(request):
+    """Let the rest of ``request`` read from a replica, unless its user wrote recently"""
+    state = _state.get()
+    if state is None or state.wrote or request.method not in SAFE_METHODS:
+        return
+    if not is_sticky(getattr(request, 'user', None)):
+        state.replica_reads = True
+
+
+def replica_reads(view):
+    """Decorator serving the safe requests of a function view from a replica"""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        use_replicas(request)
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+class ReplicaReadsMixin:
+    """Serve a viewset's ``replica_actions`` from a replica"""
+
+    replica_actions = ('list', 'retrieve')
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.action in self.replica_actions:
+            use_replicas(request)
+
+
+class ReplicaRoutingMiddleware:
+    """Scope routing decisions to a request and make its writer sticky to the primary"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_weights():
+            return self.get_response(request)
+        state = RoutingState()
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        user = getattr(request, 'user', None)
+        if state.wrote and user is not None and user.is_authenticated:
+            cache.set(sticky_key(user.pk), 1, timeout=replica_setting('STICKY_SECONDS', 10))
+        return response
+
+
+class ReplicaRouter:
+    """Send opted-in reads to a replica; see the module docstring"""
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.replica_reads or state.wrote:
+            return None
+        if state.replica is None:
+            state.replica = pick_replica() or DEFAULT_DB_ALIAS
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None and model._meta.label_lower not in replica_setting('UNTRACKED_WRITES', ()):
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replica_weights()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replica_weights():
+            return False
+        return None
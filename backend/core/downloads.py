@@ -0,0 +1,156 @@
+"""
+Efficient file downloads.
+
+``serve_file`` answers conditional requests (If-None-Match,
+If-Modified-Since, ...) and single byte ranges, then either hands the
+transfer to the front-end web server or streams the file with
+``FileResponse``:
+
+* ``MEDIA_SENDFILE_BACKEND = 'x-accel-redirect'`` (nginx) returns an empty
+  response with ``X-Accel-Redirect: <MEDIA_SENDFILE_URL><name>``; nginx then
+  serves the bytes itself, including ranges. The location must be marked
+  ``internal`` so it cannot be requested directly.
+* ``MEDIA_SENDFILE_BACKEND = 'x-sendfile'`` (Apache mod_xsendfile, lighttpd)
+  returns ``X-Sendfile: <absolute path>``.
+* Otherwise the open file is passed to ``FileResponse``. WSGI servers with a
+  ``wsgi.file_wrapper`` (gunicorn, uWSGI) send it with ``sendfile(2)``
+  starting at the range offset, so the file is never read into Python.
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+from .storage import blob_etag
+
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeFile:
+    """File wrapper that stops reading after ``length`` bytes from the current offset.
+
+    ``fileno`` and ``tell`` are delegated so that sendfile-capable WSGI file
+    wrappers still take the zero-copy path (bounded by Content-Length).
+    """
+
+    def __init__(self, f, length):
+        self.f = f
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.f.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.f.fileno()
+
+    def tell(self):
+        return self.f.tell()
+
+    def close(self):
+        self.f.close()
+
+
+def file_etag(name, stat):
+    """Strong validator: the blob hash when content-addressed, else mtime and size"""
+    return blob_etag(name) or quote_etag(f'{int(stat.st_mtime):x}-{stat.st_size:x}')
+
+
+def parse_range(header, size):
+    """Return ``(start, end)`` (inclusive) for a single-range header, None to send the
+    whole file, or ``False`` when the range cannot be satisfied."""
+    match = RANGE_RE.match(header.replace(' ', ''))
+    if not match:
+        # Malformed or multi-range requests get the full representation
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _if_range_matches(request, etag, last_modified):
+    value = request.META.get('HTTP_IF_RANGE')
+    if not value:
+        return True
+    if value.startswith('"') or value.startswith('W/'):
+        return value == etag
+    date = parse_http_date_safe(value)
+    return date is not None and date == last_modified
+
+
+def serve_file(request, path, name, filename=None, as_attachment=True, cache_control='private, no-cache'):
+    """Serve the file at absolute ``path`` (stored as ``name``) to an authorized request"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        raise Http404('File not found')
+
+    etag = file_etag(name, stat)
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = _file_response(request, path, name, stat.st_size, etag, last_modified)
+        filename = filename or os.path.basename(name)
+        disposition = 'attachment' if as_attachment else 'inline'
+        response['Content-Disposition'] = f"{disposition}; filename*=UTF-8''{quote(filename)}"
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = cache_control
+    return response
+
+
+def _file_response(request, path, name, size, etag, last_modified):
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    byte_range = None
+    if request.method == 'GET' and 'HTTP_RANGE' in request.META and _if_range_matches(request, etag, last_modified):
+        byte_range = parse_range(request.META['HTTP_RANGE'], size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    backend = getattr(settings, 'MEDIA_SENDFILE_BACKEND', '')
+    if backend == 'x-accel-redirect':
+        # nginx evaluates Range and conditional headers itself
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = quote(f"{settings.MEDIA_SENDFILE_URL.rstrip('/')}/{name}")
+        return response
+    if backend == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = path
+        return response
+
+    f = open(path, 'rb')
+    if byte_range is None:
+        response = FileResponse(f, content_type=content_type)
+        response['Content-Length'] = size
+    else:
+        start, end = byte_range
+        f.seek(start)
+        response = FileResponse(RangeFile(f, end - start + 1), content_type=content_type, status=206)
+        response['Content-Length'] = end - start + 1
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Accept-Ranges'] = 'bytes'
+    return response
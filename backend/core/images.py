@@ -0,0 +1,192 @@
+"""
+Image derivatives (thumbnails) for avatars, company logos and covers.
+
+Every image field registered with ``register_image_derivatives`` gets a
+fixed set of sizes rendered to WebP and JPEG by a background task when a new
+file is saved. Derivative names are derived from the source (its content
+hash for content-addressed blobs), so they are shared between identical
+uploads and never need to be invalidated::
+
+    thumbs/9f/9f86d0…/96x96-fit.webp
+
+Files uploaded before this existed are handled lazily: ``thumbnail_url``
+queues generation on first use and falls back to the original until the
+derivative exists.
+"""
+import hashlib
+import io
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models.signals import post_init, post_save
+
+from .storage import blob_hash, get_content_storage
+
+
+THUMBNAIL_PREFIX = 'thumbs'
+
+# kind -> size name -> (width, height, mode); 'crop' fills the box, 'fit' fits inside it
+IMAGE_SPECS = {
+    'avatar': {
+        'sm': (80, 80, 'crop'),
+        'md': (256, 256, 'crop'),
+    },
+    'logo': {
+        'sm': (96, 96, 'fit'),
+        'md': (256, 256, 'fit'),
+    },
+    'cover': {
+        'md': (640, 240, 'crop'),
+        'lg': (1280, 480, 'crop'),
+    },
+}
+
+FORMATS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+    'jpeg': {'format': 'JPEG', 'quality': 85, 'optimize': True, 'progressive': True},
+}
+
+# Derivative names already known to exist, so hot paths skip the stat call
+_existing = set()
+
+# Sources whose generation this process has already queued
+_queued = set()
+
+# (model, field name, kind) registered for derivatives
+_image_fields = []
+
+
+def source_key(name):
+    """Stable key for a source image: its blob hash, or a hash of its name"""
+    return blob_hash(name) or hashlib.sha256(name.encode()).hexdigest()
+
+
+def derivative_name(source_name, kind, size, fmt='webp'):
+    width, height, mode = IMAGE_SPECS[kind][size]
+    key = source_key(source_name)
+    return f"{THUMBNAIL_PREFIX}/{key[:2]}/{key}/{width}x{height}-{mode}.{fmt}"
+
+
+def render_derivative(image, width, height, mode, fmt):
+    """Encode one resized copy of a PIL image"""
+    from PIL import Image, ImageOps
+
+    if mode == 'crop':
+        resized = ImageOps.fit(image, (width, height), Image.Resampling.LANCZOS)
+    else:
+        resized = ImageOps.contain(image, (width, height), Image.Resampling.LANCZOS)
+
+    if fmt == 'jpeg' and resized.mode != 'RGB':
+        # JPEG has no alpha channel; flatten transparent logos onto white
+        background = Image.new('RGB', resized.size, (255, 255, 255))
+        rgba = resized.convert('RGBA')
+        background.paste(rgba, mask=rgba.getchannel('A'))
+        resized = background
+    elif resized.mode not in ('RGB', 'RGBA'):
+        resized = resized.convert('RGBA')
+
+    output = io.BytesIO()
+    resized.save(output, **FORMATS[fmt])
+    return output.getvalue()
+
+
+def generate_derivatives(source_name, kind, force=False):
+    """Render every missing size/format of ``source_name``. Returns the number written."""
+    from PIL import Image, ImageOps
+
+    wanted = [
+        (size, fmt, derivative_name(source_name, kind, size, fmt))
+        for size in IMAGE_SPECS[kind] for fmt in FORMATS
+    ]
+    if not force:
+        wanted = [item for item in wanted if not default_storage.exists(item[2])]
+    if not wanted:
+        return 0
+
+    with get_content_storage().open(source_name, 'rb') as source:
+        image = Image.open(source)
+        largest = max(max(IMAGE_SPECS[kind][size][:2]) for size, _, _ in wanted)
+        # Let the JPEG decoder downscale while decoding large photos
+        image.draft('RGB', (largest * 2, largest * 2))
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    for size, fmt, name in wanted:
+        width, height, mode = IMAGE_SPECS[kind][size]
+        data = render_derivative(image, width, height, mode, fmt)
+        if force and default_storage.exists(name):
+            default_storage.delete(name)
+        default_storage.save(name, ContentFile(data))
+        _existing.add(name)
+    return len(wanted)
+
+
+def delete_derivatives(source_name):
+    """Remove every derivative of a source image"""
+    key = source_key(source_name)
+    directory = f"{THUMBNAIL_PREFIX}/{key[:2]}/{key}"
+    if not default_storage.exists(directory):
+        return
+    _, files = default_storage.listdir(directory)
+    for filename in files:
+        default_storage.delete(f"{directory}/{filename}")
+        _existing.discard(f"{directory}/{filename}")
+
+
+def queue_derivatives(source_name, kind):
+    from taskqueue.registry import enqueue_on_commit
+    enqueue_on_commit('core.tasks.generate_image_derivatives', source_name, kind)
+    _queued.add(source_name)
+
+
+def thumbnail_url(fieldfile, kind, size, fmt='webp'):
+    """URL of a derivative, or of the original while the derivative is being generated"""
+    if not fieldfile:
+        return None
+    name = derivative_name(fieldfile.name, kind, size, fmt)
+    if name not in _existing:
+        if not default_storage.exists(name):
+            if fieldfile.name not in _queued:
+                queue_derivatives(fieldfile.name, kind)
+            return fieldfile.url
+        _existing.add(name)
+    return default_storage.url(name)
+
+
+def thumbnail_urls(fieldfile, kind):
+    """``{size: {format: url}}`` for every derivative of an image"""
+    if not fieldfile:
+        return None
+    return {
+        size: {fmt: thumbnail_url(fieldfile, kind, size, fmt) for fmt in FORMATS}
+        for size in IMAGE_SPECS[kind]
+    }
+
+
+def register_image_derivatives(model, field, kind):
+    """Queue derivative generation whenever a new image is saved to ``model.field``"""
+    _image_fields.append((model, field, kind))
+    attr = f'_{field}_thumbnail_source'
+
+    def remember(sender, instance, **kwargs):
+        setattr(instance, attr, _name(instance.__dict__.get(field)))
+
+    def saved(sender, instance, raw=False, **kwargs):
+        if raw or field not in instance.__dict__:
+            return
+        current = _name(instance.__dict__[field])
+        if current and current != getattr(instance, attr, ''):
+            queue_derivatives(current, kind)
+        remember(sender, instance)
+
+    uid = f'thumbs:{model._meta.label}.{field}'
+    post_init.connect(remember, sender=model, weak=False, dispatch_uid=uid)
+    post_save.connect(saved, sender=model, weak=False, dispatch_uid=uid)
+
+
+def image_fields():
+    return list(_image_fields)
+
+
+def _name(value):
+    return getattr(value, 'name', value) or ''
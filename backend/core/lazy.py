@@ -0,0 +1,40 @@
+"""
+Lazy imports of heavy optional dependencies.
+
+Web workers and management commands import every view module at startup,
+so a module-level ``import numpy`` is paid by every process, including the
+ones that never rank a candidate. Heavy libraries are therefore imported
+where they are used: inside the function for one-off use (ReportLab in
+jobs/resume_rendering.py, Pillow in core/images.py, database drivers), or
+through ``lazy_import`` for modules used all over a file::
+
+    np = lazy_import('numpy')
+
+``HEAVY_MODULES`` lists what must not be imported at startup;
+``manage.py profile_imports`` reports any that are, and core/tests.py
+checks it.
+"""
+import importlib
+
+
+HEAVY_MODULES = ('numpy', 'reportlab', 'PIL', 'pymysql', 'mysql.connector', 'redis')
+
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access"""
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attribute):
+        value = getattr(importlib.import_module(self._name), attribute)
+        # Later lookups of the same attribute skip __getattr__
+        setattr(self, attribute, value)
+        return value
+
+    def __repr__(self):
+        return f'<lazy module {self._name!r}>'
+
+
+def lazy_import(name):
+    return LazyModule(name)
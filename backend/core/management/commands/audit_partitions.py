@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+from django.db import connections, router
+from django.utils import timezone
+
+from core.audit import partition_plan
+from core.models import AuditEvent
+
+
+class Command(BaseCommand):
+    help = 'Create monthly partitions of the audit log ahead of time and drop expired ones (MySQL)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=3, help='Months to create ahead of the current one')
+        parser.add_argument('--retain-months', type=int,
+                            help='Drop the partitions of months older than this (default: keep everything)')
+        parser.add_argument('--dry-run', action='store_true', help='Print the statements without running them')
+
+    def handle(self, *args, **options):
+        connection = connections[router.db_for_write(AuditEvent)]
+        if connection.vendor != 'mysql':
+            self.stdout.write(f'{connection.vendor} database: the audit log is not partitioned, nothing to do')
+            return
+
+        table = connection.ops.quote_name(AuditEvent._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT PARTITION_NAME FROM information_schema.PARTITIONS '
+                'WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL',
+                [AuditEvent._meta.db_table],
+            )
+            existing = [row[0] for row in cursor.fetchall()]
+        to_add, to_drop = partition_plan(
+            existing, timezone.now(), options['months_ahead'], options['retain_months'],
+        )
+
+        statements = []
+        if not existing:
+            # First run: one catch-all partition, split into months below
+            statements.append(f'ALTER TABLE {table} PARTITION BY RANGE (id) (PARTITION pmax VALUES LESS THAN MAXVALUE)')
+        if to_add:
+            months = ', '.join(f'PARTITION {name} VALUES LESS THAN ({bound})' for name, bound in to_add)
+            statements.append(
+                f'ALTER TABLE {table} REORGANIZE PARTITION pmax INTO ({months}, PARTITION pmax VALUES LESS THAN MAXVALUE)'
+            )
+        if to_drop:
+            statements.append(f"ALTER TABLE {table} DROP PARTITION {', '.join(to_drop)}")
+
+        for statement in statements:
+            self.stdout.write(statement)
+            if not options['dry_run']:
+                with connection.cursor() as cursor:
+                    cursor.execute(statement)
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(to_add)} partitions added, {len(to_drop)} dropped' + (' (dry run)' if options['dry_run'] else '')
+        ))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from core.cache import cache_stats, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Show cache hit/miss counters summed over all worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Zero the counters after printing them')
+
+    def handle(self, *args, **options):
+        stats = cache_stats()
+        lookups = stats['local_hits'] + stats['shared_hits'] + stats['misses']
+        for name, value in stats.items():
+            self.stdout.write(f"{name:>14}: {value}")
+        if lookups:
+            hit_rate = (stats['local_hits'] + stats['shared_hits']) / lookups
+            self.stdout.write(self.style.SUCCESS(
+                f"Hit rate {hit_rate:.1%} ({stats['local_hits'] / lookups:.1%} from process memory)"
+            ))
+        if options['reset']:
+            reset_cache_stats()
+            self.stdout.write('Counters reset')
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from core.db_metrics import METRIC_NAMES, worker_stats
+
+
+class Command(BaseCommand):
+    help = 'Show database connection counters of every worker process that published them recently'
+
+    def handle(self, *args, **options):
+        stats = worker_stats()
+        if not stats:
+            self.stdout.write('No worker has published connection metrics yet')
+            return
+
+        self.stdout.write(f"{'worker':<32}{'requests':>10}{'connects':>10}{'reuses':>8}"
+                          f"{'per req':>9}{'avg ms':>8}{'failed':>8}{'closes':>8}")
+        totals = dict.fromkeys(METRIC_NAMES, 0)
+        for worker, counts in sorted(stats.items()):
+            for name in METRIC_NAMES:
+                totals[name] += counts.get(name, 0)
+            self.stdout.write(self._row(worker, counts))
+        if len(stats) > 1:
+            self.stdout.write(self.style.SUCCESS(self._row('total', totals)))
+
+    def _row(self, label, counts):
+        connects = counts.get('connects', 0)
+        per_request = connects / counts['requests'] if counts.get('requests') else 0
+        average = counts.get('connect_ms', 0) / connects if connects else 0
+        return (
+            f"{label:<32}{counts.get('requests', 0):>10}{connects:>10}{counts.get('reuses', 0):>8}"
+            f"{per_request:>9.2f}{average:>8.1f}{counts.get('health_check_failures', 0):>8}"
+            f"{counts.get('closes', 0):>8}"
+        )
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from core.storage import CAS_PREFIX, add_references, tracked_fields
+
+
+class Command(BaseCommand):
+    help = 'Move media files stored under their upload names into content-addressed storage'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--delete-originals', action='store_true',
+                            help='Remove the original files once they have been moved')
+
+    def handle(self, *args, **options):
+        moved = 0
+        missing = 0
+        for model, field_name in tracked_fields():
+            field = model._meta.get_field(field_name)
+            storage = field.storage
+            rows = (
+                model._default_manager.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+                .exclude(**{f'{field_name}__startswith': f'{CAS_PREFIX}/'})
+                .values_list('pk', field_name)
+            )
+            for pk, name in rows.iterator(chunk_size=500):
+                if not storage.exists(name):
+                    missing += 1
+                    continue
+                with storage.open(name, 'rb') as original:
+                    blob_name = storage.save(name, original)
+                model._default_manager.filter(pk=pk, **{field_name: name}).update(**{field_name: blob_name})
+                add_references([blob_name])
+                still_used = any(
+                    other._default_manager.filter(**{other_field: name}).exists()
+                    for other, other_field in tracked_fields()
+                )
+                if options['delete_originals'] and not still_used:
+                    storage.delete(name)
+                moved += 1
+            self.stdout.write(f"{model._meta.label}.{field_name}: done")
+
+        self.stdout.write(self.style.SUCCESS(f"Moved {moved} files, {missing} missing on disk"))
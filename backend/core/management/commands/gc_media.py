@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from core.storage import GC_GRACE_PERIOD, collect_garbage, recount_references
+from core.uploads import expire_uploads
+
+
+class Command(BaseCommand):
+    help = 'Delete content-addressed media blobs that are no longer referenced by any model, and abandoned uploads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report orphans without deleting them')
+        parser.add_argument('--grace-hours', type=float, default=GC_GRACE_PERIOD.total_seconds() / 3600,
+                            help='Keep unreferenced blobs younger than this')
+        parser.add_argument('--recount', action='store_true',
+                            help='Recompute reference counts from the database first')
+
+    def handle(self, *args, **options):
+        if not options['dry_run']:
+            expired = expire_uploads()
+            self.stdout.write(f"Expired {expired} abandoned uploads")
+
+        if options['recount']:
+            fixed = recount_references()
+            self.stdout.write(f"Corrected reference counts of {fixed} blobs")
+
+        count, freed = collect_garbage(
+            grace_period=timedelta(hours=options['grace_hours']), dry_run=options['dry_run'],
+        )
+        action = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(f"{action} {count} orphaned blobs ({freed / 1024 / 1024:.1f} MB)"))
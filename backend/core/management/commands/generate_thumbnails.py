@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from core.images import generate_derivatives, image_fields, queue_derivatives
+
+
+class Command(BaseCommand):
+    help = 'Generate missing thumbnail derivatives for existing avatars, logos and cover images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sync', action='store_true',
+                            help='Render in this process instead of queueing background tasks')
+        parser.add_argument('--force', action='store_true', help='Re-render derivatives that already exist')
+
+    def handle(self, *args, **options):
+        total = 0
+        for model, field, kind in image_fields():
+            names = (
+                model._default_manager.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+                .values_list(field, flat=True).distinct()
+            )
+            for name in names.iterator(chunk_size=500):
+                if options['sync']:
+                    try:
+                        generate_derivatives(name, kind, force=options['force'])
+                    except Exception as e:
+                        self.stderr.write(f"{name}: {e}")
+                        continue
+                else:
+                    queue_derivatives(name, kind)
+                total += 1
+            self.stdout.write(f"{model._meta.label}.{field}: done")
+
+        action = 'Processed' if options['sync'] else 'Queued'
+        self.stdout.write(self.style.SUCCESS(f"{action} {total} images"))
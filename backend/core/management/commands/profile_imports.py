@@ -0,0 +1,78 @@
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.lazy import HEAVY_MODULES
+
+
+STARTUP = 'import django; django.setup(); '
+
+
+def parse_importtime(output):
+    """``[(module, self_us, cumulative_us)]`` from ``python -X importtime`` output"""
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+class Command(BaseCommand):
+    help = 'Report the slowest imports of a fresh worker (or management command) process'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--module', default=settings.ROOT_URLCONF,
+                            help='Module imported after django.setup() (default: the URLconf, i.e. every view)')
+        parser.add_argument('--command', help='Profile loading this management command instead')
+        parser.add_argument('--limit', type=int, default=20, help='Rows to list')
+        parser.add_argument('--by', choices=['package', 'module'], default='package',
+                            help='Sum import time per top-level package (default) or list single modules')
+        parser.add_argument('--budget', type=float, help='Fail when startup imports take more than this many ms')
+
+    def handle(self, *args, **options):
+        if options['command']:
+            name = options['command']
+            code = (STARTUP + 'from django.core.management import get_commands, load_command_class; '
+                    f'load_command_class(get_commands()[{name!r}], {name!r})')
+        else:
+            code = STARTUP + f"import {options['module']}"
+        code += f'; import sys; print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))'
+
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE}
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode:
+            raise CommandError(result.stderr.strip().splitlines()[-1])
+        modules = parse_importtime(result.stderr)
+        total_ms = sum(self_us for _, self_us, _ in modules) / 1000
+
+        if options['by'] == 'package':
+            packages = defaultdict(lambda: [0, 0])
+            for name, self_us, _ in modules:
+                package = packages[name.split('.')[0]]
+                package[0] += self_us
+                package[1] += 1
+            self.stdout.write(f"{'package':<48}{'time':>10}{'modules':>9}")
+            for name, (self_us, count) in sorted(packages.items(), key=lambda item: -item[1][0])[:options['limit']]:
+                self.stdout.write(f"{name:<48}{self_us / 1000:>8.1f}ms{count:>9}")
+        else:
+            self.stdout.write(f"{'module':<48}{'self':>10}{'cumulative':>12}")
+            for name, self_us, cumulative_us in sorted(modules, key=lambda row: -row[1])[:options['limit']]:
+                self.stdout.write(f"{name:<48}{self_us / 1000:>8.1f}ms{cumulative_us / 1000:>10.1f}ms")
+        self.stdout.write(f"{len(modules)} modules imported in {total_ms:.0f}ms")
+
+        heavy = [module for module in result.stdout.strip().split(',') if module]
+        if heavy:
+            self.stdout.write(self.style.WARNING(
+                f"Heavy modules imported at startup: {', '.join(heavy)} (import them lazily, see core/lazy.py)"
+            ))
+        if options['budget'] is not None and total_ms > options['budget']:
+            raise CommandError(f"Startup imports took {total_ms:.0f}ms, over the {options['budget']:.0f}ms budget")
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.10 on 2026-10-19 05:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_conversation_metadata'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CanonicalSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Skill Name')),
+                ('key', models.CharField(help_text='Normalized lowercase form of the name', max_length=100, unique=True, verbose_name='Lookup Key')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Canonical Skill',
+                'verbose_name_plural': 'Canonical Skills',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SkillAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(help_text='Normalized lowercase form of the alias', max_length=100, unique=True, verbose_name='Alias Key')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='core.canonicalskill')),
+            ],
+            options={
+                'verbose_name': 'Skill Alias',
+                'verbose_name_plural': 'Skill Aliases',
+                'ordering': ['key'],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.10 on 2026-10-19 05:33
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_content_addressed_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('purpose', models.CharField(choices=[('resume', 'Resume'), ('tax_document', 'Tax Refund Document')], max_length=20, verbose_name='Purpose')),
+                ('target_id', models.BigIntegerField(blank=True, help_text='Object the file is attached to, e.g. the tax refund application', null=True, verbose_name='Target ID')),
+                ('filename', models.CharField(max_length=255, verbose_name='Filename')),
+                ('metadata', models.JSONField(blank=True, default=dict, verbose_name='Metadata')),
+                ('size', models.BigIntegerField(verbose_name='Total Size')),
+                ('offset', models.BigIntegerField(default=0, verbose_name='Bytes Received')),
+                ('content_hash', models.CharField(blank=True, default='', max_length=64, verbose_name='SHA-256')),
+                ('status', models.CharField(choices=[('active', 'Active'), ('completed', 'Completed'), ('expired', 'Expired')], default='active', max_length=20, verbose_name='Status')),
+                ('result', models.CharField(blank=True, default='', max_length=255, verbose_name='Stored As')),
+                ('expires_at', models.DateTimeField(verbose_name='Expires At')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Upload Session',
+                'verbose_name_plural': 'Upload Sessions',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'expires_at'], name='core_upload_expiry_idx')],
+            },
+        ),
+    ]
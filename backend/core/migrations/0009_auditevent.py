@@ -0,0 +1,31 @@
+# Generated by Django 5.2.10 on 2026-10-19 06:18
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditEvent',
+            fields=[
+                ('id', models.BigIntegerField(editable=False, primary_key=True, serialize=False)),
+                ('entity_type', models.PositiveIntegerField(help_text='Content type id', verbose_name='Entity Type')),
+                ('entity_id', models.BigIntegerField(verbose_name='Entity ID')),
+                ('actor_id', models.BigIntegerField(blank=True, null=True, verbose_name='Actor ID')),
+                ('action', models.CharField(max_length=32, verbose_name='Action')),
+                ('changes', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='{field: [old, new]}', verbose_name='Changes')),
+            ],
+            options={
+                'verbose_name': 'Audit Event',
+                'verbose_name_plural': 'Audit Events',
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['entity_type', 'entity_id', 'id'], name='core_audit_entity_idx'), models.Index(fields=['actor_id', 'id'], name='core_audit_actor_idx')],
+            },
+        ),
+    ]
@@ -1,7 +1,13 @@
+import uuid
+
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.contrib.contenttypes.models import ContentType
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils import timezone
 
+from .storage import get_content_storage
+
 
 class UserManager(BaseUserManager):
     """Custom user manager for email-based authentication"""
@@ -38,13 +44,16 @@ class User(AbstractUser):
         ('admin', 'Admin'),
     ]
     
+    # Sign-ups get 'applicant'; the admin panel and seed data use 'job_seeker'
+    JOB_SEEKER_ROLES = ('applicant', 'job_seeker')
+    
     username = None
     email = models.EmailField('Email Address', unique=True)
     first_name = models.CharField('First Name', max_length=150)
     last_name = models.CharField('Last Name', max_length=150)
     phone = models.CharField('Phone Number', max_length=20, blank=True, null=True)
     role = models.CharField('Role', max_length=20, choices=ROLE_CHOICES, default='applicant')
-    avatar = models.ImageField('Avatar', upload_to='avatars/', blank=True, null=True)
+    avatar = models.ImageField('Avatar', upload_to='avatars/', storage=get_content_storage, blank=True, null=True)
     
     headline = models.CharField('Professional Headline', max_length=255, blank=True, null=True)
     bio = models.TextField('Bio/Summary', blank=True, null=True)
@@ -78,6 +87,14 @@ class User(AbstractUser):
         verbose_name = 'User'
         verbose_name_plural = 'Users'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at'], name='core_user_created_idx'),
+            # Admin seeker/employer lists and their stat counts
+            models.Index(fields=['role', 'created_at'], name='core_user_role_created_idx'),
+            models.Index(fields=['role', 'is_verified'], name='core_user_role_verified_idx'),
+            # Few users are suspended; skipped on MySQL, where role_created serves
+            models.Index(fields=['role'], name='core_user_suspended_idx', condition=models.Q(is_suspended=True)),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.email})"
@@ -181,6 +198,38 @@ class Skill(models.Model):
         return f"{self.name} ({self.proficiency})"
 
 
+class CanonicalSkill(models.Model):
+    """Canonical entry in the skill taxonomy"""
+    
+    name = models.CharField('Skill Name', max_length=100)
+    key = models.CharField('Lookup Key', max_length=100, unique=True, help_text='Normalized lowercase form of the name')
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Canonical Skill'
+        verbose_name_plural = 'Canonical Skills'
+        ordering = ['name']
+    
+    def __str__(self):
+        return self.name
+
+
+class SkillAlias(models.Model):
+    """Alternative spelling that resolves to a canonical skill"""
+    
+    key = models.CharField('Alias Key', max_length=100, unique=True, help_text='Normalized lowercase form of the alias')
+    skill = models.ForeignKey(CanonicalSkill, on_delete=models.CASCADE, related_name='aliases')
+    
+    class Meta:
+        verbose_name = 'Skill Alias'
+        verbose_name_plural = 'Skill Aliases'
+        ordering = ['key']
+    
+    def __str__(self):
+        return f"{self.key} -> {self.skill.name}"
+
+
 class Certification(models.Model):
     """Certifications for users"""
     
@@ -283,3 +332,130 @@ class ChatMessage(models.Model):
     
     def __str__(self):
         return f"Message from {self.sender.email} at {self.created_at}"
+
+
+class StoredBlob(models.Model):
+    """A deduplicated file in content-addressed media storage"""
+    
+    name = models.CharField('Storage Name', max_length=255, unique=True)
+    content_hash = models.CharField('SHA-256', max_length=64, db_index=True)
+    size = models.BigIntegerField('Size (bytes)', default=0)
+    ref_count = models.IntegerField('References', default=0, help_text='Number of model fields pointing at this blob')
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        verbose_name = 'Stored Blob'
+        verbose_name_plural = 'Stored Blobs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['ref_count', 'updated_at'], name='core_blob_gc_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
+
+class UploadSession(models.Model):
+    """A chunked, resumable upload in progress"""
+    
+    PURPOSE_CHOICES = [
+        ('resume', 'Resume'),
+        ('tax_document', 'Tax Refund Document'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('active', 'Active'),
+        ('completed', 'Completed'),
+        ('expired', 'Expired'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='upload_sessions')
+    purpose = models.CharField('Purpose', max_length=20, choices=PURPOSE_CHOICES)
+    target_id = models.BigIntegerField('Target ID', blank=True, null=True,
+                                       help_text='Object the file is attached to, e.g. the tax refund application')
+    filename = models.CharField('Filename', max_length=255)
+    metadata = models.JSONField('Metadata', default=dict, blank=True)
+    
+    size = models.BigIntegerField('Total Size')
+    offset = models.BigIntegerField('Bytes Received', default=0)
+    content_hash = models.CharField('SHA-256', max_length=64, blank=True, default='')
+    status = models.CharField('Status', max_length=20, choices=STATUS_CHOICES, default='active')
+    result = models.CharField('Stored As', max_length=255, blank=True, default='')
+    
+    expires_at = models.DateTimeField('Expires At')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Upload Session'
+        verbose_name_plural = 'Upload Sessions'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'expires_at'], name='core_upload_expiry_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
+
+
+class AuditEventQuerySet(models.QuerySet):
+    def for_entity(self, entity):
+        return self.filter(entity_type=ContentType.objects.get_for_model(entity).pk, entity_id=entity.pk)
+    
+    def by_actor(self, user):
+        return self.filter(actor_id=user.pk)
+    
+    def between(self, start, end):
+        """Events from ``start`` up to ``end``; ids are time ordered (see core/audit.py)"""
+        from .audit import id_at
+        return self.filter(id__gte=id_at(start), id__lt=id_at(end))
+    
+    def update(self, **kwargs):
+        raise TypeError('Audit events are append-only')
+    
+    def delete(self):
+        raise TypeError('Audit events are append-only; expired months are dropped by audit_partitions')
+
+
+class AuditEvent(models.Model):
+    """One change to one row, written in batches by core.audit; never updated or deleted"""
+    
+    # Time ordered, generated by core.audit; the table is partitioned by month on it
+    id = models.BigIntegerField(primary_key=True, editable=False)
+    # Plain ids: a partitioned MySQL table cannot have foreign keys
+    entity_type = models.PositiveIntegerField('Entity Type', help_text='Content type id')
+    entity_id = models.BigIntegerField('Entity ID')
+    actor_id = models.BigIntegerField('Actor ID', blank=True, null=True)
+    action = models.CharField('Action', max_length=32)
+    changes = models.JSONField('Changes', default=dict, blank=True, encoder=DjangoJSONEncoder,
+                               help_text='{field: [old, new]}')
+    
+    objects = AuditEventQuerySet.as_manager()
+    
+    class Meta:
+        verbose_name = 'Audit Event'
+        verbose_name_plural = 'Audit Events'
+        ordering = ['-id']
+        indexes = [
+            models.Index(fields=['entity_type', 'entity_id', 'id'], name='core_audit_entity_idx'),
+            models.Index(fields=['actor_id', 'id'], name='core_audit_actor_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.action} {self.entity_type}:{self.entity_id} by {self.actor_id}"
+    
+    @property
+    def created_at(self):
+        from .audit import time_of
+        return time_of(self.id)
+    
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise TypeError('Audit events are append-only')
+        super().save(*args, **kwargs)
+    
+    def delete(self, *args, **kwargs):
+        raise TypeError('Audit events are append-only')
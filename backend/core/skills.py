@@ -0,0 +1,136 @@
+"""
+Skill taxonomy helpers.
+
+Skill names coming from job postings and candidate profiles are resolved
+against ``CanonicalSkill``/``SkillAlias`` at write time so that the same
+skill is always stored under the same spelling.
+"""
+from .models import CanonicalSkill, SkillAlias
+
+
+# Common spellings seeded by ``manage.py normalize_skills``
+DEFAULT_ALIASES = {
+    'JavaScript': ['js', 'javascript', 'java script', 'ecmascript', 'es6'],
+    'TypeScript': ['ts', 'typescript'],
+    'Python': ['python', 'python3', 'py'],
+    'Node.js': ['node', 'nodejs', 'node.js', 'node js'],
+    'React': ['react', 'reactjs', 'react.js'],
+    'Vue.js': ['vue', 'vuejs', 'vue.js'],
+    'Angular': ['angular', 'angularjs', 'angular.js'],
+    'Express.js': ['express', 'expressjs', 'express.js'],
+    'Django': ['django'],
+    'PostgreSQL': ['postgres', 'postgresql', 'psql'],
+    'MySQL': ['mysql'],
+    'MongoDB': ['mongo', 'mongodb'],
+    'Kubernetes': ['k8s', 'kubernetes'],
+    'Docker': ['docker'],
+    'AWS': ['aws', 'amazon web services'],
+    'Google Cloud': ['gcp', 'google cloud', 'google cloud platform'],
+    'Azure': ['azure', 'microsoft azure'],
+    'CI/CD': ['ci/cd', 'cicd', 'ci cd'],
+    'Machine Learning': ['ml', 'machine learning'],
+    'SQL': ['sql'],
+    'Go': ['go', 'golang'],
+    'C#': ['c#', 'csharp', 'c sharp'],
+    'C++': ['c++', 'cpp'],
+    'UI/UX Design': ['ui/ux', 'ux/ui', 'ui/ux design', 'ux design', 'ui design'],
+}
+
+
+def skill_key(name):
+    """Normalized lookup key for a skill name"""
+    return ' '.join(str(name).lower().split())
+
+
+def split_skills(value):
+    """Return raw skill names from a list, dict list or comma-separated string"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    names = []
+    for item in value:
+        if isinstance(item, dict):
+            item = item.get('name', '')
+        item = ' '.join(str(item).split())
+        if item:
+            names.append(item)
+    return names
+
+
+def resolve_skill_map(names, create=True):
+    """Map the lookup key of each raw skill name to its CanonicalSkill.
+
+    Unknown names become new canonical skills when ``create`` is true and are
+    left out of the mapping otherwise. Resolution costs at most three
+    queries regardless of how many names are passed.
+    """
+    display = {}
+    for name in names:
+        key = skill_key(name)
+        if key and key not in display:
+            display[key] = name
+
+    if not display:
+        return {}
+
+    keys = list(display)
+    resolved = {skill.key: skill for skill in CanonicalSkill.objects.filter(key__in=keys)}
+    for alias in SkillAlias.objects.filter(key__in=keys).select_related('skill'):
+        resolved.setdefault(alias.key, alias.skill)
+
+    missing = [key for key in keys if key not in resolved]
+    if missing and create:
+        CanonicalSkill.objects.bulk_create(
+            [CanonicalSkill(key=key, name=display[key]) for key in missing],
+            ignore_conflicts=True,
+        )
+        for skill in CanonicalSkill.objects.filter(key__in=missing):
+            resolved[skill.key] = skill
+
+    return {key: resolved[key] for key in keys if key in resolved}
+
+
+def resolve_skills(names, create=True):
+    """Map raw skill names to de-duplicated CanonicalSkill objects, in input order"""
+    skills = []
+    seen = set()
+    for skill in resolve_skill_map(names, create=create).values():
+        if skill.pk not in seen:
+            seen.add(skill.pk)
+            skills.append(skill)
+    return skills
+
+
+def canonical_skill_names(value, create=True):
+    """Normalize a skills value to a list of canonical names"""
+    return [skill.name for skill in resolve_skills(split_skills(value), create=create)]
+
+
+def canonical_skill_name(name, create=True):
+    """Canonical spelling of a single skill name"""
+    skills = resolve_skills([name], create=create)
+    return skills[0].name if skills else ' '.join(str(name).split())
+
+
+def seed_default_aliases():
+    """Create the canonical skills and aliases in DEFAULT_ALIASES"""
+    created = 0
+    for name, aliases in DEFAULT_ALIASES.items():
+        skill, _ = CanonicalSkill.objects.get_or_create(key=skill_key(name), defaults={'name': name})
+        if skill.name != name:
+            skill.name = name
+            skill.save(update_fields=['name'])
+        for alias in aliases:
+            key = skill_key(alias)
+            if key == skill.key:
+                continue
+            _, was_created = SkillAlias.objects.update_or_create(key=key, defaults={'skill': skill})
+            created += was_created
+            # An alias must not also exist as its own canonical entry; move its
+            # job links and aliases over first, or deleting it would cascade to them
+            for duplicate in CanonicalSkill.objects.filter(key=key).exclude(pk=skill.pk):
+                duplicate.job_links.exclude(job__in=skill.job_links.values('job')).update(skill=skill)
+                duplicate.aliases.update(skill=skill)
+                duplicate.delete()
+    return created
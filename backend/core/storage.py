@@ -0,0 +1,262 @@
+"""
+Content-addressed media storage.
+
+Files saved through ``ContentAddressedStorage`` are named after the SHA-256
+of their contents and sharded two levels deep::
+
+    cas/9f/86/9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08.pdf
+
+so identical uploads share one blob on disk and the name itself is a strong
+validator. Every blob has a ``StoredBlob`` row whose ``ref_count`` tracks how
+many model fields point at it; fields opt in with ``track_blob_references``.
+Blobs that are no longer referenced are removed by ``collect_garbage`` (the
+``gc_media`` command) once they are older than a grace period, so an upload
+whose model has not been saved yet is never collected.
+"""
+import hashlib
+import os
+import re
+import tempfile
+from datetime import timedelta
+from functools import lru_cache
+
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_init, post_save, post_delete
+from django.utils import timezone
+
+
+CAS_PREFIX = 'cas'
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+# Unreferenced blobs younger than this are kept (their model may not be saved yet)
+GC_GRACE_PERIOD = timedelta(hours=1)
+
+BLOB_NAME_RE = re.compile(rf'^{CAS_PREFIX}/[0-9a-f]{{2}}/[0-9a-f]{{2}}/([0-9a-f]{{64}})(\.[\w.]+)?$')
+
+# (model, field name) pairs whose references are counted
+_tracked_fields = []
+
+# Callables yielding blob names referenced outside file fields (e.g. JSON lists)
+_reference_sources = []
+
+
+def blob_hash(name):
+    """The content hash encoded in a blob name, or None for other files"""
+    match = BLOB_NAME_RE.match(name or '')
+    return match.group(1) if match else None
+
+
+def blob_etag(name):
+    """Strong ETag for a blob name, or None for files that are not content-addressed"""
+    digest = blob_hash(name)
+    return f'"{digest}"' if digest else None
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that stores each distinct file once, named by its hash"""
+
+    def get_available_name(self, name, max_length=None):
+        # Names are derived from content in _save, so never mangle them
+        return name
+
+    def blob_name(self, digest, original_name):
+        ext = os.path.splitext(original_name)[1].lower()
+        return f"{CAS_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}{ext}"
+
+    def temp_dir(self):
+        """Scratch directory on the same filesystem as the blobs, so adopting is a rename"""
+        path = self.path(os.path.join(CAS_PREFIX, 'tmp'))
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def _save(self, name, content):
+        tmp_dir = self.temp_dir()
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir, suffix='.upload')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                for chunk in content.chunks(HASH_CHUNK_SIZE):
+                    digest.update(chunk)
+                    tmp.write(chunk)
+                    size += len(chunk)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return self.adopt(tmp_path, digest.hexdigest(), name, size)
+
+    def adopt(self, tmp_path, digest, original_name, size):
+        """Move an already-hashed file on the same filesystem into the store. Returns its name."""
+        name = self.blob_name(digest, original_name)
+        full_path = self.path(name)
+        try:
+            # Holding the blob's row lock keeps collect_garbage from purging
+            # the file between the existence check and the new registration
+            with transaction.atomic():
+                register_blob(name, size)
+                if os.path.exists(full_path):
+                    os.unlink(tmp_path)
+                else:
+                    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                    if self.file_permissions_mode is not None:
+                        os.chmod(tmp_path, self.file_permissions_mode)
+                    os.replace(tmp_path, full_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return name
+
+    def delete(self, name):
+        # Blobs may be shared by several files; only collect_garbage removes them
+        if blob_hash(name):
+            return
+        super().delete(name)
+
+    def purge(self, name):
+        """Remove a blob from disk regardless of who may still reference it"""
+        super().delete(name)
+
+
+@lru_cache(maxsize=None)
+def get_content_storage():
+    """Storage used by the deduplicated media fields"""
+    return ContentAddressedStorage()
+
+
+# ============ REFERENCE COUNTING ============
+
+def register_blob(name, size):
+    """Create or touch the row of a blob; locks it until the surrounding transaction ends"""
+    from .models import StoredBlob
+    blob, created = StoredBlob.objects.select_for_update().get_or_create(
+        name=name, defaults={'content_hash': blob_hash(name), 'size': size},
+    )
+    if not created:
+        # Touch the row so the garbage collector's grace period starts over
+        StoredBlob.objects.filter(pk=blob.pk).update(updated_at=timezone.now())
+
+
+def add_references(names):
+    """Increment the reference count of each content-addressed name"""
+    _adjust_references(names, 1)
+
+
+def remove_references(names):
+    """Decrement the reference count of each content-addressed name"""
+    _adjust_references(names, -1)
+
+
+def _adjust_references(names, delta):
+    from .models import StoredBlob
+    names = [name for name in names if blob_hash(name)]
+    if not names:
+        return
+    with transaction.atomic():
+        # Lock in name order so that concurrent adjustments cannot deadlock, and
+        # so that collect_garbage cannot check a count this is about to change
+        list(StoredBlob.objects.select_for_update().filter(name__in=set(names)).order_by('name').values_list('pk'))
+        for name in sorted(set(names)):
+            StoredBlob.objects.filter(name=name).update(
+                ref_count=F('ref_count') + delta * names.count(name), updated_at=timezone.now(),
+            )
+
+
+def _file_name(value):
+    return getattr(value, 'name', value) or ''
+
+
+def track_blob_references(model, *fields):
+    """Keep StoredBlob.ref_count in step with ``fields`` of ``model``"""
+    _tracked_fields.extend((model, field) for field in fields)
+
+    def remember(sender, instance, **kwargs):
+        instance._blob_names = {field: _file_name(instance.__dict__.get(field)) for field in fields}
+
+    def saved(sender, instance, raw=False, **kwargs):
+        if raw:
+            return
+        previous = getattr(instance, '_blob_names', {})
+        added, removed = [], []
+        for field in fields:
+            if field not in instance.__dict__:
+                continue
+            current = _file_name(instance.__dict__[field])
+            old = previous.get(field, '')
+            if current != old:
+                added.append(current)
+                removed.append(old)
+        if added or removed:
+            transaction.on_commit(lambda: (add_references(added), remove_references(removed)))
+        remember(sender, instance)
+
+    def deleted(sender, instance, **kwargs):
+        names = list(getattr(instance, '_blob_names', {}).values())
+        transaction.on_commit(lambda: remove_references(names))
+
+    uid = f'blob-refs:{model._meta.label}'
+    post_init.connect(remember, sender=model, weak=False, dispatch_uid=uid)
+    post_save.connect(saved, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(deleted, sender=model, weak=False, dispatch_uid=uid)
+
+
+def tracked_fields():
+    return list(_tracked_fields)
+
+
+def register_reference_source(func):
+    """Count blob names yielded by ``func()`` as references when recounting"""
+    _reference_sources.append(func)
+    return func
+
+
+def recount_references():
+    """Recompute every blob's ref_count from the tracked fields. Returns the number of blobs fixed."""
+    from .models import StoredBlob
+    counts = {}
+    for model, field in _tracked_fields:
+        names = model._default_manager.filter(**{f'{field}__startswith': f'{CAS_PREFIX}/'}).values_list(field, flat=True)
+        for name in names.iterator(chunk_size=2000):
+            counts[name] = counts.get(name, 0) + 1
+    for source in _reference_sources:
+        for name in source():
+            counts[name] = counts.get(name, 0) + 1
+
+    fixed = 0
+    for blob in StoredBlob.objects.only('id', 'name', 'ref_count').iterator(chunk_size=2000):
+        actual = counts.get(blob.name, 0)
+        if blob.ref_count != actual:
+            StoredBlob.objects.filter(pk=blob.pk).update(ref_count=actual)
+            fixed += 1
+    return fixed
+
+
+def collect_garbage(grace_period=GC_GRACE_PERIOD, dry_run=False):
+    """Delete unreferenced blobs older than ``grace_period``. Returns ``(count, bytes)``."""
+    from .images import delete_derivatives
+    from .models import StoredBlob
+    storage = get_content_storage()
+    cutoff = timezone.now() - grace_period
+    orphans = StoredBlob.objects.filter(ref_count__lte=0, updated_at__lt=cutoff)
+    count = 0
+    freed = 0
+    for blob in orphans.iterator(chunk_size=500):
+        count += 1
+        freed += blob.size
+        if dry_run:
+            continue
+        # Re-check under the row lock: an upload may have referenced or
+        # re-registered the blob meanwhile, and one that starts now waits for
+        # the file to be gone before registering it again
+        with transaction.atomic():
+            locked = StoredBlob.objects.select_for_update().filter(
+                pk=blob.pk, ref_count__lte=0, updated_at__lt=cutoff,
+            ).values_list('pk', flat=True)
+            if locked:
+                StoredBlob.objects.filter(pk=blob.pk).delete()
+                storage.purge(blob.name)
+                delete_derivatives(blob.name)
+    return count, freed
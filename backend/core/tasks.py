@@ -0,0 +1,16 @@
+from taskqueue.registry import task
+
+from .images import generate_derivatives
+from .uploads import expire_uploads
+
+
+@task
+def generate_image_derivatives(source_name, kind):
+    """Render the thumbnail sizes of an uploaded image"""
+    return {'written': generate_derivatives(source_name, kind)}
+
+
+@task
+def expire_upload_sessions():
+    """Delete the partial files of abandoned chunked uploads"""
+    return {'expired': expire_uploads()}
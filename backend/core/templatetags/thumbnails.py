@@ -0,0 +1,13 @@
+from django import template
+
+from core.images import thumbnail_url
+
+
+register = template.Library()
+
+
+@register.filter
+def thumbnail(image, spec):
+    """``{{ user.avatar|thumbnail:"avatar:sm" }}`` - URL of an image derivative"""
+    kind, _, size = spec.partition(':')
+    return thumbnail_url(image, kind, size)
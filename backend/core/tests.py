@@ -1,3 +1,560 @@
-from django.test import TestCase
+import datetime
+import hashlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, router, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from api.serializers import SkillSerializer
+from jobs.models import Company, Job, JobCounterShard, JobSkill, Resume
+from taskqueue.models import Task
+
+from . import audit, db_router, images
+from .cache import bump_version, cache_key, get_versions
+from .cache_backends import FileBasedCache
+from .db_backends.mysql import base as mysql_base
+from .db_metrics import metrics as db_metrics
+from .db_router import ReplicaRoutingMiddleware, replica_reads
+from .images import delete_derivatives, derivative_name, generate_derivatives, thumbnail_url
+from .lazy import HEAVY_MODULES
+from .models import AuditEvent, CanonicalSkill, SkillAlias, StoredBlob, User
+from .skills import resolve_skills, seed_default_aliases
+from .storage import blob_hash, collect_garbage, get_content_storage, recount_references
+from .uploads import OffsetMismatch, UploadError, complete_upload, partial_path, start_upload, write_chunk
+
+
+class TemporaryMediaMixin:
+    """Point MEDIA_ROOT at a directory that is removed after each test"""
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        media = override_settings(MEDIA_ROOT=directory.name)
+        media.enable()
+        self.addCleanup(media.disable)
+
+
+@override_settings(DATABASE_REPLICAS={'replica1': 1, 'replica2': 0}, DATABASE_REPLICA_STICKY_SECONDS=10)
+class ReplicaRouterTests(SimpleTestCase):
+    """Routing decisions only; the replica aliases are never connected to"""
+
+    def setUp(self):
+        cache.clear()
+        for alias in ('replica1', 'replica2'):
+            db_router._health[alias] = (True, time.monotonic())
+        self.addCleanup(db_router._health.clear)
+        self.user = User(pk=42, email='reader@example.com')
+
+    def request(self, view, method='get'):
+        """Run ``view`` through the middleware; returns what it recorded"""
+        seen = {}
+
+        def record(request):
+            view(seen)
+            return HttpResponse()
+
+        request = getattr(RequestFactory(), method)('/')
+        request.user = self.user
+        ReplicaRoutingMiddleware(replica_reads(record))(request)
+        return seen
+
+    def test_safe_requests_read_from_replica(self):
+        seen = self.request(lambda seen: seen.update(read=router.db_for_read(Job)))
+        self.assertEqual(seen['read'], 'replica1')
+
+    def test_other_requests_read_from_primary(self):
+        seen = self.request(lambda seen: seen.update(read=router.db_for_read(Job)), method='post')
+        self.assertEqual(seen['read'], 'default')
+
+    def test_reads_outside_requests_use_primary(self):
+        self.assertEqual(router.db_for_read(Job), 'default')
+
+    def test_write_moves_reads_to_primary(self):
+        def view(seen):
+            self.assertEqual(router.db_for_write(Job), 'default')
+            seen['read'] = router.db_for_read(Job)
+
+        self.assertEqual(self.request(view)['read'], 'default')
+        # The writer stays on the primary for its next requests too
+        seen = self.request(lambda seen: seen.update(read=router.db_for_read(Job)))
+        self.assertEqual(seen['read'], 'default')
+
+    @override_settings(DATABASE_REPLICA_UNTRACKED_WRITES=['jobs.jobcountershard'])
+    def test_untracked_writes_keep_replica(self):
+        def view(seen):
+            router.db_for_write(JobCounterShard)
+            seen['read'] = router.db_for_read(Job)
+
+        self.assertEqual(self.request(view)['read'], 'replica1')
+
+    def test_unhealthy_replicas_are_skipped(self):
+        db_router._health['replica1'] = (False, time.monotonic())
+        seen = self.request(lambda seen: seen.update(read=router.db_for_read(Job)))
+        self.assertEqual(seen['read'], 'default')
+
+    def test_replicas_are_not_migrated(self):
+        self.assertIs(router.allow_migrate('replica1', 'jobs', model_name='job'), False)
+        self.assertIs(router.allow_migrate('default', 'jobs', model_name='job'), True)
+
+
+class StartupImportTests(SimpleTestCase):
+    """Worker startup must not pay for heavy optional dependencies"""
+
+    def test_heavy_modules_are_imported_lazily(self):
+        code = (
+            f'import django, sys; django.setup(); import {settings.ROOT_URLCONF}; '
+            f'print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))'
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE},
+        )
+        self.assertEqual(result.stdout.strip(), '')
+
+
+class SkillTaxonomyTests(TestCase):
+    def test_aliases_resolve_to_one_canonical_skill(self):
+        seed_default_aliases()
+
+        skills = resolve_skills(['JS', ' javascript ', 'ReactJS', 'k8s', 'Elixir'])
+
+        self.assertEqual([skill.name for skill in skills], ['JavaScript', 'React', 'Kubernetes', 'Elixir'])
+        self.assertEqual(resolve_skills(['elixir'], create=False), [skills[-1]])
+
+    def test_seeding_merges_a_canonical_skill_that_became_an_alias(self):
+        company = Company.objects.create(name='Acme', slug='acme')
+        job = Job.objects.create(title='Gopher', slug='gopher', company=company, description='...', location='Remote')
+        golang = CanonicalSkill.objects.create(key='golang', name='golang')
+        JobSkill.objects.create(job=job, skill=golang)
+
+        seed_default_aliases()
+
+        self.assertFalse(CanonicalSkill.objects.filter(key='golang').exists())
+        go = CanonicalSkill.objects.get(key='go')
+        self.assertEqual(SkillAlias.objects.get(key='golang').skill, go)
+        # The job keeps its skill link instead of losing it to the cascade
+        self.assertEqual(list(JobSkill.objects.filter(job=job).values_list('skill', flat=True)), [go.pk])
+
+    def test_validation_does_not_add_skills_to_the_taxonomy(self):
+        invalid = SkillSerializer(data={'name': 'Brand New Skill', 'proficiency': 'wizard'})
+        self.assertFalse(invalid.is_valid())
+        self.assertFalse(CanonicalSkill.objects.filter(key='brand new skill').exists())
+
+        user = User.objects.create_user(email='skilled@example.com', password='password123')
+        valid = SkillSerializer(data={'name': 'Brand  New Skill', 'proficiency': 'expert'})
+        self.assertTrue(valid.is_valid())
+        valid.save(user=user)
+        self.assertEqual(CanonicalSkill.objects.get(key='brand new skill').name, 'Brand New Skill')
+
+
+class ContentAddressedStorageTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.storage = get_content_storage()
+        self.user = User.objects.create_user(email='seeker@example.com', password='password123')
+
+    def upload(self, content, name='cv.pdf'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Resume.objects.create(user=self.user, name=name, file=ContentFile(content, name=name))
+
+    def test_identical_uploads_share_one_counted_blob(self):
+        first = self.upload(b'%PDF- same bytes', 'first.pdf')
+        second = self.upload(b'%PDF- same bytes', 'SECOND.PDF')
+        other = self.upload(b'%PDF- other bytes')
+
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertNotEqual(first.file.name, other.file.name)
+        self.assertEqual(blob_hash(first.file.name), hashlib.sha256(b'%PDF- same bytes').hexdigest())
+        self.assertTrue(first.file.name.endswith('.pdf'))
+        self.assertEqual(StoredBlob.objects.get(name=first.file.name).ref_count, 2)
+        self.assertEqual(StoredBlob.objects.count(), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        # Deleting a model never deletes a blob someone else still uses
+        self.assertTrue(self.storage.exists(second.file.name))
+        self.assertEqual(StoredBlob.objects.get(name=second.file.name).ref_count, 1)
+
+    def test_garbage_collection_removes_only_old_unreferenced_blobs(self):
+        kept = self.upload(b'kept')
+        dropped = self.upload(b'dropped')
+        with self.captureOnCommitCallbacks(execute=True):
+            dropped.delete()
+
+        # Within the grace period an unreferenced blob may be about to be saved
+        self.assertEqual(collect_garbage(), (0, 0))
+        self.assertEqual(collect_garbage(grace_period=datetime.timedelta(0), dry_run=True), (1, len(b'dropped')))
+        self.assertTrue(self.storage.exists(dropped.file.name))
+
+        self.assertEqual(collect_garbage(grace_period=datetime.timedelta(0)), (1, len(b'dropped')))
+        self.assertFalse(self.storage.exists(dropped.file.name))
+        self.assertFalse(StoredBlob.objects.filter(name=dropped.file.name).exists())
+        self.assertTrue(self.storage.exists(kept.file.name))
+
+    def test_recount_repairs_drifted_reference_counts(self):
+        resume = self.upload(b'counted')
+        StoredBlob.objects.filter(name=resume.file.name).update(ref_count=0)
+
+        self.assertEqual(recount_references(), 1)
+        self.assertEqual(StoredBlob.objects.get(name=resume.file.name).ref_count, 1)
+        self.assertEqual(collect_garbage(grace_period=datetime.timedelta(0)), (0, 0))
+
+
+class ImageDerivativeTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        for known in (images._existing, images._queued):
+            known.clear()
+            self.addCleanup(known.clear)
+
+        from PIL import Image
+        logo = io.BytesIO()
+        Image.new('RGBA', (400, 200), (255, 0, 0, 0)).save(logo, format='PNG')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.company = Company.objects.create(
+                name='Acme', slug='acme', logo=ContentFile(logo.getvalue(), name='logo.png'),
+            )
+
+    def test_saving_an_image_queues_its_derivatives_once(self):
+        queued = Task.objects.filter(name='core.tasks.generate_image_derivatives')
+        self.assertEqual([task.args for task in queued], [[self.company.logo.name, 'logo']])
+
+        # Until the task has run, the original is served and nothing is queued again
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(thumbnail_url(self.company.logo, 'logo', 'sm'), self.company.logo.url)
+        self.assertEqual(queued.count(), 1)
+
+    def test_derivatives_are_rendered_once_per_size_and_format(self):
+        from PIL import Image
+        source = self.company.logo.name
+        self.assertEqual(generate_derivatives(source, 'logo'), 4)
+        self.assertEqual(generate_derivatives(source, 'logo'), 0)
+
+        with default_storage.open(derivative_name(source, 'logo', 'sm', 'webp')) as webp:
+            image = Image.open(webp)
+            self.assertEqual((image.format, image.size), ('WEBP', (96, 48)))
+        with default_storage.open(derivative_name(source, 'logo', 'md', 'jpeg')) as jpeg:
+            image = Image.open(jpeg)
+            # Transparency is flattened onto white rather than black
+            self.assertEqual((image.format, image.mode, image.size), ('JPEG', 'RGB', (256, 128)))
+            self.assertGreater(min(image.getpixel((0, 0))), 240)
+        self.assertEqual(
+            thumbnail_url(self.company.logo, 'logo', 'sm'),
+            default_storage.url(derivative_name(source, 'logo', 'sm')),
+        )
+
+        delete_derivatives(source)
+        self.assertFalse(default_storage.exists(derivative_name(source, 'logo', 'sm')))
+
+
+class SlowStream:
+    """Request body that trickles in, recording when it was read"""
+
+    def __init__(self, data, reads):
+        self.data = io.BytesIO(data)
+        self.reads = reads
+
+    def read(self, size):
+        time.sleep(0.002)
+        self.reads.append(time.monotonic())
+        return self.data.read(min(size, 64))
+
+
+class ChunkedUploadTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(email='seeker@example.com', password='password123')
+        self.content = os.urandom(3000)
+
+    def test_upload_resumes_from_the_recorded_offset(self):
+        session = start_upload(self.user, 'resume', 'cv.pdf', len(self.content))
+        with self.assertRaises(UploadError):
+            write_chunk(session, 0, io.BytesIO(self.content[:1000]), 1000, checksum=hashlib.sha256(b'x').digest())
+        self.assertEqual(write_chunk(session, 0, io.BytesIO(self.content[:1000]), 1000), 1000)
+        with self.assertRaises(OffsetMismatch) as mismatch:
+            write_chunk(session, 0, io.BytesIO(self.content[:1000]), 1000)
+        self.assertEqual(mismatch.exception.offset, 1000)
+        with self.assertRaises(OffsetMismatch):
+            complete_upload(session)
+
+        write_chunk(session, 1000, io.BytesIO(self.content[1000:]), 2000)
+        name = complete_upload(session)
+        self.assertEqual(blob_hash(name), hashlib.sha256(self.content).hexdigest())
+        with get_content_storage().open(name) as stored:
+            self.assertEqual(stored.read(), self.content)
+
+    def test_rolled_back_completion_can_be_completed_again(self):
+        session = start_upload(self.user, 'resume', 'cv.pdf', len(self.content))
+        write_chunk(session, 0, io.BytesIO(self.content), len(self.content))
+
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            complete_upload(session)
+            raise RuntimeError('attaching the file failed')
+        session.refresh_from_db()
+        self.assertEqual(session.status, 'active')
+        self.assertTrue(os.path.exists(partial_path(session)))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            name = complete_upload(session)
+        self.assertEqual(blob_hash(name), hashlib.sha256(self.content).hexdigest())
+        self.assertFalse(os.path.exists(partial_path(session)))
+
+
+class ConcurrentChunkTests(TemporaryMediaMixin, TransactionTestCase):
+    def test_same_offset_retries_are_written_one_at_a_time(self):
+        user = User.objects.create_user(email='seeker@example.com', password='password123')
+        content = os.urandom(4096)
+        session = start_upload(user, 'resume', 'cv.pdf', len(content))
+
+        def send(_):
+            # Each request loads its own copy of the session, as the view does
+            own = session.__class__.objects.get(pk=session.pk)
+            reads = []
+            try:
+                write_chunk(own, 0, SlowStream(content, reads), len(content))
+                return 'written', reads
+            except OffsetMismatch:
+                return 'mismatch', reads
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(2) as pool:
+            results = list(pool.map(send, range(2)))
+
+        self.assertEqual(sorted(outcome for outcome, _ in results), ['mismatch', 'written'])
+        # The losing request waited for the lock and never read its body
+        self.assertEqual([reads for outcome, reads in results if outcome == 'mismatch'], [[]])
+        session.refresh_from_db()
+        name = complete_upload(session)
+        self.assertEqual(blob_hash(name), hashlib.sha256(content).hexdigest())
+
+
+class FakeConnection:
+    """Stands in for a PyMySQL connection"""
+
+    def __init__(self, alive=True):
+        self.alive = alive
+        self.closed = False
+        self.rollbacks = 0
+
+    def ping(self, reconnect=False):
+        if not self.alive:
+            raise mysql_base.base.Database.OperationalError(2006, 'MySQL server has gone away')
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class MySQLConnectionPoolTests(SimpleTestCase):
+    def test_most_recently_returned_connection_is_reused(self):
+        pool = mysql_base.ConnectionPool(max_size=2)
+        self.assertIsNone(pool.get())
+        first, second, third = FakeConnection(), FakeConnection(), FakeConnection()
+        for connection in (first, second, third):
+            pool.put(connection)
+
+        # Over max_size: closed rather than kept
+        self.assertTrue(third.closed)
+        self.assertIs(pool.get(), second)
+        self.assertIs(pool.get(), first)
+        self.assertIsNone(pool.get())
+
+    def test_stale_and_broken_connections_are_discarded(self):
+        expired = FakeConnection()
+        pool = mysql_base.ConnectionPool(max_idle=0)
+        pool.put(expired)
+        time.sleep(0.01)
+        self.assertIsNone(pool.get())
+        self.assertTrue(expired.closed)
+
+        broken, healthy = FakeConnection(alive=False), FakeConnection()
+        pool = mysql_base.ConnectionPool(ping_after=0)
+        pool.put(healthy)
+        pool.put(broken)
+        failures = db_metrics.snapshot()['health_check_failures']
+        time.sleep(0.01)
+        self.assertIs(pool.get(), healthy)
+        self.assertTrue(broken.closed)
+        self.assertEqual(db_metrics.snapshot()['health_check_failures'], failures + 1)
+
+    def test_closing_returns_clean_connections_to_the_pool(self):
+        alias = 'pool-tests'
+        self.addCleanup(lambda: mysql_base._pools.pop((os.getpid(), alias), None))
+        wrapper = mysql_base.DatabaseWrapper({
+            'ENGINE': 'core.db_backends.mysql', 'NAME': 'test', 'USER': '', 'PASSWORD': '', 'HOST': '',
+            'PORT': '', 'OPTIONS': {'pool': {'max_size': 5}}, 'TIME_ZONE': None, 'CONN_MAX_AGE': 0,
+            'CONN_HEALTH_CHECKS': False, 'AUTOCOMMIT': True, 'ATOMIC_REQUESTS': False, 'TEST': {},
+        }, alias)
+        self.assertNotIn('pool', wrapper.get_connection_params())
+
+        pooled = FakeConnection()
+        wrapper.connection, wrapper.autocommit = pooled, False
+        wrapper._close()
+        self.assertEqual((pooled.closed, pooled.rollbacks), (False, 1))
+        reuses = db_metrics.snapshot()['reuses']
+        self.assertIs(wrapper.get_new_connection({}), pooled)
+        self.assertEqual(db_metrics.snapshot()['reuses'], reuses + 1)
+
+        # A connection closed mid-transaction may hold locks; it is really closed
+        in_transaction = FakeConnection()
+        wrapper.connection, wrapper.in_atomic_block = in_transaction, True
+        wrapper._close()
+        self.assertTrue(in_transaction.closed)
+        self.assertIsNone(wrapper.pool.get())
+
+
+class FileBasedCacheTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache = FileBasedCache(directory.name, {})
+
+    def test_concurrent_increments_are_not_lost(self):
+        self.cache.set('version', 0)
+
+        def bump(_):
+            for _ in range(50):
+                self.cache.incr('version')
+
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(bump, range(8)))
+
+        self.assertEqual(self.cache.get('version'), 400)
+
+    def test_increments_keep_the_expiry(self):
+        self.cache.set('forever', 1, timeout=None)
+        self.cache.set('brief', 1, timeout=0.2)
+        self.cache.incr('forever')
+        self.cache.incr('brief')
+        time.sleep(0.3)
+
+        self.assertEqual(self.cache.get('forever'), 2)
+        self.assertIsNone(self.cache.get('brief'))
+        with self.assertRaises(ValueError):
+            self.cache.incr('brief')
+
+    def test_only_one_concurrent_add_wins(self):
+        with ThreadPoolExecutor(16) as pool:
+            added = list(pool.map(lambda worker: self.cache.add('lock', worker), range(16)))
+
+        self.assertEqual(added.count(True), 1)
+        self.assertEqual(self.cache.get('lock'), added.index(True))
+
+
+class CacheVersionTests(SimpleTestCase):
+    def test_bumps_from_other_processes_are_seen_at_once(self):
+        namespace = 'tests-versions'
+        key = cache_key('ns-version', namespace)
+        version = get_versions(namespace)[namespace]
+        # A local copy, as left behind by a read through the tiered cache
+        cache.local.set(key, version)
+
+        # Another worker bumps the version on the shared tier
+        cache.shared.incr(key)
+        self.assertEqual(get_versions(namespace)[namespace], version + 1)
+        bump_version(namespace)
+        self.assertEqual(get_versions(namespace)[namespace], version + 2)
+
+
+class AuditLogTests(TestCase):
+    def setUp(self):
+        self.addCleanup(audit.buffer.events.clear)
+        self.user = User.objects.create_user(email='auditor@example.com', password='password123')
+
+    def test_event_ids_are_unique_and_time_ordered(self):
+        before = datetime.datetime.now(datetime.timezone.utc)
+        ids = [audit.ids.next() for _ in range(5000)]
+
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertEqual([i >> audit.TIME_SHIFT for i in ids], sorted(i >> audit.TIME_SHIFT for i in ids))
+        self.assertLess(abs(audit.time_of(ids[0]) - before), datetime.timedelta(seconds=1))
+        self.assertLessEqual(audit.id_at(before - datetime.timedelta(milliseconds=1)), ids[0])
+
+    def test_events_are_buffered_until_commit_and_written_in_one_insert(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for action in ('suspend', 'unsuspend', 'suspend'):
+                before = audit.snapshot(self.user, 'is_suspended')
+                self.user.is_suspended = action == 'suspend'
+                audit.record(self.user, action, self.user, before)
+        self.assertFalse(AuditEvent.objects.exists())
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(audit.flush(), 3)
+        self.assertEqual(sum(query['sql'].startswith('INSERT') for query in queries), 1)
+
+        events = AuditEvent.objects.for_entity(self.user)
+        self.assertEqual([event.action for event in events], ['suspend', 'unsuspend', 'suspend'])
+        self.assertEqual(events[0].changes, {'is_suspended': [False, True]})
+        self.assertEqual(AuditEvent.objects.by_actor(self.user).count(), 3)
+
+    def test_rolled_back_changes_are_not_logged(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(ValueError), transaction.atomic():
+                audit.record(self.user, 'suspend', self.user)
+                raise ValueError
+
+        self.assertEqual(audit.flush(), 0)
+
+    def test_events_are_append_only(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            audit.record(self.user, 'verify', self.user)
+        audit.flush()
+
+        with self.assertRaises(TypeError):
+            AuditEvent.objects.update(action='unverify')
+        with self.assertRaises(TypeError):
+            AuditEvent.objects.get().delete()
+
+    def test_partition_plan(self):
+        now = datetime.datetime(2026, 10, 19, 12, tzinfo=datetime.timezone.utc)
+        to_add, to_drop = audit.partition_plan(['p202608', 'p202609', 'p202610', 'pmax'], now, 2, retain_months=1)
+
+        self.assertEqual(to_add, [
+            ('p202611', audit.id_at(datetime.datetime(2026, 12, 1, tzinfo=datetime.timezone.utc))),
+            ('p202612', audit.id_at(datetime.datetime(2027, 1, 1, tzinfo=datetime.timezone.utc))),
+        ])
+        self.assertEqual(to_drop, ['p202608'])
+        # First run: the current month holds everything before it as well
+        november = datetime.datetime(2026, 11, 1, tzinfo=datetime.timezone.utc)
+        self.assertEqual(audit.partition_plan([], now, 0), ([('p202610', audit.id_at(november))], []))
+
+
+class AuditFlushTests(TransactionTestCase):
+    """Recorded events reach the database without waiting for more traffic"""
+
+    def setUp(self):
+        self.addCleanup(audit.buffer.events.clear)
+        self.admin = User.objects.create_user(email='admin@example.com', password='password123', role='admin')
+        self.seeker = User.objects.create_user(email='seeker@example.com', password='password123', role='job_seeker')
+
+    def test_events_are_written_at_the_end_of_their_request(self):
+        self.client.force_login(self.admin)
+        self.client.post(f'/admin-panel/job-seekers/{self.seeker.pk}/suspend/', {'reason': 'Spam'})
+
+        event = AuditEvent.objects.for_entity(self.seeker).get()
+        self.assertEqual(event.changes, {'is_suspended': [False, True], 'suspend_reason': [None, 'Spam']})
+
+    @override_settings(AUDIT_FLUSH_SECONDS=0.05)
+    def test_events_recorded_outside_requests_are_written_by_the_timer(self):
+        audit.record(self.seeker, 'verify', self.admin)
+
+        deadline = time.monotonic() + 5
+        while not AuditEvent.objects.exists() and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(AuditEvent.objects.get().action, 'verify')
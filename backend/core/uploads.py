@@ -0,0 +1,243 @@
+"""
+Chunked, resumable uploads.
+
+A client starts a session with the total size, then sends the file in
+chunks, each tagged with the byte offset it starts at. Chunks are streamed
+from the request straight into a partial file next to the blob store and
+hashed as they arrive; bytes received before a dropped connection are kept,
+so the client asks for the current offset and carries on from there. When
+every byte has arrived the partial file is renamed into content-addressed
+storage without being read again.
+
+The running SHA-256 is kept per process; a chunk that lands on a different
+worker rebuilds it from the partial file once. Chunks of one session are
+written under an exclusive lock on its partial file, so a retry that races
+the original request waits for it and is then told the new offset.
+"""
+import base64
+import hashlib
+import os
+import uuid
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import locks
+from django.db import transaction
+from django.utils import timezone
+
+from .models import UploadSession
+from .storage import get_content_storage
+
+
+# Size clients are asked to send per request
+UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024
+
+# Largest chunk accepted in one request
+MAX_CHUNK_SIZE = 16 * 1024 * 1024
+
+READ_SIZE = 64 * 1024
+
+# File types accepted per upload purpose
+UPLOAD_EXTENSIONS = {
+    'resume': {'.pdf', '.doc', '.docx', '.txt', '.rtf'},
+    'tax_document': {'.pdf', '.jpg', '.jpeg', '.png', '.heic', '.tif', '.tiff'},
+}
+
+# Running hashes kept in this process: session id -> (offset, hasher)
+_hashers = OrderedDict()
+MAX_CACHED_HASHERS = 256
+
+
+class UploadError(Exception):
+    pass
+
+
+class OffsetMismatch(UploadError):
+    """The chunk does not start where the upload currently ends"""
+
+    def __init__(self, offset):
+        super().__init__(f"Upload is at offset {offset}")
+        self.offset = offset
+
+
+def max_upload_size():
+    return getattr(settings, 'CHUNKED_UPLOAD_MAX_SIZE', 100 * 1024 * 1024)
+
+
+def upload_expiry():
+    return getattr(settings, 'CHUNKED_UPLOAD_EXPIRY', timedelta(hours=24))
+
+
+def partial_path(session):
+    return os.path.join(get_content_storage().temp_dir(), f"{session.pk}.part")
+
+
+def start_upload(user, purpose, filename, size, target_id=None, metadata=None):
+    """Create an upload session and its empty partial file"""
+    if size <= 0:
+        raise UploadError('size must be positive')
+    if size > max_upload_size():
+        raise UploadError(f"File is larger than {max_upload_size()} bytes")
+    session = UploadSession.objects.create(
+        user=user, purpose=purpose, filename=os.path.basename(filename)[:255], size=size,
+        target_id=target_id, metadata=metadata or {}, expires_at=timezone.now() + upload_expiry(),
+    )
+    open(partial_path(session), 'wb').close()
+    return session
+
+
+def _hasher_at(session, offset):
+    cached = _hashers.pop(session.pk, None)
+    if cached and cached[0] == offset:
+        return cached[1]
+    # Another process received the earlier chunks; rebuild from disk
+    hasher = hashlib.sha256()
+    with open(partial_path(session), 'rb') as f:
+        remaining = offset
+        while remaining:
+            data = f.read(min(READ_SIZE, remaining))
+            if not data:
+                raise UploadError('Partial upload is shorter than its recorded offset')
+            hasher.update(data)
+            remaining -= len(data)
+    return hasher
+
+
+def _remember_hasher(session, offset, hasher):
+    _hashers[session.pk] = (offset, hasher)
+    while len(_hashers) > MAX_CACHED_HASHERS:
+        _hashers.popitem(last=False)
+
+
+def parse_checksum(header):
+    """Parse an ``Upload-Checksum: sha256 <base64 digest>`` header"""
+    if not header:
+        return None
+    algorithm, _, value = header.partition(' ')
+    if algorithm.lower() != 'sha256':
+        raise UploadError('Only sha256 chunk checksums are supported')
+    try:
+        return base64.b64decode(value.strip(), validate=True)
+    except ValueError:
+        raise UploadError('Malformed Upload-Checksum header')
+
+
+def write_chunk(session, offset, stream, length, checksum=None):
+    """Append ``length`` bytes read from ``stream`` at ``offset``. Returns the new offset.
+
+    If the client disconnects midway the bytes already received are kept,
+    unless a chunk checksum was supplied, in which case the chunk is
+    accepted whole or not at all.
+    """
+    if session.status != 'active' or session.expires_at <= timezone.now():
+        raise UploadError('Upload session is no longer active')
+    if offset != session.offset:
+        raise OffsetMismatch(session.offset)
+    if length > MAX_CHUNK_SIZE:
+        raise UploadError(f"Chunks may be at most {MAX_CHUNK_SIZE} bytes")
+    if offset + length > session.size:
+        raise UploadError('Chunk extends past the declared file size')
+
+    with open(partial_path(session), 'r+b') as f:
+        # Held until the new offset is recorded: a concurrent request for the
+        # same offset must not interleave its bytes or its hash updates
+        locks.lock(f, locks.LOCK_EX)
+        session.refresh_from_db(fields=['offset', 'status'])
+        if session.status != 'active':
+            raise UploadError('Upload session is no longer active')
+        if offset != session.offset:
+            raise OffsetMismatch(session.offset)
+
+        hasher = _hasher_at(session, offset)
+        chunk_hasher = hashlib.sha256()
+        received = 0
+        interrupted = False
+        f.seek(offset)
+        # Drop any tail left by an earlier attempt that was never committed
+        f.truncate()
+        try:
+            while received < length:
+                data = stream.read(min(READ_SIZE, length - received))
+                if not data:
+                    break
+                f.write(data)
+                hasher.update(data)
+                chunk_hasher.update(data)
+                received += len(data)
+        except OSError:
+            interrupted = True
+        f.flush()
+
+        if checksum is not None and (received != length or chunk_hasher.digest() != checksum):
+            # The running hash now covers rejected bytes; it is rebuilt on the next attempt
+            raise UploadError('Chunk checksum mismatch')
+
+        new_offset = offset + received
+        updated = UploadSession.objects.filter(pk=session.pk, offset=offset, status='active').update(
+            offset=new_offset, expires_at=timezone.now() + upload_expiry(), updated_at=timezone.now(),
+        )
+        if not updated:
+            # Changed by a writer that did not take the lock (e.g. expiry)
+            _hashers.pop(session.pk, None)
+            session.refresh_from_db(fields=['offset'])
+            raise OffsetMismatch(session.offset)
+
+        session.offset = new_offset
+        _remember_hasher(session, new_offset, hasher)
+    if interrupted:
+        raise UploadError('Connection interrupted')
+    return new_offset
+
+
+def complete_upload(session):
+    """Move a fully received upload into content-addressed storage. Returns the blob name."""
+    if session.status == 'completed':
+        return session.result
+    if session.status != 'active':
+        raise UploadError('Upload session has expired')
+    if session.offset != session.size:
+        raise OffsetMismatch(session.offset)
+
+    hasher = _hasher_at(session, session.offset)
+    _hashers.pop(session.pk, None)
+    digest = hasher.hexdigest()
+    # Store a second link to the partial file and remove the original only
+    # once the caller's transaction commits; if it rolls back, the session is
+    # still active and its partial file is still there to complete again
+    part = partial_path(session)
+    staged = f"{part}.{uuid.uuid4().hex}"
+    os.link(part, staged)
+    name = get_content_storage().adopt(staged, digest, session.filename, session.size)
+    transaction.on_commit(lambda: _unlink(part))
+
+    session.status = 'completed'
+    session.content_hash = digest
+    session.result = name
+    session.save(update_fields=['status', 'content_hash', 'result', 'updated_at'])
+    return name
+
+
+def _unlink(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def abort_upload(session):
+    """Discard an upload and its partial file"""
+    _hashers.pop(session.pk, None)
+    _unlink(partial_path(session))
+    session.delete()
+
+
+def expire_uploads(now=None):
+    """Delete partial files of sessions past their expiry. Returns the number expired."""
+    now = now or timezone.now()
+    expired = 0
+    for session in UploadSession.objects.filter(status='active', expires_at__lt=now).iterator():
+        _hashers.pop(session.pk, None)
+        _unlink(partial_path(session))
+        expired += UploadSession.objects.filter(pk=session.pk, status='active').update(status='expired')
+    return expired
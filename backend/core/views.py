@@ -1,3 +1,9 @@
-from django.shortcuts import render
+from .downloads import serve_file
+from .storage import blob_hash, get_content_storage
 
-# Create your views here.
+
+def serve_media(request, path):
+    """Serve a media file in development; content-addressed blobs are cached forever"""
+    cache_control = 'public, max-age=31536000, immutable' if blob_hash(path) else 'public, no-cache'
+    return serve_file(request, get_content_storage().path(path), path,
+                      as_attachment=False, cache_control=cache_control)
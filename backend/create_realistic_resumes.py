@@ -5,7 +5,6 @@ import django
 import sys
 from datetime import datetime
 from io import BytesIO
-from django.core.files.base import ContentFile
 
 # Setup Django
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -14,178 +13,15 @@ django.setup()
 
 from django.contrib.auth import get_user_model
 from jobs.models import Resume
+from jobs.resume_rendering import load_resume_data, render_pdf, render_resumes
 from core.models import Experience, Education, Skill, Certification
 
-# Import ReportLab for PDF generation
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
-from reportlab.pdfgen import canvas
-
 User = get_user_model()
 
 def create_pdf_resume(user):
     """Generate professional PDF resume"""
     buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter, 
-                          rightMargin=0.75*inch, leftMargin=0.75*inch,
-                          topMargin=0.75*inch, bottomMargin=0.75*inch)
-    
-    # Container for the 'Flowable' objects
-    elements = []
-    
-    # Define styles
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#1e293b'),
-        spaceAfter=6,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
-    
-    subtitle_style = ParagraphStyle(
-        'CustomSubtitle',
-        parent=styles['Normal'],
-        fontSize=11,
-        textColor=colors.HexColor('#64748b'),
-        spaceAfter=20,
-        alignment=TA_CENTER
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=colors.HexColor('#0f172a'),
-        spaceAfter=8,
-        spaceBefore=16,
-        fontName='Helvetica-Bold',
-        borderWidth=0,
-        borderColor=colors.HexColor('#3b82f6'),
-        borderPadding=0,
-        leftIndent=0,
-        borderRadius=0
-    )
-    
-    body_style = ParagraphStyle(
-        'CustomBody',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=colors.HexColor('#334155'),
-        spaceAfter=8,
-        leading=14
-    )
-    
-    job_title_style = ParagraphStyle(
-        'JobTitle',
-        parent=styles['Normal'],
-        fontSize=11,
-        textColor=colors.HexColor('#0f172a'),
-        fontName='Helvetica-Bold',
-        spaceAfter=2
-    )
-    
-    company_style = ParagraphStyle(
-        'Company',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=colors.HexColor('#475569'),
-        spaceAfter=4
-    )
-    
-    # Header - Name
-    name = Paragraph(user.get_full_name().upper(), title_style)
-    elements.append(name)
-    
-    # Contact Info
-    contact_parts = []
-    if user.email:
-        contact_parts.append(user.email)
-    if user.phone:
-        contact_parts.append(user.phone)
-    if user.location:
-        contact_parts.append(user.location)
-    
-    contact_info = Paragraph(' • '.join(contact_parts), subtitle_style)
-    elements.append(contact_info)
-    
-    # Professional Summary
-    if user.bio:
-        elements.append(Paragraph('PROFESSIONAL SUMMARY', heading_style))
-        elements.append(Paragraph(user.bio, body_style))
-        elements.append(Spacer(1, 0.1*inch))
-    
-    # Skills
-    skills = Skill.objects.filter(user=user)
-    if skills.exists():
-        elements.append(Paragraph('SKILLS', heading_style))
-        skill_text = ' • '.join([skill.name for skill in skills[:12]])  # Limit to 12 skills
-        elements.append(Paragraph(skill_text, body_style))
-        elements.append(Spacer(1, 0.1*inch))
-    
-    # Work Experience
-    experiences = Experience.objects.filter(user=user).order_by('-start_date')
-    if experiences.exists():
-        elements.append(Paragraph('WORK EXPERIENCE', heading_style))
-        
-        for exp in experiences:
-            # Job Title
-            elements.append(Paragraph(exp.title, job_title_style))
-            
-            # Company and dates
-            end_date = exp.end_date.strftime('%B %Y') if exp.end_date else 'Present'
-            company_line = f"{exp.company} | {exp.start_date.strftime('%B %Y')} - {end_date}"
-            elements.append(Paragraph(company_line, company_style))
-            
-            # Description
-            if exp.description:
-                elements.append(Paragraph(exp.description, body_style))
-            
-            elements.append(Spacer(1, 0.1*inch))
-    
-    # Education
-    educations = Education.objects.filter(user=user).order_by('-start_date')
-    if educations.exists():
-        elements.append(Paragraph('EDUCATION', heading_style))
-        
-        for edu in educations:
-            # Degree and Field
-            degree_text = f"{edu.degree} in {edu.field_of_study}"
-            elements.append(Paragraph(degree_text, job_title_style))
-            
-            # Institution and dates
-            end_date = edu.end_date.strftime('%Y') if edu.end_date else 'Present'
-            edu_line = f"{edu.institution} | {edu.start_date.strftime('%Y')} - {end_date}"
-            elements.append(Paragraph(edu_line, company_style))
-            
-            if edu.description:
-                elements.append(Paragraph(edu.description, body_style))
-            
-            elements.append(Spacer(1, 0.1*inch))
-    
-    # Certifications
-    certifications = Certification.objects.filter(user=user)
-    if certifications.exists():
-        elements.append(Paragraph('CERTIFICATIONS', heading_style))
-        
-        for cert in certifications:
-            cert_text = f"<b>{cert.name}</b> - {cert.issuing_organization}"
-            if cert.issue_date:
-                cert_text += f" ({cert.issue_date.strftime('%B %Y')})"
-            elements.append(Paragraph(cert_text, body_style))
-        
-        elements.append(Spacer(1, 0.1*inch))
-    
-    # Build PDF
-    doc.build(elements)
+    render_pdf(load_resume_data([user.id])[user.id], buffer)
     
     # Get the value of the BytesIO buffer
     pdf_content = buffer.getvalue()
@@ -254,7 +90,7 @@ SKILLS
     return resume_text
 
 
-def create_resumes_for_applicants():
+def create_resumes_for_applicants(workers=None):
     """Create resume files for all job seekers"""
     
     job_seekers = User.objects.filter(role='job_seeker')
@@ -265,43 +101,20 @@ def create_resumes_for_applicants():
     
     print(f"Found {job_seekers.count()} job seekers")
     
-    created_count = 0
-    updated_count = 0
+    def progress(done, total, elapsed):
+        print(f"📄 Rendered {done}/{total} resumes ({elapsed:.1f}s)")
     
-    for seeker in job_seekers:
-        try:
-            # Generate PDF resume
-            pdf_content = create_pdf_resume(seeker)
-            
-            # Create resume file
-            resume_file = ContentFile(pdf_content)
-            filename = f"{seeker.first_name}_{seeker.last_name}_Resume.pdf"
-            
-            # Check if resume already exists
-            existing_resume = Resume.objects.filter(user=seeker, is_primary=True).first()
-            
-            if existing_resume:
-                # Update existing resume
-                existing_resume.file.save(filename, resume_file, save=True)
-                updated_count += 1
-                print(f"✅ Updated PDF resume for {seeker.get_full_name()}")
-            else:
-                # Create new resume
-                resume = Resume.objects.create(
-                    user=seeker,
-                    name=f"{seeker.get_full_name()} - Professional Resume",
-                    is_primary=True
-                )
-                resume.file.save(filename, resume_file, save=True)
-                created_count += 1
-                print(f"✅ Created PDF resume for {seeker.get_full_name()}")
-                
-        except Exception as e:
-            print(f"❌ Error creating resume for {seeker.get_full_name()}: {str(e)}")
-            continue
+    stats = render_resumes(
+        job_seekers.values_list('id', flat=True),
+        workers=workers or os.cpu_count(),
+        progress=progress,
+    )
+    
+    for user_id, error in stats['errors']:
+        print(f"❌ Error creating resume for user #{user_id}: {error}")
     
-    print(f"\n✅ Created {created_count} new PDF resumes")
-    print(f"✅ Updated {updated_count} existing PDF resumes")
+    print(f"\n✅ Created {stats['created']} new PDF resumes")
+    print(f"✅ Updated {stats['updated']} existing PDF resumes")
     print(f"Total resumes: {Resume.objects.count()}")
 
 
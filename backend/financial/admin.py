@@ -1,6 +1,10 @@
 from django.contrib import admin
+from django.db.models import Q
 from django.utils.html import format_html
 from django.utils import timezone
+
+from core.audit import AuditedAdminMixin
+from core.bulk import bulk_update
 from .models import LoanApplication, Withdrawal, CreditCardDebt, TaxRefund
 
 
@@ -13,7 +17,7 @@ class WithdrawalInline(admin.TabularInline):
 
 
 @admin.register(LoanApplication)
-class LoanApplicationAdmin(admin.ModelAdmin):
+class LoanApplicationAdmin(AuditedAdminMixin, admin.ModelAdmin):
     list_display = ['application_number', 'full_name', 'loan_type', 'amount_display', 'credit_score_range', 'status_badge', 'reviewed_by', 'created_at']
     list_filter = ['status', 'loan_type', 'credit_score_range', 'created_at']
     search_fields = ['application_number', 'full_name', 'email', 'phone', 'user__email']
@@ -55,23 +59,32 @@ class LoanApplicationAdmin(admin.ModelAdmin):
     status_badge.short_description = 'Status'
     
     def approve_applications(self, request, queryset):
-        queryset.update(status='approved', reviewed_by=request.user, reviewed_at=timezone.now())
-        self.message_user(request, f"{queryset.count()} applications approved.")
+        changed = bulk_update(
+            queryset, {'status': 'approved', 'reviewed_by': request.user, 'reviewed_at': timezone.now()}, request.user,
+            'approve', skip=Q(status='approved'),
+        )
+        self.message_user(request, f"{changed} applications approved.")
     approve_applications.short_description = "Approve selected applications"
     
     def reject_applications(self, request, queryset):
-        queryset.update(status='rejected', reviewed_by=request.user, reviewed_at=timezone.now())
-        self.message_user(request, f"{queryset.count()} applications rejected.")
+        changed = bulk_update(
+            queryset, {'status': 'rejected', 'reviewed_by': request.user, 'reviewed_at': timezone.now()}, request.user,
+            'reject', skip=Q(status='rejected'),
+        )
+        self.message_user(request, f"{changed} applications rejected.")
     reject_applications.short_description = "Reject selected applications"
     
     def mark_under_review(self, request, queryset):
-        queryset.update(status='under_review')
-        self.message_user(request, f"{queryset.count()} applications marked as under review.")
+        changed = bulk_update(
+            queryset, {'status': 'under_review'}, request.user,
+            'review', skip=Q(status='under_review'),
+        )
+        self.message_user(request, f"{changed} applications marked as under review.")
     mark_under_review.short_description = "Mark as Under Review"
 
 
 @admin.register(Withdrawal)
-class WithdrawalAdmin(admin.ModelAdmin):
+class WithdrawalAdmin(AuditedAdminMixin, admin.ModelAdmin):
     list_display = ['withdrawal_number', 'user', 'loan_application', 'amount_display', 'bank_name', 'status_badge', 'processed_by', 'created_at']
     list_filter = ['status', 'created_at']
     search_fields = ['withdrawal_number', 'user__email', 'user__first_name', 'user__last_name', 'bank_name', 'account_holder_name']
@@ -105,23 +118,32 @@ class WithdrawalAdmin(admin.ModelAdmin):
     status_badge.short_description = 'Status'
     
     def process_withdrawals(self, request, queryset):
-        queryset.update(status='processing', processed_by=request.user)
-        self.message_user(request, f"{queryset.count()} withdrawals marked as processing.")
+        changed = bulk_update(
+            queryset, {'status': 'processing', 'processed_by': request.user}, request.user,
+            'process', skip=Q(status='processing'),
+        )
+        self.message_user(request, f"{changed} withdrawals marked as processing.")
     process_withdrawals.short_description = "Mark as Processing"
     
     def complete_withdrawals(self, request, queryset):
-        queryset.update(status='completed', processed_by=request.user, processed_at=timezone.now())
-        self.message_user(request, f"{queryset.count()} withdrawals completed.")
+        changed = bulk_update(
+            queryset, {'status': 'completed', 'processed_by': request.user, 'processed_at': timezone.now()}, request.user,
+            'complete', skip=Q(status='completed'),
+        )
+        self.message_user(request, f"{changed} withdrawals completed.")
     complete_withdrawals.short_description = "Mark as Completed"
     
     def fail_withdrawals(self, request, queryset):
-        queryset.update(status='failed', processed_by=request.user, processed_at=timezone.now())
-        self.message_user(request, f"{queryset.count()} withdrawals marked as failed.")
+        changed = bulk_update(
+            queryset, {'status': 'failed', 'processed_by': request.user, 'processed_at': timezone.now()}, request.user,
+            'fail', skip=Q(status='failed'),
+        )
+        self.message_user(request, f"{changed} withdrawals marked as failed.")
     fail_withdrawals.short_description = "Mark as Failed"
 
 
 @admin.register(CreditCardDebt)
-class CreditCardDebtAdmin(admin.ModelAdmin):
+class CreditCardDebtAdmin(AuditedAdminMixin, admin.ModelAdmin):
     list_display = ['application_number', 'full_name', 'bank_name', 'credit_limit_display', 'debt_display', 'status_badge', 'reviewed_by', 'created_at']
     list_filter = ['status', 'bank_name', 'created_at']
     search_fields = ['application_number', 'full_name', 'email', 'phone', 'bank_name']
@@ -161,23 +183,32 @@ class CreditCardDebtAdmin(admin.ModelAdmin):
     status_badge.short_description = 'Status'
     
     def start_processing(self, request, queryset):
-        queryset.update(status='in_progress', reviewed_by=request.user, reviewed_at=timezone.now())
-        self.message_user(request, f"{queryset.count()} applications started processing.")
+        changed = bulk_update(
+            queryset, {'status': 'in_progress', 'reviewed_by': request.user, 'reviewed_at': timezone.now()}, request.user,
+            'process', skip=Q(status='in_progress'),
+        )
+        self.message_user(request, f"{changed} applications started processing.")
     start_processing.short_description = "Start Processing"
     
     def complete_clearance(self, request, queryset):
-        queryset.update(status='completed', reviewed_by=request.user, reviewed_at=timezone.now())
-        self.message_user(request, f"{queryset.count()} debt clearances completed.")
+        changed = bulk_update(
+            queryset, {'status': 'completed', 'reviewed_by': request.user, 'reviewed_at': timezone.now()}, request.user,
+            'complete', skip=Q(status='completed'),
+        )
+        self.message_user(request, f"{changed} debt clearances completed.")
     complete_clearance.short_description = "Mark as Completed"
     
     def reject_applications(self, request, queryset):
-        queryset.update(status='rejected', reviewed_by=request.user, reviewed_at=timezone.now())
-        self.message_user(request, f"{queryset.count()} applications rejected.")
+        changed = bulk_update(
+            queryset, {'status': 'rejected', 'reviewed_by': request.user, 'reviewed_at': timezone.now()}, request.user,
+            'reject', skip=Q(status='rejected'),
+        )
+        self.message_user(request, f"{changed} applications rejected.")
     reject_applications.short_description = "Reject Applications"
 
 
 @admin.register(TaxRefund)
-class TaxRefundAdmin(admin.ModelAdmin):
+class TaxRefundAdmin(AuditedAdminMixin, admin.ModelAdmin):
     list_display = ['application_number', 'full_name', 'filing_type', 'tax_year', 'income_display', 'expected_refund_display', 'status_badge', 'assigned_to', 'created_at']
     list_filter = ['status', 'filing_type', 'tax_year', 'employment_status', 'created_at']
     search_fields = ['application_number', 'full_name', 'email', 'phone', 'business_name']
@@ -226,21 +257,33 @@ class TaxRefundAdmin(admin.ModelAdmin):
     status_badge.short_description = 'Status'
     
     def request_documents(self, request, queryset):
-        queryset.update(status='documents_required')
-        self.message_user(request, f"{queryset.count()} applications marked as documents required.")
+        changed = bulk_update(
+            queryset, {'status': 'documents_required'}, request.user,
+            'request_documents', skip=Q(status='documents_required'),
+        )
+        self.message_user(request, f"{changed} applications marked as documents required.")
     request_documents.short_description = "Request Documents"
     
     def start_filing(self, request, queryset):
-        queryset.update(status='in_progress', assigned_to=request.user)
-        self.message_user(request, f"{queryset.count()} filings started.")
+        changed = bulk_update(
+            queryset, {'status': 'in_progress', 'assigned_to': request.user}, request.user,
+            'start_filing', skip=Q(status='in_progress'),
+        )
+        self.message_user(request, f"{changed} filings started.")
     start_filing.short_description = "Start Filing"
     
     def mark_filed(self, request, queryset):
-        queryset.update(status='filed', reviewed_at=timezone.now())
-        self.message_user(request, f"{queryset.count()} returns marked as filed.")
+        changed = bulk_update(
+            queryset, {'status': 'filed', 'reviewed_at': timezone.now()}, request.user,
+            'file', skip=Q(status='filed'),
+        )
+        self.message_user(request, f"{changed} returns marked as filed.")
     mark_filed.short_description = "Mark as Filed"
     
     def approve_refund(self, request, queryset):
-        queryset.update(status='approved', reviewed_at=timezone.now())
-        self.message_user(request, f"{queryset.count()} refunds approved.")
+        changed = bulk_update(
+            queryset, {'status': 'approved', 'reviewed_at': timezone.now()}, request.user,
+            'approve', skip=Q(status='approved'),
+        )
+        self.message_user(request, f"{changed} refunds approved.")
     approve_refund.short_description = "Approve Refund"
@@ -4,3 +4,21 @@ from django.apps import AppConfig
 class FinancialConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'financial'
+
+    def ready(self):
+        from django.db import transaction
+        from django.db.models.signals import post_delete
+        from core.storage import register_reference_source, remove_references
+        from .models import TaxRefund
+
+        def tax_document_files():
+            for refund in TaxRefund.objects.only('id', 'documents').iterator(chunk_size=2000):
+                yield from refund.document_files()
+
+        def refund_deleted(sender, instance, **kwargs):
+            names = instance.document_files()
+            transaction.on_commit(lambda: remove_references(names))
+
+        # Uploaded tax documents live in TaxRefund.documents rather than a file field
+        register_reference_source(tax_document_files)
+        post_delete.connect(refund_deleted, sender=TaxRefund, dispatch_uid='blob-refs:financial.TaxRefund')
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+import os
 import uuid
 
 
@@ -62,6 +63,12 @@ class LoanApplication(models.Model):
         verbose_name = 'Loan Application'
         verbose_name_plural = 'Loan Applications'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='financial_loan_user_idx'),
+            models.Index(fields=['user', 'status'], name='financial_loan_user_status_idx'),
+            models.Index(fields=['status', 'created_at'], name='financial_loan_status_idx'),
+            models.Index(fields=['created_at'], name='financial_loan_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.application_number} - {self.full_name}"
@@ -106,6 +113,14 @@ class Withdrawal(models.Model):
         verbose_name = 'Withdrawal'
         verbose_name_plural = 'Withdrawals'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='financial_wd_user_idx'),
+            models.Index(fields=['created_at'], name='financial_wd_created_idx'),
+            # The admin pending queue; skipped on MySQL, where wd_created serves
+            models.Index(
+                fields=['created_at'], name='financial_wd_pending_idx', condition=models.Q(status='pending'),
+            ),
+        ]
     
     def __str__(self):
         return f"{self.withdrawal_number} - ${self.amount}"
@@ -233,3 +248,26 @@ class TaxRefund(models.Model):
         if not self.application_number:
             self.application_number = f"TX{uuid.uuid4().hex[:8].upper()}"
         super().save(*args, **kwargs)
+    
+    def get_document(self, index):
+        """Return ``{'name', 'file', 'sha256'}`` for the document at ``index`` of ``documents``, or None.
+
+        Entries are either a media storage name or a dict with a ``file`` key.
+        ``sha256`` is the hash recorded by the upload, or '' if there is none.
+        """
+        if not 0 <= index < len(self.documents or []):
+            return None
+        entry = self.documents[index]
+        if isinstance(entry, str):
+            entry = {'file': entry}
+        if not isinstance(entry, dict) or not entry.get('file'):
+            return None
+        return {
+            'name': entry.get('name') or os.path.basename(entry['file']),
+            'file': entry['file'],
+            'sha256': entry.get('sha256') or '',
+        }
+    
+    def document_files(self):
+        """Storage names of every uploaded document"""
+        return [document['file'] for document in map(self.get_document, range(len(self.documents or []))) if document]
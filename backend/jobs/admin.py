@@ -1,7 +1,13 @@
 from django.contrib import admin
+from django.db.models import Q
 from django.utils.html import format_html
 from django.utils import timezone
-from .models import Company, Job, Application, Resume, SavedJob, Message
+from .models import Company, Job, Application, Resume, SavedJob, Message, SavedSearch, SavedSearchRun, JobAlertDigest
+from .skill_index import normalize_job_skills, sync_job_skills
+from .resume_index import search_resumes
+from core.bulk import bulk_update
+from core.images import thumbnail_url
+from taskqueue.registry import enqueue
 
 
 class JobInline(admin.TabularInline):
@@ -32,7 +38,8 @@ class CompanyAdmin(admin.ModelAdmin):
     
     def logo_preview(self, obj):
         if obj.logo:
-            return format_html('<img src="{}" width="40" height="40" style="border-radius: 8px; object-fit: cover;" />', obj.logo.url)
+            return format_html('<img src="{}" width="40" height="40" style="border-radius: 8px; object-fit: cover;" />',
+                               thumbnail_url(obj.logo, 'logo', 'sm'))
         return format_html('<span style="color: #999;">No logo</span>')
     logo_preview.short_description = 'Logo'
     
@@ -78,6 +85,11 @@ class JobAdmin(admin.ModelAdmin):
     
     actions = ['publish_jobs', 'close_jobs', 'feature_jobs', 'unfeature_jobs']
     
+    def save_model(self, request, obj, form, change):
+        skills = normalize_job_skills(obj)
+        super().save_model(request, obj, form, change)
+        sync_job_skills(obj, skills)
+    
     def salary_range(self, obj):
         if obj.salary_min and obj.salary_max:
             return f"${obj.salary_min:,} - ${obj.salary_max:,}"
@@ -100,23 +112,35 @@ class JobAdmin(admin.ModelAdmin):
     status_badge.short_description = 'Status'
     
     def publish_jobs(self, request, queryset):
-        queryset.update(status='published', published_at=timezone.now())
-        self.message_user(request, f"{queryset.count()} jobs published.")
+        changed = bulk_update(
+            queryset, {'status': 'published', 'published_at': timezone.now()}, request.user,
+            'publish', skip=Q(status='published'), namespaces=lambda ids: ['jobs'],
+        )
+        self.message_user(request, f"{changed} jobs published.")
     publish_jobs.short_description = "Publish selected jobs"
     
     def close_jobs(self, request, queryset):
-        queryset.update(status='closed')
-        self.message_user(request, f"{queryset.count()} jobs closed.")
+        changed = bulk_update(
+            queryset, {'status': 'closed'}, request.user,
+            'close', skip=Q(status='closed'), namespaces=lambda ids: ['jobs'],
+        )
+        self.message_user(request, f"{changed} jobs closed.")
     close_jobs.short_description = "Close selected jobs"
     
     def feature_jobs(self, request, queryset):
-        queryset.update(is_featured=True)
-        self.message_user(request, f"{queryset.count()} jobs featured.")
+        changed = bulk_update(
+            queryset, {'is_featured': True}, request.user,
+            'feature', skip=Q(is_featured=True), namespaces=lambda ids: ['jobs'],
+        )
+        self.message_user(request, f"{changed} jobs featured.")
     feature_jobs.short_description = "Feature selected jobs"
     
     def unfeature_jobs(self, request, queryset):
-        queryset.update(is_featured=False)
-        self.message_user(request, f"{queryset.count()} jobs unfeatured.")
+        changed = bulk_update(
+            queryset, {'is_featured': False}, request.user,
+            'unfeature', skip=Q(is_featured=False), namespaces=lambda ids: ['jobs'],
+        )
+        self.message_user(request, f"{changed} jobs unfeatured.")
     unfeature_jobs.short_description = "Unfeature selected jobs"
 
 
@@ -185,17 +209,34 @@ class ApplicationAdmin(admin.ModelAdmin):
 
 @admin.register(Resume)
 class ResumeAdmin(admin.ModelAdmin):
-    list_display = ['name', 'user', 'is_primary', 'file_link', 'created_at']
-    list_filter = ['is_primary', 'created_at']
+    list_display = ['name', 'user', 'is_primary', 'file_link', 'extraction_status', 'created_at']
+    list_filter = ['is_primary', 'extraction_status', 'created_at']
     search_fields = ['name', 'user__email', 'user__first_name', 'user__last_name']
     ordering = ['-created_at']
     raw_id_fields = ['user']
+    readonly_fields = ['text', 'content_hash', 'extraction_status', 'extracted_at']
+    actions = ['reindex_text']
+    
+    def get_search_results(self, request, queryset, search_term):
+        # Also match resume contents through the term index, within the
+        # changelist's filters (``queryset`` already has them applied)
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term:
+            matching = search_resumes(search_term).values('resume_id')
+            results = queryset.filter(Q(pk__in=results.values('pk')) | Q(pk__in=matching))
+        return results, may_have_duplicates
     
     def file_link(self, obj):
         if obj.file:
             return format_html('<a href="{}" target="_blank">Download</a>', obj.file.url)
         return format_html('<span style="color: #999;">No file</span>')
     file_link.short_description = 'File'
+    
+    def reindex_text(self, request, queryset):
+        for resume in queryset.exclude(file=''):
+            enqueue('jobs.tasks.extract_resume_text', resume.pk, force=True)
+        self.message_user(request, f"{queryset.count()} resumes queued for text extraction.")
+    reindex_text.short_description = 'Re-extract resume text'
 
 
 @admin.register(SavedJob)
@@ -223,3 +264,27 @@ class MessageAdmin(admin.ModelAdmin):
     )
     
     readonly_fields = ['created_at']
+
+
+@admin.register(SavedSearch)
+class SavedSearchAdmin(admin.ModelAdmin):
+    list_display = ['name', 'user', 'is_active', 'last_matched_at', 'created_at']
+    list_filter = ['is_active', 'created_at']
+    search_fields = ['name', 'user__email', 'user__first_name', 'user__last_name']
+    ordering = ['-created_at']
+    raw_id_fields = ['user']
+
+
+@admin.register(SavedSearchRun)
+class SavedSearchRunAdmin(admin.ModelAdmin):
+    list_display = ['window_start', 'window_end', 'jobs_evaluated', 'searches_matched', 'digests_created']
+    ordering = ['-window_end']
+
+
+@admin.register(JobAlertDigest)
+class JobAlertDigestAdmin(admin.ModelAdmin):
+    list_display = ['user', 'jobs_count', 'is_read', 'created_at']
+    list_filter = ['is_read', 'created_at']
+    search_fields = ['user__email']
+    ordering = ['-created_at']
+    raw_id_fields = ['user', 'run']
@@ -0,0 +1,276 @@
+"""
+Saved-search alert matcher.
+
+Each run evaluates only the jobs published since the previous run, up to
+``COMMIT_GRACE`` ago, holding a lock on the previous run so that overlapping
+runs cannot evaluate (and alert on) the same window twice. Saved
+searches are streamed once and indexed under a single "anchor" facet (a
+skill, experience level, job type, ...); every new job then looks up just the
+searches anchored on one of its own facets and verifies the remaining
+filters in memory. No query is issued per saved search or per job.
+
+Location and search text are substring filters, so searches that only have
+those are anchored on one trigram of the filter: a job containing the filter
+contains each of its trigrams, and a job only looks up the trigrams of its
+own location and text.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.skills import resolve_skill_map, skill_key, split_skills
+from .models import Job, SavedSearch, SavedSearchRun, JobAlertDigest
+
+
+# Window used for the very first run, when there is no previous cursor
+INITIAL_WINDOW = timedelta(days=1)
+
+# Windows end this long before the run starts: published_at is set before the
+# publishing transaction commits, so the newest jobs may not be visible yet
+COMMIT_GRACE = timedelta(minutes=5)
+
+# Maximum number of jobs listed per saved search in one digest
+MAX_JOBS_PER_SEARCH = 50
+
+TRUE_VALUES = {'true', '1', 'yes', 'on'}
+
+# Rough English letter frequency, most common first; a trigram of rare letters
+# is found in fewer jobs, so it makes the more selective anchor
+LETTER_FREQUENCY = 'etaoinsrhldcumfpgwybvkxjqz'
+
+
+def _as_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in TRUE_VALUES
+
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def normalize_filters(filters):
+    """Clean a dict of JobViewSet query parameters for storage.
+
+    Unknown keys and empty values are dropped, skills are mapped to their
+    canonical names and numeric/boolean values are coerced.
+    """
+    cleaned = {}
+    for key in SavedSearch.FILTER_KEYS:
+        value = filters.get(key)
+        if value in (None, '', []):
+            continue
+        if key in ('is_remote', 'is_featured'):
+            cleaned[key] = _as_bool(value)
+        elif key in ('salary_min', 'salary_max'):
+            number = _as_int(value)
+            if number is not None:
+                cleaned[key] = number
+        elif key == 'skills':
+            names = split_skills(value)
+            resolved = resolve_skill_map(names, create=False)
+            cleaned[key] = [
+                resolved[skill_key(name)].name if skill_key(name) in resolved else name
+                for name in names
+            ]
+        else:
+            cleaned[key] = str(value).strip()
+    return cleaned
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _rarest_trigram(text):
+    def rarity(gram):
+        return sum(LETTER_FREQUENCY.find(char) if char in LETTER_FREQUENCY else 0 for char in gram)
+
+    grams = trigrams(text)
+    # max() of (rarity, gram) keeps the choice deterministic on ties
+    return max(grams, key=lambda gram: (rarity(gram), gram)) if grams else None
+
+
+class CompiledSearch:
+    """In-memory predicate for one saved search"""
+
+    __slots__ = ('id', 'user_id', 'terms', 'job_type', 'experience_level', 'is_remote',
+                 'is_featured', 'location', 'salary_min', 'salary_max', 'skills')
+
+    def __init__(self, search_id, user_id, filters):
+        self.id = search_id
+        self.user_id = user_id
+        self.terms = str(filters.get('search', '')).lower().split()
+        self.job_type = filters.get('job_type')
+        self.experience_level = filters.get('experience_level')
+        self.is_remote = filters.get('is_remote')
+        self.is_featured = filters.get('is_featured')
+        self.location = str(filters.get('location', '')).lower()
+        self.salary_min = filters.get('salary_min')
+        self.salary_max = filters.get('salary_max')
+        self.skills = frozenset(skill_key(name) for name in filters.get('skills', []))
+
+    def anchor(self):
+        """The most selective facet to index this search under"""
+        if self.skills:
+            return ('skill', min(self.skills))
+        if self.experience_level:
+            return ('experience_level', self.experience_level)
+        if self.job_type:
+            return ('job_type', self.job_type)
+        if self.is_remote:
+            return ('remote', True)
+        if len(self.location) >= 3:
+            return ('location', _rarest_trigram(self.location))
+        terms = [term for term in self.terms if len(term) >= 3]
+        if terms:
+            return ('text', _rarest_trigram(max(terms, key=len)))
+        return ('any', None)
+
+    def matches(self, job):
+        if self.job_type and job.job_type != self.job_type:
+            return False
+        if self.experience_level and job.experience_level != self.experience_level:
+            return False
+        if self.is_remote is not None and job.is_remote != self.is_remote:
+            return False
+        if self.is_featured is not None and job.is_featured != self.is_featured:
+            return False
+        if self.location and self.location not in job.location_text:
+            return False
+        if self.salary_min is not None and (job.salary_min is None or job.salary_min < self.salary_min):
+            return False
+        if self.salary_max is not None and (job.salary_max is None or job.salary_max > self.salary_max):
+            return False
+        if self.skills and not self.skills <= job.skill_keys:
+            return False
+        # Mirrors SearchFilter: every term must appear in one of the fields
+        return all(term in job.search_text for term in self.terms)
+
+
+class SearchIndex:
+    """Saved searches bucketed by anchor facet"""
+
+    def __init__(self):
+        self.buckets = defaultdict(list)
+        self.size = 0
+
+    def add(self, search):
+        self.buckets[search.anchor()].append(search)
+        self.size += 1
+
+    def candidates(self, job):
+        keys = [('any', None), ('job_type', job.job_type), ('experience_level', job.experience_level)]
+        if job.is_remote:
+            keys.append(('remote', True))
+        keys.extend(('skill', key) for key in job.skill_keys)
+        keys.extend(('location', gram) for gram in job.location_grams)
+        keys.extend(('text', gram) for gram in job.text_grams)
+        for key in keys:
+            yield from self.buckets.get(key, ())
+
+
+def build_search_index(chunk_size=5000):
+    """Stream every active saved search into a SearchIndex"""
+    index = SearchIndex()
+    rows = SavedSearch.objects.filter(is_active=True).values_list('id', 'user_id', 'filters')
+    for search_id, user_id, filters in rows.iterator(chunk_size=chunk_size):
+        index.add(CompiledSearch(search_id, user_id, filters or {}))
+    return index
+
+
+def _prepare_job(job):
+    job.skill_keys = frozenset(skill_key(name) for name in split_skills(job.skills))
+    job.location_text = (job.location or '').lower()
+    job.search_text = ' '.join(
+        part.lower() for part in (job.title, job.description, job.location, job.company.name) if part
+    )
+    job.location_grams = trigrams(job.location_text)
+    job.text_grams = trigrams(job.search_text)
+    return job
+
+
+def new_jobs_between(start, end):
+    """Published jobs that went live in ``(start, end]``"""
+    published = Q(published_at__gt=start, published_at__lte=end)
+    # Jobs published through the API before it set published_at
+    created_published = Q(published_at__isnull=True, created_at__gt=start, created_at__lte=end)
+    return (
+        Job.objects.filter(status='published')
+        .filter(published | created_published)
+        .select_related('company')
+        .only('id', 'title', 'description', 'location', 'job_type', 'experience_level', 'is_remote',
+              'is_featured', 'salary_min', 'salary_max', 'skills', 'posted_by_id', 'company__name')
+    )
+
+
+def match_jobs(index, jobs):
+    """Return ``{user_id: {search_id: [job_id, ...]}}`` for the given jobs"""
+    results = defaultdict(lambda: defaultdict(list))
+    for job in jobs:
+        _prepare_job(job)
+        for search in index.candidates(job):
+            if search.user_id == job.posted_by_id:
+                continue
+            if search.matches(job):
+                matched = results[search.user_id][search.id]
+                if len(matched) < MAX_JOBS_PER_SEARCH:
+                    matched.append(job.id)
+    return results
+
+
+def _lock_cursor(start):
+    """Lock the latest run, creating an empty one ending at ``start`` on the very first run"""
+    latest = SavedSearchRun.objects.select_for_update().order_by('-window_end', '-id')
+    previous = latest.first()
+    if previous is None:
+        SavedSearchRun.objects.create(window_start=start, window_end=start)
+        previous = latest.first()
+    return previous
+
+
+def run_saved_search_alerts(now=None, batch_size=1000, stdout=None):
+    """Match jobs published since the last run and write per-user digests"""
+    now = now or timezone.now()
+    end = now - COMMIT_GRACE
+    with transaction.atomic():
+        # Overlapping runs wait here, then start where the first one ended
+        previous = _lock_cursor(end - INITIAL_WINDOW)
+        start = previous.window_end
+        run = SavedSearchRun(window_start=start, window_end=max(start, end))
+        jobs = list(new_jobs_between(run.window_start, run.window_end))
+        run.jobs_evaluated = len(jobs)
+        if not jobs:
+            run.save()
+            return run
+
+        index = build_search_index()
+        if stdout:
+            stdout.write(f"Matching {len(jobs)} new jobs against {index.size} saved searches")
+        results = match_jobs(index, jobs)
+
+        digests = []
+        matched_search_ids = []
+        for user_id, searches in results.items():
+            matches = [{'saved_search': search_id, 'jobs': job_ids} for search_id, job_ids in searches.items() if job_ids]
+            if not matches:
+                continue
+            matched_search_ids.extend(match['saved_search'] for match in matches)
+            jobs_count = len({job_id for match in matches for job_id in match['jobs']})
+            digests.append(JobAlertDigest(user_id=user_id, matches=matches, jobs_count=jobs_count))
+
+        run.searches_matched = len(matched_search_ids)
+        run.digests_created = len(digests)
+        run.save()
+        for digest in digests:
+            digest.run = run
+        JobAlertDigest.objects.bulk_create(digests, batch_size=batch_size)
+        for i in range(0, len(matched_search_ids), batch_size):
+            SavedSearch.objects.filter(id__in=matched_search_ids[i:i + batch_size]).update(last_matched_at=now)
+    return run
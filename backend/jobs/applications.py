@@ -0,0 +1,32 @@
+"""
+Application submission.
+
+Duplicate applications are rejected by the unique (job, applicant)
+constraint rather than by checking first, and the job's applications
+counter is incremented in the same transaction as the insert, on a random
+shard (jobs/counters.py). Concurrent applies to one popular job therefore
+neither double-count, lose increments nor wait on the job row, and a
+submission costs two statements.
+"""
+from django.db import IntegrityError, transaction
+
+from .counters import increment
+from .models import Application
+
+
+class AlreadyApplied(Exception):
+    """The applicant already has an application for this job"""
+
+
+def submit_application(applicant, job, **fields):
+    """Create ``applicant``'s application to ``job`` and count it on the job"""
+    try:
+        with transaction.atomic():
+            application = Application.objects.create(applicant=applicant, job=job, **fields)
+            increment(job.pk, 'applications')
+    except IntegrityError:
+        # Only look on the failure path; anything but a duplicate is re-raised
+        if Application.objects.filter(applicant=applicant, job=job).exists():
+            raise AlreadyApplied()
+        raise
+    return application
@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class JobsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'jobs'
+
+    def ready(self):
+        from core.cache import invalidate_on_change
+        from core.images import register_image_derivatives
+        from core.storage import track_blob_references
+        from .models import Company, Job, Resume
+        track_blob_references(Company, 'logo', 'cover_image')
+        track_blob_references(Resume, 'file')
+        register_image_derivatives(Company, 'logo', 'logo')
+        register_image_derivatives(Company, 'cover_image', 'cover')
+        # Cached public job and company responses (api.caching)
+        invalidate_on_change(Job, 'jobs', ignore_fields={'views_count'})
+        invalidate_on_change(Company, 'companies')
@@ -0,0 +1,145 @@
+"""
+Sharded job counters.
+
+``Job.views_count`` and ``Job.applications_count`` are not incremented in the
+job row: every increment adds to one of ``JOB_COUNTER_SHARDS`` rows of
+``JobCounterShard`` picked at random, so concurrent views of a viral job
+update different rows instead of queueing on one. ``rollup_counters`` (run
+from cron through ``manage.py rollup_job_counters``) periodically moves the
+pending deltas into the job columns; each move subtracts from the shard and
+adds to the job in one transaction, so the sum of both is always exact.
+
+Readers combine the two: ``live_count`` for an instance (using prefetched
+``counter_shards`` when present) and ``live_count_expression`` in querysets.
+Ordering and filtering on the raw columns sees the last roll-up.
+
+Job detail views are counted even earlier, in the shared cache tier
+(``record_view``), so that serving a cached page or a 304 never writes to
+the database; ``fold_buffered_views`` adds them to ``Job.views_count`` at
+each roll-up and they are not part of the live counts until then.
+"""
+import random
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, IntegerField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from core.cache import cache_key, shared_cache
+from .models import Job, JobCounterShard
+
+
+# Job column each counter is rolled up into
+COUNTER_COLUMNS = {
+    'views': 'views_count',
+    'applications': 'applications_count',
+}
+
+
+def counter_shards():
+    return getattr(settings, 'JOB_COUNTER_SHARDS', 16)
+
+
+def increment(job_id, counter, amount=1):
+    """Add ``amount`` to one shard of ``job_id``'s ``counter``"""
+    shard = random.randrange(counter_shards())
+    shards = JobCounterShard.objects.filter(job_id=job_id, counter=counter, shard=shard)
+    if shards.update(delta=F('delta') + amount):
+        return
+    # First increment of this shard; another request may be creating it too
+    try:
+        with transaction.atomic():
+            JobCounterShard.objects.create(job_id=job_id, counter=counter, shard=shard, delta=amount)
+    except IntegrityError:
+        shards.update(delta=F('delta') + amount)
+
+
+def record_view(slug):
+    """Count a view of the job at ``slug`` in the shared cache"""
+    backend = shared_cache()
+    key = cache_key('job-views', slug)
+    try:
+        backend.incr(key)
+    except ValueError:
+        # First view since the cache was emptied; another request may be adding it too
+        backend.add(key, 0, timeout=None)
+        backend.incr(key)
+
+
+def fold_buffered_views(batch_size=1000):
+    """Move views counted by ``record_view`` into ``Job.views_count``; returns the number of jobs updated"""
+    backend = shared_cache()
+    updated = 0
+    last_id = 0
+    while True:
+        batch = list(Job.objects.filter(id__gt=last_id).order_by('id').values_list('id', 'slug')[:batch_size])
+        if not batch:
+            break
+        last_id = batch[-1][0]
+
+        keys = {cache_key('job-views', slug): job_id for job_id, slug in batch}
+        views = {}
+        for key, count in backend.get_many(list(keys)).items():
+            if count > 0:
+                # Subtract what was read, not the current value: views since then stay buffered
+                backend.decr(key, count)
+                views[keys[key]] = count
+
+        with transaction.atomic():
+            for job_id, count in views.items():
+                Job.objects.filter(pk=job_id).update(views_count=F('views_count') + count)
+        updated += len(views)
+    return updated
+
+
+def pending_count(job, counter):
+    """Increments of ``job``'s ``counter`` that are not rolled up yet"""
+    return sum(shard.delta for shard in job.counter_shards.all() if shard.counter == counter)
+
+
+def live_count(job, counter):
+    return getattr(job, COUNTER_COLUMNS[counter]) + pending_count(job, counter)
+
+
+def live_count_expression(counter, prefix=''):
+    """Live value of ``counter`` for the job at lookup ``prefix`` (e.g. ``'job__'``) of a queryset"""
+    pending = (
+        JobCounterShard.objects.filter(job=OuterRef(f'{prefix}pk'), counter=counter)
+        .order_by().values('job').annotate(total=Sum('delta')).values('total')
+    )
+    return F(f'{prefix}{COUNTER_COLUMNS[counter]}') + Coalesce(Subquery(pending), 0)
+
+
+def rollup_counters(batch_size=1000):
+    """Fold pending shard deltas into the Job columns; returns the number of shards folded"""
+    folded = 0
+    last_id = 0
+    while True:
+        batch = list(
+            JobCounterShard.objects.filter(id__gt=last_id).exclude(delta=0)
+            .order_by('id').values_list('id', 'job_id', 'counter', 'delta')[:batch_size]
+        )
+        if not batch:
+            break
+        last_id = batch[-1][0]
+
+        totals = defaultdict(dict)
+        for _, job_id, counter, delta in batch:
+            column = COUNTER_COLUMNS[counter]
+            totals[job_id][column] = totals[job_id].get(column, 0) + delta
+
+        with transaction.atomic():
+            # Subtract what was read, not the current value: increments since then stay pending
+            JobCounterShard.objects.filter(id__in=[shard_id for shard_id, *_ in batch]).update(
+                delta=F('delta') - Case(
+                    *[When(id=shard_id, then=Value(delta)) for shard_id, _, _, delta in batch],
+                    default=Value(0), output_field=IntegerField(),
+                ),
+            )
+            for job_id, columns in totals.items():
+                Job.objects.filter(pk=job_id).update(
+                    **{column: F(column) + delta for column, delta in columns.items()}
+                )
+        folded += len(batch)
+    return folded
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from jobs.models import Resume
+from jobs.resume_index import index_resume
+from taskqueue.registry import enqueue
+
+
+class Command(BaseCommand):
+    help = 'Extract and index resume text (only resumes not yet indexed unless --all is given)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Re-index every resume')
+        parser.add_argument('--sync', action='store_true',
+                            help='Index in this process instead of queueing background tasks')
+
+    def handle(self, *args, **options):
+        resumes = Resume.objects.exclude(file='').only('id', 'file', 'content_hash', 'extraction_status')
+        if not options['all']:
+            resumes = resumes.filter(extraction_status='pending')
+
+        count = 0
+        for resume in resumes.iterator(chunk_size=500):
+            if options['sync']:
+                status = index_resume(resume, force=options['all'])
+                self.stdout.write(f"Resume #{resume.pk}: {status}")
+            else:
+                # No idempotency key: an explicit re-run must queue again even
+                # when an earlier extraction task for the same file failed
+                enqueue('jobs.tasks.extract_resume_text', resume.pk, force=options['all'])
+            count += 1
+
+        action = 'Indexed' if options['sync'] else 'Queued'
+        self.stdout.write(self.style.SUCCESS(f"{action} {count} resumes"))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from jobs.alerts import run_saved_search_alerts
+
+
+class Command(BaseCommand):
+    help = 'Match jobs published since the last run against all saved searches and write alert digests'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        run = run_saved_search_alerts(batch_size=options['batch_size'], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(
+            f"Evaluated {run.jobs_evaluated} jobs, matched {run.searches_matched} searches, "
+            f"created {run.digests_created} digests"
+        ))
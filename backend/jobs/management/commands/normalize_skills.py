@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from core.cache import bump_version_on_commit, profile_namespace
+from core.models import Skill
+from core.skills import resolve_skill_map, seed_default_aliases, skill_key
+from jobs.skill_index import rebuild_skill_index
+
+
+class Command(BaseCommand):
+    help = 'Seed the skill taxonomy, canonicalize stored skill names and rebuild the job skill index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--skip-profiles', action='store_true', help='Do not rewrite core.Skill names')
+
+    def handle(self, *args, **options):
+        aliases = seed_default_aliases()
+        self.stdout.write(f"Seeded {aliases} new skill aliases")
+
+        if not options['skip_profiles']:
+            renamed, merged = self.normalize_profile_skills(options['batch_size'])
+            self.stdout.write(f"Renamed {renamed} profile skills, merged {merged} duplicates")
+
+        total = rebuild_skill_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt skill index for {total} jobs"))
+
+    def normalize_profile_skills(self, batch_size):
+        renamed = merged = 0
+        last_id = 0
+        while True:
+            batch = list(Skill.objects.filter(id__gt=last_id).order_by('id').values_list('id', 'user_id', 'name')[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1][0]
+            canonical = resolve_skill_map([name for _, _, name in batch])
+            for skill_id, user_id, name in batch:
+                target = canonical.get(skill_key(name))
+                if target is None or target.name == name:
+                    continue
+                if Skill.objects.filter(user_id=user_id, name=target.name).exists():
+                    Skill.objects.filter(id=skill_id).delete()
+                    merged += 1
+                else:
+                    Skill.objects.filter(id=skill_id).update(name=target.name)
+                    bump_version_on_commit(profile_namespace(user_id))
+                    renamed += 1
+        return renamed, merged
@@ -0,0 +1,42 @@
+import os
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from jobs.resume_rendering import render_resumes
+
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Render primary PDF resumes for applicants in a pool of worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Renderer processes (defaults to the CPU count)')
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--user', type=int, action='append', dest='users',
+                            help='Only render resumes for this user id (repeatable)')
+
+    def handle(self, *args, **options):
+        if options['users']:
+            user_ids = options['users']
+        else:
+            user_ids = list(User.objects.filter(role__in=User.JOB_SEEKER_ROLES).values_list('id', flat=True))
+        workers = options['workers'] or os.cpu_count() or 1
+
+        self.stdout.write(f"Rendering {len(user_ids)} resumes with {workers} workers")
+
+        def progress(done, total, elapsed):
+            rate = done / elapsed if elapsed else 0
+            eta = (total - done) / rate if rate else 0
+            self.stdout.write(f"{done}/{total} rendered ({rate:.1f}/s, ETA {eta:.0f}s)")
+
+        stats = render_resumes(user_ids, workers=workers, batch_size=options['batch_size'], progress=progress)
+
+        for user_id, error in stats['errors']:
+            self.stderr.write(f"User #{user_id}: {error}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {stats['created']} and updated {stats['updated']} resumes, {stats['failed']} failed"
+        ))
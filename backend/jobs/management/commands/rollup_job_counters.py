@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from jobs.counters import fold_buffered_views, rollup_counters
+
+
+class Command(BaseCommand):
+    help = 'Fold buffered views and pending counter shards into Job.views_count/applications_count (cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        viewed = fold_buffered_views(batch_size=options['batch_size'])
+        folded = rollup_counters(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Rolled up views of {viewed} jobs and {folded} counter shards"))
@@ -0,0 +1,333 @@
+"""
+Candidate/job matching engine.
+
+Published jobs are compiled into a column-oriented index (skill vectors in
+CSR form plus per-job attribute arrays) that is cached per process, so that
+ranking every job for a user is a handful of vectorized NumPy operations
+instead of a Python loop over job/candidate pairs.
+"""
+import threading
+import time
+
+from django.db.models import Count, Max
+
+from core.cache import get_versions
+from core.lazy import lazy_import
+from core.models import Skill
+from core.skills import skill_key, split_skills
+from .models import Job, Application
+
+np = lazy_import('numpy')
+
+
+PROFICIENCY_WEIGHTS = {
+    'beginner': 0.25,
+    'intermediate': 0.5,
+    'advanced': 0.75,
+    'expert': 1.0,
+}
+
+EXPERIENCE_LEVELS = ['entry', 'mid', 'senior', 'executive']
+
+# Relative weight of each signal in the final score (sums to 1.0)
+SCORE_WEIGHTS = {
+    'skills': 0.6,
+    'experience': 0.15,
+    'salary': 0.1,
+    'location': 0.1,
+    'job_type': 0.05,
+}
+
+# How long a built index is trusted before its signature is re-checked
+INDEX_TTL_SECONDS = 60
+
+# Jobs ranked per requested recommendation, so that those closed or deleted
+# since the index was built can be dropped without coming up short
+OVERFETCH_FACTOR = 2
+
+
+def parse_job_skills(value):
+    """Return the lookup keys of the skills stored in ``Job.skills``"""
+    return [skill_key(name) for name in split_skills(value)]
+
+
+def skill_weight(proficiency, years_of_experience):
+    """Weight of a candidate skill from its proficiency and years"""
+    weight = PROFICIENCY_WEIGHTS.get(proficiency, 0.5)
+    years = min(years_of_experience or 0, 10)
+    return weight * (1.0 + 0.5 * years / 10.0)
+
+
+def experience_level_for_years(years):
+    """Map years of experience to an index into EXPERIENCE_LEVELS"""
+    if years < 2:
+        return 0
+    if years < 5:
+        return 1
+    if years < 10:
+        return 2
+    return 3
+
+
+class JobIndex:
+    """Column-oriented snapshot of all published jobs"""
+
+    def __init__(self, rows):
+        self.vocabulary = {}
+        self.locations = {}
+        self.job_types = {}
+
+        count = len(rows)
+        self.job_ids = np.empty(count, dtype=np.int64)
+        self.experience = np.empty(count, dtype=np.int8)
+        self.salary_min = np.zeros(count, dtype=np.float64)
+        self.salary_max = np.zeros(count, dtype=np.float64)
+        self.has_salary = np.zeros(count, dtype=bool)
+        self.is_remote = np.zeros(count, dtype=bool)
+        self.location_ids = np.empty(count, dtype=np.int32)
+        self.job_type_ids = np.empty(count, dtype=np.int16)
+
+        indptr = [0]
+        indices = []
+        for i, (job_id, skills, level, salary_min, salary_max, is_remote, location, job_type) in enumerate(rows):
+            self.job_ids[i] = job_id
+            self.experience[i] = EXPERIENCE_LEVELS.index(level) if level in EXPERIENCE_LEVELS else 1
+            if salary_min or salary_max:
+                self.has_salary[i] = True
+                self.salary_min[i] = salary_min or salary_max
+                self.salary_max[i] = salary_max or salary_min
+            self.is_remote[i] = bool(is_remote)
+            self.location_ids[i] = self.locations.setdefault((location or '').lower(), len(self.locations))
+            self.job_type_ids[i] = self.job_types.setdefault(job_type, len(self.job_types))
+
+            for name in set(parse_job_skills(skills)):
+                indices.append(self.vocabulary.setdefault(name, len(self.vocabulary)))
+            indptr.append(len(indices))
+
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.skill_counts = np.diff(self.indptr)
+        self.location_names = list(self.locations)
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def user_vector(self, skills):
+        """Dense weight vector over the index vocabulary for (name, weight) pairs"""
+        vector = np.zeros(len(self.vocabulary) + 1, dtype=np.float64)
+        for name, weight in skills:
+            position = self.vocabulary.get(skill_key(name))
+            if position is not None:
+                vector[position] = max(vector[position], weight)
+        return vector
+
+    def skill_scores(self, vector):
+        """Share of each job's required skills covered by the user, weighted"""
+        scores = np.zeros(len(self), dtype=np.float64)
+        if not len(self.indices):
+            return scores
+        gathered = vector[self.indices]
+        has_skills = self.skill_counts > 0
+        # reduceat over empty segments returns the next element, so only
+        # reduce jobs that actually list skills
+        starts = self.indptr[:-1][has_skills]
+        scores[has_skills] = np.add.reduceat(gathered, starts) / self.skill_counts[has_skills]
+        return np.minimum(scores, 1.0)
+
+    def location_mask(self, desired_locations):
+        """Boolean array of jobs whose location matches any desired location"""
+        wanted = [loc.lower() for loc in desired_locations if loc]
+        matched = [
+            location_id for location_id, name in enumerate(self.location_names)
+            if any(loc in name for loc in wanted)
+        ]
+        return np.isin(self.location_ids, matched)
+
+    def job_type_mask(self, desired_job_types):
+        wanted = [self.job_types[t] for t in desired_job_types if t in self.job_types]
+        return np.isin(self.job_type_ids, wanted)
+
+
+_index_lock = threading.Lock()
+_index_cache = {'index': None, 'signature': None, 'checked_at': 0.0}
+
+
+def _index_signature():
+    # The 'jobs' version is bumped on every save and delete, which count and
+    # max(updated_at) alone miss (e.g. a delete that leaves the max unchanged)
+    return (get_versions('jobs')['jobs'], *Job.objects.filter(status='published').aggregate(
+        count=Count('id'), last_updated=Max('updated_at'),
+    ).values())
+
+
+def get_job_index():
+    """Return the cached JobIndex, rebuilding it when published jobs changed"""
+    now = time.monotonic()
+    index = _index_cache['index']
+    if index is not None and now - _index_cache['checked_at'] < INDEX_TTL_SECONDS:
+        return index
+
+    with _index_lock:
+        signature = _index_signature()
+        if _index_cache['index'] is None or _index_cache['signature'] != signature:
+            rows = Job.objects.filter(status='published').values_list(
+                'id', 'skills', 'experience_level', 'salary_min', 'salary_max',
+                'is_remote', 'location', 'job_type',
+            )
+            _index_cache['index'] = JobIndex(list(rows))
+            _index_cache['signature'] = signature
+        _index_cache['checked_at'] = now
+        return _index_cache['index']
+
+
+def invalidate_job_index():
+    """Force the next get_job_index() call to re-check the signature"""
+    _index_cache['checked_at'] = 0.0
+
+
+def _salary_scores(index, desired_min, desired_max):
+    """Overlap ratio between the desired salary range and each job's range"""
+    if not desired_min and not desired_max:
+        return np.full(len(index), 0.5)
+    low = float(desired_min or desired_max)
+    high = float(desired_max or desired_min)
+    overlap = np.minimum(index.salary_max, high) - np.maximum(index.salary_min, low)
+    span = max(high - low, 1.0)
+    scores = np.clip(overlap / span, 0.0, 1.0)
+    # A job paying entirely above the desired range is still a good fit
+    scores[index.salary_min >= high] = 1.0
+    scores[~index.has_salary] = 0.5
+    return scores
+
+
+def _user_profile(skill_rows):
+    skills = [(name, skill_weight(prof, years)) for name, prof, years in skill_rows]
+    years = max((years or 0 for _, _, years in skill_rows), default=0)
+    return skills, experience_level_for_years(years)
+
+
+def score_jobs_for_user(user, index=None):
+    """Return an array of match scores aligned with ``index.job_ids``"""
+    index = index or get_job_index()
+    skill_rows = list(Skill.objects.filter(user=user).values_list('name', 'proficiency', 'years_of_experience'))
+    skills, level = _user_profile(skill_rows)
+
+    skill_scores = index.skill_scores(index.user_vector(skills))
+    experience_scores = 1.0 - np.abs(index.experience - level) / 3.0
+    salary_scores = _salary_scores(index, user.desired_salary_min, user.desired_salary_max)
+
+    if user.desired_locations:
+        location_scores = (index.location_mask(user.desired_locations) | index.is_remote).astype(np.float64)
+    else:
+        location_scores = np.where(index.is_remote, 1.0, 0.5)
+
+    if user.desired_job_types:
+        job_type_scores = index.job_type_mask(user.desired_job_types).astype(np.float64)
+    else:
+        job_type_scores = np.full(len(index), 0.5)
+
+    return (
+        SCORE_WEIGHTS['skills'] * skill_scores
+        + SCORE_WEIGHTS['experience'] * experience_scores
+        + SCORE_WEIGHTS['salary'] * salary_scores
+        + SCORE_WEIGHTS['location'] * location_scores
+        + SCORE_WEIGHTS['job_type'] * job_type_scores
+    )
+
+
+def _top_k(scores, limit):
+    if limit >= len(scores):
+        order = np.argsort(-scores, kind='stable')
+    else:
+        top = np.argpartition(-scores, limit)[:limit]
+        order = top[np.argsort(-scores[top], kind='stable')]
+    return order
+
+
+def recommend_jobs(user, limit=20, exclude_applied=True):
+    """Return ``[(job_id, score), ...]`` for the best matching published jobs"""
+    index = get_job_index()
+    if not len(index):
+        return []
+    scores = score_jobs_for_user(user, index)
+    if exclude_applied:
+        applied = Application.objects.filter(applicant=user).values_list('job_id', flat=True)
+        scores[np.isin(index.job_ids, list(applied))] = -1.0
+
+    # The index can be INDEX_TTL_SECONDS old: rank more jobs than asked for,
+    # keep those still published and widen the window until there are enough
+    matches = []
+    seen = set()
+    fetch = limit * OVERFETCH_FACTOR
+    while True:
+        positions = [i for i in _top_k(scores, fetch) if scores[i] >= 0 and i not in seen]
+        seen.update(positions)
+        job_ids = [int(index.job_ids[i]) for i in positions]
+        published = set(Job.objects.filter(pk__in=job_ids, status='published').values_list('id', flat=True))
+        matches.extend(
+            (job_id, round(float(scores[i]), 4)) for i, job_id in zip(positions, job_ids) if job_id in published
+        )
+        if len(matches) >= limit or fetch >= len(scores):
+            return matches[:limit]
+        fetch *= 2
+
+
+def rank_candidates(job, limit=50):
+    """Return ``[(application, score), ...]`` ranking the applicants of ``job``"""
+    applications = list(Application.objects.filter(job=job).select_related('applicant'))
+    if not applications:
+        return []
+
+    job_skills = sorted(set(parse_job_skills(job.skills)))
+    vocabulary = {name: i for i, name in enumerate(job_skills)}
+    applicant_ids = [app.applicant_id for app in applications]
+    position = {user_id: i for i, user_id in enumerate(applicant_ids)}
+
+    # Candidate x job-skill weight matrix, filled from a single query
+    matrix = np.zeros((len(applications), max(len(job_skills), 1)), dtype=np.float64)
+    years = np.zeros(len(applications), dtype=np.float64)
+    for user_id, name, proficiency, skill_years in Skill.objects.filter(user_id__in=applicant_ids).values_list(
+        'user_id', 'name', 'proficiency', 'years_of_experience'
+    ):
+        row = position[user_id]
+        years[row] = max(years[row], skill_years or 0)
+        column = vocabulary.get(skill_key(name))
+        if column is not None:
+            matrix[row, column] = max(matrix[row, column], skill_weight(proficiency, skill_years))
+
+    if job_skills:
+        skill_scores = np.minimum(matrix.sum(axis=1) / len(job_skills), 1.0)
+    else:
+        skill_scores = np.full(len(applications), 0.5)
+
+    job_level = EXPERIENCE_LEVELS.index(job.experience_level) if job.experience_level in EXPERIENCE_LEVELS else 1
+    levels = np.digitize(years, [2, 5, 10])
+    experience_scores = 1.0 - np.abs(levels - job_level) / 3.0
+
+    desired_min = np.array([app.applicant.desired_salary_min or 0 for app in applications], dtype=np.float64)
+    if job.salary_max:
+        salary_scores = np.where(desired_min == 0, 0.5, (desired_min <= job.salary_max).astype(np.float64))
+    else:
+        salary_scores = np.full(len(applications), 0.5)
+
+    job_location = (job.location or '').lower()
+    location_scores = np.array([
+        1.0 if job.is_remote or any(loc and loc.lower() in job_location for loc in app.applicant.desired_locations or [])
+        else 0.5 if not app.applicant.desired_locations else 0.0
+        for app in applications
+    ])
+    job_type_scores = np.array([
+        1.0 if job.job_type in (app.applicant.desired_job_types or [])
+        else 0.5 if not app.applicant.desired_job_types else 0.0
+        for app in applications
+    ])
+
+    scores = (
+        SCORE_WEIGHTS['skills'] * skill_scores
+        + SCORE_WEIGHTS['experience'] * experience_scores
+        + SCORE_WEIGHTS['salary'] * salary_scores
+        + SCORE_WEIGHTS['location'] * location_scores
+        + SCORE_WEIGHTS['job_type'] * job_type_scores
+    )
+    order = _top_k(scores, limit)
+    return [(applications[i], round(float(scores[i]), 4)) for i in order]
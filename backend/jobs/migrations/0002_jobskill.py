@@ -0,0 +1,29 @@
+# Generated by Django 5.2.10 on 2026-10-19 05:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_canonicalskill_skillalias'),
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_links', to='jobs.job')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_links', to='core.canonicalskill')),
+            ],
+            options={
+                'verbose_name': 'Job Skill',
+                'verbose_name_plural': 'Job Skills',
+                'indexes': [models.Index(fields=['skill', 'job'], name='jobs_jobskill_skill_job_idx')],
+                'unique_together': {('job', 'skill')},
+            },
+        ),
+    ]
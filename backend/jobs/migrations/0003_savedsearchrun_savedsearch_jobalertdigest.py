@@ -0,0 +1,70 @@
+# Generated by Django 5.2.10 on 2026-10-19 05:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_jobskill'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedSearchRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window_start', models.DateTimeField(verbose_name='Window Start')),
+                ('window_end', models.DateTimeField(verbose_name='Window End')),
+                ('jobs_evaluated', models.IntegerField(default=0, verbose_name='Jobs Evaluated')),
+                ('searches_matched', models.IntegerField(default=0, verbose_name='Searches Matched')),
+                ('digests_created', models.IntegerField(default=0, verbose_name='Digests Created')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Saved Search Run',
+                'verbose_name_plural': 'Saved Search Runs',
+                'ordering': ['-window_end'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SavedSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, verbose_name='Name')),
+                ('filters', models.JSONField(blank=True, default=dict, help_text='JobViewSet query parameters', verbose_name='Filters')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Alerts Enabled')),
+                ('last_matched_at', models.DateTimeField(blank=True, null=True, verbose_name='Last Matched At')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Saved Search',
+                'verbose_name_plural': 'Saved Searches',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['is_active', 'id'], name='jobs_savedsearch_active_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobAlertDigest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('matches', models.JSONField(default=list, help_text='[{"saved_search": id, "jobs": [ids]}]', verbose_name='Matches')),
+                ('jobs_count', models.IntegerField(default=0, verbose_name='Jobs')),
+                ('is_read', models.BooleanField(default=False, verbose_name='Read')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_alert_digests', to=settings.AUTH_USER_MODEL)),
+                ('run', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='digests', to='jobs.savedsearchrun')),
+            ],
+            options={
+                'verbose_name': 'Job Alert Digest',
+                'verbose_name_plural': 'Job Alert Digests',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', 'is_read', 'created_at'], name='jobs_alertdigest_user_idx')],
+            },
+        ),
+    ]
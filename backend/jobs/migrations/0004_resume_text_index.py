@@ -0,0 +1,48 @@
+# Generated by Django 5.2.10 on 2026-10-19 05:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_savedsearchrun_savedsearch_jobalertdigest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, default='', help_text='SHA-256 of the file contents', max_length=64, verbose_name='Content Hash'),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='extracted_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Extracted At'),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='extraction_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('failed', 'Failed'), ('unsupported', 'Unsupported Format')], default='pending', max_length=20, verbose_name='Extraction Status'),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='text',
+            field=models.TextField(blank=True, default='', verbose_name='Extracted Text'),
+        ),
+        migrations.CreateModel(
+            name='ResumeTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64, verbose_name='Term')),
+                ('frequency', models.PositiveIntegerField(default=1, verbose_name='Frequency')),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='jobs.resume')),
+            ],
+            options={
+                'verbose_name': 'Resume Term',
+                'verbose_name_plural': 'Resume Terms',
+                'unique_together': {('term', 'resume')},
+            },
+        ),
+    ]
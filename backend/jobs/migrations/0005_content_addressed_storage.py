@@ -0,0 +1,29 @@
+# Generated by Django 5.2.10 on 2026-10-19 05:28
+
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_resume_text_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='company',
+            name='cover_image',
+            field=models.ImageField(blank=True, null=True, storage=core.storage.get_content_storage, upload_to='company_covers/', verbose_name='Cover Image'),
+        ),
+        migrations.AlterField(
+            model_name='company',
+            name='logo',
+            field=models.ImageField(blank=True, null=True, storage=core.storage.get_content_storage, upload_to='company_logos/', verbose_name='Logo'),
+        ),
+        migrations.AlterField(
+            model_name='resume',
+            name='file',
+            field=models.FileField(storage=core.storage.get_content_storage, upload_to='resumes/', verbose_name='Resume File'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.10 on 2026-10-19 05:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_content_addressed_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobCounterShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('counter', models.CharField(choices=[('views', 'Views'), ('applications', 'Applications')], max_length=20, verbose_name='Counter')),
+                ('shard', models.PositiveSmallIntegerField(verbose_name='Shard')),
+                ('delta', models.IntegerField(default=0, verbose_name='Pending Increments')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='counter_shards', to='jobs.job')),
+            ],
+            options={
+                'verbose_name': 'Job Counter Shard',
+                'verbose_name_plural': 'Job Counter Shards',
+                'unique_together': {('job', 'counter', 'shard')},
+            },
+        ),
+    ]
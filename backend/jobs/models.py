@@ -2,6 +2,8 @@ from django.db import models
 from django.conf import settings
 from django.utils import timezone
 
+from core.storage import get_content_storage
+
 
 class Company(models.Model):
     """Company model for employers"""
@@ -18,8 +20,9 @@ class Company(models.Model):
     
     name = models.CharField('Company Name', max_length=255)
     slug = models.SlugField('Slug', unique=True)
-    logo = models.ImageField('Logo', upload_to='company_logos/', blank=True, null=True)
-    cover_image = models.ImageField('Cover Image', upload_to='company_covers/', blank=True, null=True)
+    logo = models.ImageField('Logo', upload_to='company_logos/', storage=get_content_storage, blank=True, null=True)
+    cover_image = models.ImageField('Cover Image', upload_to='company_covers/', storage=get_content_storage,
+                                    blank=True, null=True)
     description = models.TextField('Description', blank=True, null=True)
     website = models.URLField('Website', blank=True, null=True)
     industry = models.CharField('Industry', max_length=100, blank=True, null=True)
@@ -114,6 +117,14 @@ class Job(models.Model):
         verbose_name = 'Job'
         verbose_name_plural = 'Jobs'
         ordering = ['-created_at']
+        indexes = [
+            # Public listing: published jobs, featured first, newest first
+            models.Index(fields=['status', 'is_featured', 'created_at'], name='jobs_job_listing_idx'),
+            models.Index(fields=['status', 'created_at'], name='jobs_job_status_created_idx'),
+            models.Index(fields=['created_at'], name='jobs_job_created_idx'),
+            models.Index(fields=['company', 'status'], name='jobs_job_company_status_idx'),
+            models.Index(fields=['posted_by', 'created_at'], name='jobs_job_poster_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} at {self.company.name}"
@@ -124,6 +135,46 @@ class Job(models.Model):
         self.save()
 
 
+class JobCounterShard(models.Model):
+    """Increments of a Job counter not yet rolled up into the Job row (see jobs/counters.py)"""
+    
+    COUNTER_CHOICES = [
+        ('views', 'Views'),
+        ('applications', 'Applications'),
+    ]
+    
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='counter_shards')
+    counter = models.CharField('Counter', max_length=20, choices=COUNTER_CHOICES)
+    shard = models.PositiveSmallIntegerField('Shard')
+    delta = models.IntegerField('Pending Increments', default=0)
+    
+    class Meta:
+        verbose_name = 'Job Counter Shard'
+        verbose_name_plural = 'Job Counter Shards'
+        unique_together = ['job', 'counter', 'shard']
+    
+    def __str__(self):
+        return f"{self.job_id} {self.counter}[{self.shard}] +{self.delta}"
+
+
+class JobSkill(models.Model):
+    """Indexed job <-> canonical skill link, kept in sync with Job.skills"""
+    
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='skill_links')
+    skill = models.ForeignKey('core.CanonicalSkill', on_delete=models.CASCADE, related_name='job_links')
+    
+    class Meta:
+        verbose_name = 'Job Skill'
+        verbose_name_plural = 'Job Skills'
+        unique_together = ['job', 'skill']
+        indexes = [
+            models.Index(fields=['skill', 'job'], name='jobs_jobskill_skill_job_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.job_id} - {self.skill_id}"
+
+
 class Application(models.Model):
     """Job application model"""
     
@@ -162,6 +213,12 @@ class Application(models.Model):
         verbose_name_plural = 'Applications'
         ordering = ['-created_at']
         unique_together = ['job', 'applicant']
+        indexes = [
+            models.Index(fields=['applicant', 'created_at'], name='jobs_app_applicant_created_idx'),
+            models.Index(fields=['applicant', 'status'], name='jobs_app_applicant_status_idx'),
+            models.Index(fields=['status', 'created_at'], name='jobs_app_status_created_idx'),
+            models.Index(fields=['created_at'], name='jobs_app_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.applicant.full_name} - {self.job.title}"
@@ -170,11 +227,26 @@ class Application(models.Model):
 class Resume(models.Model):
     """Resume/CV model"""
     
+    EXTRACTION_STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+        ('unsupported', 'Unsupported Format'),
+    ]
+    
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='resumes')
     name = models.CharField('Resume Name', max_length=255)
-    file = models.FileField('Resume File', upload_to='resumes/')
+    file = models.FileField('Resume File', upload_to='resumes/', storage=get_content_storage)
     is_primary = models.BooleanField('Primary Resume', default=False)
     
+    # Extracted text, filled in by the background extraction task
+    text = models.TextField('Extracted Text', blank=True, default='')
+    content_hash = models.CharField('Content Hash', max_length=64, blank=True, default='', db_index=True,
+                                    help_text='SHA-256 of the file contents')
+    extraction_status = models.CharField('Extraction Status', max_length=20, choices=EXTRACTION_STATUS_CHOICES,
+                                         default='pending')
+    extracted_at = models.DateTimeField('Extracted At', blank=True, null=True)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -186,10 +258,50 @@ class Resume(models.Model):
     def __str__(self):
         return f"{self.name} - {self.user.full_name}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored file so save() can tell when a new one is attached
+        instance._saved_file_name = instance.__dict__.get('file', models.DEFERRED)
+        return instance
+    
     def save(self, *args, **kwargs):
         if self.is_primary:
             Resume.objects.filter(user=self.user, is_primary=True).update(is_primary=False)
+        saved_file_name = getattr(self, '_saved_file_name', None)
+        file_changed = (
+            saved_file_name is not models.DEFERRED and bool(self.file) and self.file.name != saved_file_name
+        )
+        if file_changed:
+            self.extraction_status = 'pending'
         super().save(*args, **kwargs)
+        if file_changed:
+            self._saved_file_name = self.file.name
+            self.queue_text_extraction()
+    
+    def queue_text_extraction(self):
+        """Extract and index this resume's text once the current transaction commits"""
+        from taskqueue.registry import enqueue_on_commit
+        enqueue_on_commit(
+            'jobs.tasks.extract_resume_text', self.pk,
+            idempotency_key=f"resume-text:{self.pk}:{self.file.name}"[:255],
+        )
+
+
+class ResumeTerm(models.Model):
+    """Inverted index entry: a normalized term occurring in a resume"""
+    
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='terms')
+    term = models.CharField('Term', max_length=64)
+    frequency = models.PositiveIntegerField('Frequency', default=1)
+    
+    class Meta:
+        verbose_name = 'Resume Term'
+        verbose_name_plural = 'Resume Terms'
+        unique_together = ['term', 'resume']
+    
+    def __str__(self):
+        return f"{self.term} ({self.frequency})"
 
 
 class SavedJob(models.Model):
@@ -228,6 +340,79 @@ class Message(models.Model):
         verbose_name = 'Message'
         verbose_name_plural = 'Messages'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['recipient', 'is_read'], name='jobs_message_unread_idx'),
+        ]
     
     def __str__(self):
         return f"From {self.sender.full_name} to {self.recipient.full_name}"
+
+
+class SavedSearch(models.Model):
+    """Job search saved by a user, re-evaluated against newly published jobs"""
+    
+    FILTER_KEYS = ['search', 'job_type', 'experience_level', 'is_remote', 'location',
+                   'salary_min', 'salary_max', 'skills', 'is_featured']
+    
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='saved_searches')
+    name = models.CharField('Name', max_length=255)
+    filters = models.JSONField('Filters', default=dict, blank=True, help_text='JobViewSet query parameters')
+    is_active = models.BooleanField('Alerts Enabled', default=True)
+    last_matched_at = models.DateTimeField('Last Matched At', blank=True, null=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Saved Search'
+        verbose_name_plural = 'Saved Searches'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['is_active', 'id'], name='jobs_savedsearch_active_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} ({self.user.email})"
+
+
+class SavedSearchRun(models.Model):
+    """Bookkeeping for one pass of the saved-search matcher"""
+    
+    window_start = models.DateTimeField('Window Start')
+    window_end = models.DateTimeField('Window End')
+    jobs_evaluated = models.IntegerField('Jobs Evaluated', default=0)
+    searches_matched = models.IntegerField('Searches Matched', default=0)
+    digests_created = models.IntegerField('Digests Created', default=0)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Saved Search Run'
+        verbose_name_plural = 'Saved Search Runs'
+        ordering = ['-window_end']
+    
+    def __str__(self):
+        return f"{self.window_start} - {self.window_end}"
+
+
+class JobAlertDigest(models.Model):
+    """Per-user digest of new jobs matching their saved searches"""
+    
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='job_alert_digests')
+    run = models.ForeignKey(SavedSearchRun, on_delete=models.SET_NULL, null=True, blank=True, related_name='digests')
+    matches = models.JSONField('Matches', default=list, help_text='[{"saved_search": id, "jobs": [ids]}]')
+    jobs_count = models.IntegerField('Jobs', default=0)
+    is_read = models.BooleanField('Read', default=False)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Job Alert Digest'
+        verbose_name_plural = 'Job Alert Digests'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'is_read', 'created_at'], name='jobs_alertdigest_user_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.jobs_count} new jobs for {self.user.email}"
@@ -0,0 +1,181 @@
+"""
+Resume text extraction and search index.
+
+When a resume file is attached, ``Resume.save`` queues the
+``extract_resume_text`` task. The task hashes the file while reading it,
+extracts plain text from PDF (pypdf) or DOCX (read directly from the
+document XML), stores the normalized text on the resume and rewrites its
+``ResumeTerm`` rows. Searching is then a lookup on the indexed
+``ResumeTerm.term`` column rather than a scan of resume files or text.
+"""
+import hashlib
+import io
+import logging
+import re
+import unicodedata
+import zipfile
+from collections import Counter
+from xml.etree import ElementTree
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from .models import Resume, ResumeTerm
+
+
+logger = logging.getLogger(__name__)
+
+
+class UnsupportedResumeFormat(Exception):
+    pass
+
+
+# Tokens keep the punctuation that matters in skills: c++, c#, node.js, .net
+TOKEN_RE = re.compile(r'[a-z0-9+#]+(?:\.[a-z0-9+#]+)*')
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the
+this to was were will with i me my we our you your he she they them their
+""".split())
+
+MAX_TERM_LENGTH = 64
+
+SNIPPET_RADIUS = 80
+
+DOCX_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def normalize_text(text):
+    """Unicode-normalize and collapse whitespace, keeping paragraph breaks"""
+    text = unicodedata.normalize('NFKC', text or '')
+    lines = (' '.join(line.split()) for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def tokenize(text):
+    """Lowercased index terms for ``text``, in order of appearance"""
+    terms = []
+    for token in TOKEN_RE.findall(unicodedata.normalize('NFKC', text or '').lower()):
+        token = token.strip('.')
+        if len(token) < 2 and token not in ('c', 'r'):
+            continue
+        if token in STOPWORDS:
+            continue
+        terms.append(token[:MAX_TERM_LENGTH])
+    return terms
+
+
+def _pdf_text(data):
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    return '\n'.join(page.extract_text() or '' for page in reader.pages)
+
+
+def _docx_text(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        root = ElementTree.fromstring(archive.read('word/document.xml'))
+    paragraphs = []
+    for paragraph in root.iter(f'{DOCX_NAMESPACE}p'):
+        paragraphs.append(''.join(node.text or '' for node in paragraph.iter(f'{DOCX_NAMESPACE}t')))
+    return '\n'.join(paragraphs)
+
+
+def extract_text(data, filename=''):
+    """Plain text of a PDF, DOCX or text resume given its raw bytes"""
+    if data.startswith(b'%PDF'):
+        return _pdf_text(data)
+    if data.startswith(b'PK') and zipfile.is_zipfile(io.BytesIO(data)):
+        return _docx_text(data)
+    if filename.lower().endswith('.txt'):
+        return data.decode('utf-8', errors='replace')
+    raise UnsupportedResumeFormat(filename)
+
+
+def read_resume_file(resume):
+    """Return ``(data, sha256 hex digest)`` for a resume's file"""
+    digest = hashlib.sha256()
+    buffer = io.BytesIO()
+    with resume.file.open('rb') as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+            digest.update(chunk)
+            buffer.write(chunk)
+    return buffer.getvalue(), digest.hexdigest()
+
+
+def write_terms(resume, text):
+    """Replace the ResumeTerm rows of ``resume`` with the terms of ``text``"""
+    counts = Counter(tokenize(text))
+    with transaction.atomic():
+        ResumeTerm.objects.filter(resume=resume).delete()
+        ResumeTerm.objects.bulk_create(
+            [ResumeTerm(resume=resume, term=term, frequency=count) for term, count in counts.items()],
+            batch_size=1000,
+        )
+    return len(counts)
+
+
+def index_resume(resume, force=False):
+    """Extract, store and index the text of one resume. Returns the new status."""
+    data, content_hash = read_resume_file(resume)
+    if not force and resume.extraction_status == 'done' and resume.content_hash == content_hash:
+        return resume.extraction_status
+
+    # Identical files (re-uploads, copies) reuse text already extracted
+    twin = (
+        Resume.objects.filter(content_hash=content_hash, extraction_status='done')
+        .exclude(pk=resume.pk).only('text').first()
+    )
+    try:
+        text = twin.text if twin else normalize_text(extract_text(data, resume.file.name))
+        status = 'done'
+    except UnsupportedResumeFormat:
+        text, status = '', 'unsupported'
+    except Exception:
+        logger.exception("Could not extract text from resume #%s", resume.pk)
+        text, status = '', 'failed'
+
+    with transaction.atomic():
+        Resume.objects.filter(pk=resume.pk).update(
+            text=text, content_hash=content_hash, extraction_status=status, extracted_at=timezone.now(),
+        )
+        write_terms(resume, text)
+    resume.text, resume.content_hash, resume.extraction_status = text, content_hash, status
+    return status
+
+
+def search_resumes(query, resumes=None):
+    """Rank resumes containing *every* term of ``query``.
+
+    Returns a queryset of ``{'resume_id', 'score'}`` dicts, best first, where
+    the score is the summed frequency of the query terms. ``resumes`` can be
+    a Resume queryset restricting the search.
+    """
+    terms = set(tokenize(query))
+    if not terms:
+        return ResumeTerm.objects.none().values('resume_id')
+    matches = ResumeTerm.objects.filter(term__in=terms)
+    if resumes is not None:
+        matches = matches.filter(resume__in=resumes)
+    return (
+        matches.values('resume_id')
+        .annotate(matched=Count('term'), score=Sum('frequency'))
+        .filter(matched=len(terms))
+        .order_by('-score', '-resume_id')
+    )
+
+
+def make_snippet(text, query):
+    """A short excerpt of ``text`` around the first query term it contains"""
+    lowered = text.lower()
+    positions = [lowered.find(term) for term in tokenize(query)]
+    positions = [position for position in positions if position >= 0]
+    if not positions:
+        return text[:SNIPPET_RADIUS * 2]
+    start = max(min(positions) - SNIPPET_RADIUS, 0)
+    end = min(start + SNIPPET_RADIUS * 2, len(text))
+    snippet = ' '.join(text[start:end].split())
+    return f"{'…' if start else ''}{snippet}{'…' if end < len(text) else ''}"
@@ -0,0 +1,292 @@
+"""
+Resume PDF rendering service.
+
+Profile data is loaded in batches (five queries per batch, not per user) and
+handed as plain dicts to a pool of renderer processes. Each renderer keeps
+its ReportLab stylesheet in a per-process cache, renders into a spooled
+temporary file and streams it straight to media storage; the parent
+then records the stored files on ``Resume`` rows in bulk.
+
+ReportLab is imported lazily so that web workers which never render a PDF
+do not pay for it.
+"""
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from tempfile import SpooledTemporaryFile
+from xml.sax.saxutils import escape
+
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.db import connections, transaction
+
+from core.models import Experience, Education, Skill, Certification
+from core.storage import add_references, remove_references
+from .models import Resume
+
+
+User = get_user_model()
+
+# Rendered PDFs stay in memory up to this size before spilling to disk
+SPOOL_MAX_SIZE = 1024 * 1024
+
+MAX_SKILLS = 12
+
+
+@lru_cache(maxsize=1)
+def get_styles():
+    """ParagraphStyles used by the resume template, built once per process"""
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+    styles = getSampleStyleSheet()
+    return {
+        'title': ParagraphStyle(
+            'CustomTitle', parent=styles['Heading1'], fontSize=24,
+            textColor=colors.HexColor('#1e293b'), spaceAfter=6,
+            alignment=TA_CENTER, fontName='Helvetica-Bold',
+        ),
+        'subtitle': ParagraphStyle(
+            'CustomSubtitle', parent=styles['Normal'], fontSize=11,
+            textColor=colors.HexColor('#64748b'), spaceAfter=20, alignment=TA_CENTER,
+        ),
+        'heading': ParagraphStyle(
+            'CustomHeading', parent=styles['Heading2'], fontSize=14,
+            textColor=colors.HexColor('#0f172a'), spaceAfter=8, spaceBefore=16,
+            fontName='Helvetica-Bold',
+        ),
+        'body': ParagraphStyle(
+            'CustomBody', parent=styles['Normal'], fontSize=10,
+            textColor=colors.HexColor('#334155'), spaceAfter=8, leading=14,
+        ),
+        'job_title': ParagraphStyle(
+            'JobTitle', parent=styles['Normal'], fontSize=11,
+            textColor=colors.HexColor('#0f172a'), fontName='Helvetica-Bold', spaceAfter=2,
+        ),
+        'company': ParagraphStyle(
+            'Company', parent=styles['Normal'], fontSize=10,
+            textColor=colors.HexColor('#475569'), spaceAfter=4,
+        ),
+    }
+
+
+def load_resume_data(user_ids):
+    """Return ``{user_id: profile dict}`` for a batch of users"""
+    data = {}
+    for user in User.objects.filter(id__in=user_ids).values(
+        'id', 'first_name', 'last_name', 'email', 'phone', 'location', 'bio',
+    ):
+        user.update(skills=[], experiences=[], educations=[], certifications=[])
+        data[user['id']] = user
+
+    for user_id, name in Skill.objects.filter(user_id__in=user_ids).order_by('id').values_list('user_id', 'name'):
+        data[user_id]['skills'].append(name)
+    for row in Experience.objects.filter(user_id__in=user_ids).order_by('-start_date').values(
+        'user_id', 'title', 'company', 'start_date', 'end_date', 'description',
+    ):
+        data[row['user_id']]['experiences'].append(row)
+    for row in Education.objects.filter(user_id__in=user_ids).order_by('-start_date').values(
+        'user_id', 'degree', 'field_of_study', 'institution', 'start_date', 'end_date', 'description',
+    ):
+        data[row['user_id']]['educations'].append(row)
+    for row in Certification.objects.filter(user_id__in=user_ids).order_by('id').values(
+        'user_id', 'name', 'issuing_organization', 'issue_date',
+    ):
+        data[row['user_id']]['certifications'].append(row)
+    return data
+
+
+def build_story(profile):
+    """Flowables for one resume"""
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, Spacer
+
+    styles = get_styles()
+    elements = []
+
+    full_name = f"{profile['first_name']} {profile['last_name']}"
+    elements.append(Paragraph(escape(full_name.upper()), styles['title']))
+
+    contact_parts = [escape(part) for part in (profile['email'], profile['phone'], profile['location']) if part]
+    elements.append(Paragraph(' • '.join(contact_parts), styles['subtitle']))
+
+    if profile['bio']:
+        elements.append(Paragraph('PROFESSIONAL SUMMARY', styles['heading']))
+        elements.append(Paragraph(escape(profile['bio']), styles['body']))
+        elements.append(Spacer(1, 0.1 * inch))
+
+    if profile['skills']:
+        elements.append(Paragraph('SKILLS', styles['heading']))
+        elements.append(Paragraph(escape(' • '.join(profile['skills'][:MAX_SKILLS])), styles['body']))
+        elements.append(Spacer(1, 0.1 * inch))
+
+    if profile['experiences']:
+        elements.append(Paragraph('WORK EXPERIENCE', styles['heading']))
+        for exp in profile['experiences']:
+            elements.append(Paragraph(escape(exp['title']), styles['job_title']))
+            end_date = exp['end_date'].strftime('%B %Y') if exp['end_date'] else 'Present'
+            company_line = f"{exp['company']} | {exp['start_date'].strftime('%B %Y')} - {end_date}"
+            elements.append(Paragraph(escape(company_line), styles['company']))
+            if exp['description']:
+                elements.append(Paragraph(escape(exp['description']), styles['body']))
+            elements.append(Spacer(1, 0.1 * inch))
+
+    if profile['educations']:
+        elements.append(Paragraph('EDUCATION', styles['heading']))
+        for edu in profile['educations']:
+            elements.append(Paragraph(escape(f"{edu['degree']} in {edu['field_of_study']}"), styles['job_title']))
+            end_date = edu['end_date'].strftime('%Y') if edu['end_date'] else 'Present'
+            edu_line = f"{edu['institution']} | {edu['start_date'].strftime('%Y')} - {end_date}"
+            elements.append(Paragraph(escape(edu_line), styles['company']))
+            if edu['description']:
+                elements.append(Paragraph(escape(edu['description']), styles['body']))
+            elements.append(Spacer(1, 0.1 * inch))
+
+    if profile['certifications']:
+        elements.append(Paragraph('CERTIFICATIONS', styles['heading']))
+        for cert in profile['certifications']:
+            cert_text = f"<b>{escape(cert['name'])}</b> - {escape(cert['issuing_organization'])}"
+            if cert['issue_date']:
+                cert_text += f" ({cert['issue_date'].strftime('%B %Y')})"
+            elements.append(Paragraph(cert_text, styles['body']))
+        elements.append(Spacer(1, 0.1 * inch))
+
+    return elements
+
+
+def render_pdf(profile, output):
+    """Render one resume into a writable binary file object"""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate
+
+    doc = SimpleDocTemplate(
+        output, pagesize=letter,
+        rightMargin=0.75 * inch, leftMargin=0.75 * inch,
+        topMargin=0.75 * inch, bottomMargin=0.75 * inch,
+    )
+    doc.build(build_story(profile))
+
+
+def resume_filename(profile):
+    return f"{profile['first_name']}_{profile['last_name']}_Resume.pdf"
+
+
+def render_to_storage(profile):
+    """Render a resume and stream it to storage. Returns ``(user_id, name, error)``."""
+    try:
+        with SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as output:
+            render_pdf(profile, output)
+            output.seek(0)
+            field = Resume._meta.get_field('file')
+            name = field.storage.save(field.generate_filename(None, resume_filename(profile)), File(output))
+        return profile['id'], name, None
+    except Exception as e:
+        return profile['id'], None, str(e)
+
+
+def save_rendered(results, profiles):
+    """Point each user's primary Resume at its newly rendered file"""
+    rendered = {user_id: name for user_id, name, error in results if name}
+    if not rendered:
+        return 0, 0
+
+    existing = {
+        resume.user_id: resume
+        for resume in Resume.objects.filter(user_id__in=rendered, is_primary=True)
+    }
+    to_update = []
+    to_create = []
+    replaced = []
+    for user_id, name in rendered.items():
+        if user_id in existing:
+            resume = existing[user_id]
+            replaced.append(resume.file.name)
+            resume.file.name = name
+            to_update.append(resume)
+        else:
+            profile = profiles[user_id]
+            to_create.append(Resume(
+                user_id=user_id, file=name, is_primary=True,
+                name=f"{profile['first_name']} {profile['last_name']} - Professional Resume",
+            ))
+
+    with transaction.atomic():
+        # bulk_update bypasses auto_now, so refresh updated_at explicitly
+        for resume in to_update:
+            resume.updated_at = resume._meta.get_field('updated_at').pre_save(resume, add=False)
+            resume.extraction_status = 'pending'
+        Resume.objects.bulk_update(to_update, ['file', 'updated_at', 'extraction_status'])
+        Resume.objects.bulk_create(to_create)
+        # Bulk writes skip Resume.save() and its signals, so queue text
+        # extraction and update blob reference counts here
+        for resume in Resume.objects.filter(user_id__in=rendered, is_primary=True).only('id', 'file'):
+            resume.queue_text_extraction()
+        transaction.on_commit(lambda: (add_references(rendered.values()), remove_references(replaced)))
+    return len(to_create), len(to_update)
+
+
+def _init_renderer():
+    # Make sure renderers never reuse the parent's database connection, then
+    # warm the per-process style cache
+    for conn in connections.all(initialized_only=True):
+        conn.connection = None
+    get_styles()
+
+
+def render_resumes(user_ids, workers=None, batch_size=200, progress=None):
+    """Render primary resumes for ``user_ids``.
+
+    ``workers`` > 1 renders in a process pool; otherwise rendering happens in
+    the calling process. ``progress(done, total, elapsed)`` is called after
+    each batch. Returns a dict of counters.
+    """
+    user_ids = list(user_ids)
+    total = len(user_ids)
+    stats = {'created': 0, 'updated': 0, 'failed': 0, 'errors': []}
+    started = time.monotonic()
+    workers = workers or 1
+
+    executor = None
+    if workers > 1:
+        connections.close_all()
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('fork'),
+            initializer=_init_renderer,
+        )
+
+    try:
+        done = 0
+        for start in range(0, total, batch_size):
+            profiles = load_resume_data(user_ids[start:start + batch_size])
+            if executor:
+                results = list(executor.map(render_to_storage, profiles.values(), chunksize=max(1, len(profiles) // (workers * 4))))
+            else:
+                results = [render_to_storage(profile) for profile in profiles.values()]
+
+            created, updated = save_rendered(results, profiles)
+            stats['created'] += created
+            stats['updated'] += updated
+            for user_id, name, error in results:
+                if error:
+                    stats['failed'] += 1
+                    stats['errors'].append((user_id, error))
+
+            done += len(profiles)
+            if progress:
+                progress(done, total, time.monotonic() - started)
+    finally:
+        if executor:
+            executor.shutdown()
+    return stats
+
+
+def render_resume(user):
+    """Render a single user's primary resume in the calling process"""
+    stats = render_resumes([user.pk if hasattr(user, 'pk') else user])
+    if stats['errors']:
+        raise RuntimeError(stats['errors'][0][1])
+    return stats
@@ -0,0 +1,77 @@
+"""
+Job skill index.
+
+``Job.skills`` remains the JSON list returned by the API; ``JobSkill`` mirrors
+it as indexed (skill, job) rows so that skill filters are index lookups
+instead of JSON scans.
+"""
+from django.db import transaction
+from django.db.models import Count
+
+from core.cache import bump_version_on_commit
+from core.skills import resolve_skill_map, resolve_skills, skill_key, split_skills
+from .models import Job, JobSkill
+
+
+def normalize_job_skills(job):
+    """Rewrite ``job.skills`` to canonical names and return the skill objects"""
+    skills = resolve_skills(split_skills(job.skills))
+    job.skills = [skill.name for skill in skills]
+    return skills
+
+
+def sync_job_skills(job, skills=None):
+    """Make the JobSkill rows of a saved job match ``job.skills``"""
+    if skills is None:
+        skills = resolve_skills(split_skills(job.skills))
+    wanted = {skill.pk for skill in skills}
+    with transaction.atomic():
+        existing = set(JobSkill.objects.filter(job=job).values_list('skill_id', flat=True))
+        stale = existing - wanted
+        if stale:
+            JobSkill.objects.filter(job=job, skill_id__in=stale).delete()
+        JobSkill.objects.bulk_create(
+            [JobSkill(job=job, skill_id=skill_id) for skill_id in wanted - existing],
+            ignore_conflicts=True,
+        )
+
+
+def filter_jobs_by_skills(queryset, names):
+    """Restrict a Job queryset to jobs that require *all* of ``names``"""
+    requested = {skill_key(name) for name in names if skill_key(name)}
+    if not requested:
+        return queryset
+    resolved = resolve_skill_map(names, create=False)
+    if len(resolved) < len(requested):
+        # At least one requested skill is unknown, so nothing can match
+        return queryset.none()
+    skill_ids = {skill.pk for skill in resolved.values()}
+    matching = (
+        JobSkill.objects.filter(skill_id__in=skill_ids)
+        .values('job_id')
+        .annotate(matched=Count('skill_id'))
+        .filter(matched=len(skill_ids))
+        .values('job_id')
+    )
+    return queryset.filter(id__in=matching)
+
+
+def rebuild_skill_index(batch_size=500, stdout=None):
+    """Normalize every Job.skills value and rebuild the JobSkill table"""
+    total = 0
+    queryset = Job.objects.only('id', 'skills').order_by('id')
+    last_id = 0
+    while True:
+        batch = list(queryset.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            break
+        for job in batch:
+            skills = normalize_job_skills(job)
+            Job.objects.filter(pk=job.pk).update(skills=job.skills)
+            sync_job_skills(job, skills)
+        total += len(batch)
+        last_id = batch[-1].id
+        if stdout:
+            stdout.write(f"Indexed {total} jobs")
+    bump_version_on_commit('jobs')
+    return total
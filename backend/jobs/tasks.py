@@ -0,0 +1,43 @@
+from taskqueue.registry import task
+
+from .alerts import run_saved_search_alerts
+from .counters import fold_buffered_views, rollup_counters
+from .skill_index import rebuild_skill_index
+
+
+@task(max_attempts=1)
+def match_saved_searches():
+    """Run the saved-search alert matcher"""
+    run = run_saved_search_alerts()
+    return {'jobs_evaluated': run.jobs_evaluated, 'digests_created': run.digests_created}
+
+
+@task(max_attempts=1)
+def rollup_job_counters():
+    """Fold buffered views and pending counter shards into the Job rows"""
+    return {'jobs_viewed': fold_buffered_views(), 'shards': rollup_counters()}
+
+
+@task(max_attempts=1)
+def rebuild_job_skill_index():
+    """Re-normalize Job.skills and rebuild the JobSkill table"""
+    return {'jobs': rebuild_skill_index()}
+
+
+@task(max_attempts=2)
+def render_resume(user_id):
+    """Render a user's primary resume PDF from their profile"""
+    from .resume_rendering import render_resume as render
+    stats = render(user_id)
+    return {'created': stats['created'], 'updated': stats['updated']}
+
+
+@task
+def extract_resume_text(resume_id, force=False):
+    """Extract and index the text of an uploaded resume"""
+    from .models import Resume
+    from .resume_index import index_resume
+    resume = Resume.objects.filter(pk=resume_id).first()
+    if resume is None or not resume.file:
+        return {'status': 'missing'}
+    return {'status': index_resume(resume, force=force)}
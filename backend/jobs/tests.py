@@ -1,3 +1,241 @@
-from django.test import TestCase
+import contextlib
+import datetime
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.admin.sites import AdminSite
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from api.serializers import JobCreateUpdateSerializer
+from core.models import Certification, Education, Experience, Skill, StoredBlob, User
+from taskqueue.models import Task
+from .admin import ResumeAdmin
+from .alerts import COMMIT_GRACE, build_search_index, run_saved_search_alerts
+from .applications import AlreadyApplied, submit_application
+from .counters import live_count, rollup_counters
+from .matching import invalidate_job_index, recommend_jobs
+from .models import Application, Company, Job, JobAlertDigest, Resume, ResumeTerm, SavedSearch
+from .resume_rendering import load_resume_data, render_resume
+
+
+class ConcurrentApplicationTests(TransactionTestCase):
+    """Thousands of parallel applies to one job must count every application exactly once"""
+
+    APPLICANTS = 1000
+    ATTEMPTS_PER_APPLICANT = 2
+    WORKERS = 16
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # SQLite locks the whole database (an in-memory one fails outright
+        # with "table is locked"), so its writers take turns; the other
+        # backends get truly concurrent transactions
+        cls.write_lock = threading.Lock() if connection.vendor == 'sqlite' else contextlib.nullcontext()
+
+    def setUp(self):
+        company = Company.objects.create(name='Popular', slug='popular')
+        self.job = Job.objects.create(
+            title='Popular job', slug='popular-job', company=company, description='...',
+            location='Remote', status='published',
+        )
+        User.objects.bulk_create([
+            User(email=f'applicant{index}@example.com', password='!') for index in range(self.APPLICANTS)
+        ])
+        self.applicants = list(User.objects.order_by('id'))
+
+    def test_parallel_applies(self):
+        start = threading.Barrier(self.WORKERS)
+        results = {'created': 0, 'duplicates': 0}
+        lock = threading.Lock()
+
+        def apply(worker):
+            start.wait()
+            created = duplicates = 0
+            try:
+                # Every applicant is tried by several workers at about the same time
+                applicants = [
+                    applicant
+                    for attempt in range(self.ATTEMPTS_PER_APPLICANT)
+                    for applicant in self.applicants[(worker + attempt) % self.WORKERS::self.WORKERS]
+                ]
+                for applicant in applicants:
+                    try:
+                        with self.write_lock:
+                            submit_application(applicant, self.job, cover_letter='Hello')
+                        created += 1
+                    except AlreadyApplied:
+                        duplicates += 1
+            finally:
+                connections.close_all()
+            with lock:
+                results['created'] += created
+                results['duplicates'] += duplicates
+
+        with ThreadPoolExecutor(self.WORKERS) as pool:
+            list(pool.map(apply, range(self.WORKERS)))
+
+        self.assertEqual(results['created'], self.APPLICANTS)
+        self.assertEqual(results['duplicates'], self.APPLICANTS * (self.ATTEMPTS_PER_APPLICANT - 1))
+        self.assertEqual(Application.objects.filter(job=self.job).count(), self.APPLICANTS)
+        job = Job.objects.get(pk=self.job.pk)
+        self.assertEqual(live_count(job, 'applications'), self.APPLICANTS)
+
+        rollup_counters()
+        job = Job.objects.get(pk=self.job.pk)
+        self.assertEqual(job.applications_count, self.APPLICANTS)
+        self.assertEqual(live_count(job, 'applications'), self.APPLICANTS)
+
+
+class RecommendJobsTests(TestCase):
+    def setUp(self):
+        invalidate_job_index()
+        self.user = User.objects.create_user(email='seeker@example.com', password='password123')
+        company = Company.objects.create(name='Acme', slug='acme')
+        self.jobs = [
+            Job.objects.create(
+                title=f'Job {index}', slug=f'job-{index}', company=company, description='...',
+                location='Remote', status='published', skills=['Python'],
+            )
+            for index in range(5)
+        ]
+
+    def test_closed_and_applied_jobs_do_not_shorten_the_list(self):
+        self.assertEqual(len(recommend_jobs(self.user, limit=5)), 5)
+
+        Application.objects.create(job=self.jobs[0], applicant=self.user)
+        # A queryset update leaves the cached index stale until its TTL runs out
+        Job.objects.filter(pk__in=[self.jobs[1].pk, self.jobs[2].pk]).update(status='closed')
+
+        matches = recommend_jobs(self.user, limit=2)
+        self.assertEqual({job_id for job_id, _ in matches}, {self.jobs[3].pk, self.jobs[4].pk})
+
+
+class SavedSearchAlertTests(TestCase):
+    def test_job_published_after_creation_alerts_location_and_text_searches(self):
+        seeker = User.objects.create_user(email='seeker@example.com', password='password123')
+        by_location = SavedSearch.objects.create(user=seeker, name='Berlin', filters={'location': 'berlin'})
+        by_text = SavedSearch.objects.create(user=seeker, name='Python', filters={'search': 'python'})
+        SavedSearch.objects.create(user=seeker, name='Paris', filters={'location': 'paris'})
+        company = Company.objects.create(name='Acme', slug='acme')
+        job = Job.objects.create(
+            title='Python developer', slug='python-developer', company=company, description='...',
+            location='Berlin, Germany', status='draft',
+        )
+        run_saved_search_alerts()
+
+        serializer = JobCreateUpdateSerializer(job, data={'status': 'published'}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        self.assertIsNotNone(Job.objects.get(pk=job.pk).published_at)
+
+        # Location and text searches are indexed, not evaluated against every job
+        self.assertNotIn(('any', None), build_search_index().buckets)
+        # Too recent: the publishing transaction may not have committed yet
+        self.assertEqual(run_saved_search_alerts().jobs_evaluated, 0)
+        run_saved_search_alerts(now=timezone.now() + COMMIT_GRACE)
+        run_saved_search_alerts(now=timezone.now() + COMMIT_GRACE)
+        digest = JobAlertDigest.objects.get(user=seeker)
+        self.assertEqual(
+            sorted(match['saved_search'] for match in digest.matches), sorted([by_location.pk, by_text.pk]),
+        )
+
+
+class ResumeRenderingTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        media = override_settings(MEDIA_ROOT=directory.name)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.users = [
+            User.objects.create_user(
+                email=f'seeker{index}@example.com', password='password123',
+                first_name='Ada', last_name=f'Smith & <Sons> {index}', bio='Builds <things> & ships them',
+            )
+            for index in range(2)
+        ]
+        for user in self.users:
+            Skill.objects.create(user=user, name='Python')
+            Experience.objects.create(
+                user=user, company='Acme', title='Engineer', start_date=datetime.date(2020, 1, 1),
+                description='Did work',
+            )
+            Education.objects.create(
+                user=user, institution='State', degree='bachelor', field_of_study='CS',
+                start_date=datetime.date(2015, 9, 1),
+            )
+            Certification.objects.create(
+                user=user, name='Cloud', issuing_organization='Vendor', issue_date=datetime.date(2021, 5, 1),
+            )
+
+    def test_profiles_load_in_a_fixed_number_of_queries(self):
+        with self.assertNumQueries(5):
+            profiles = load_resume_data([user.pk for user in self.users])
+        self.assertEqual(set(profiles), {user.pk for user in self.users})
+        profile = profiles[self.users[0].pk]
+        self.assertEqual(profile['skills'], ['Python'])
+        self.assertEqual([row['company'] for row in profile['experiences']], ['Acme'])
+        self.assertEqual([row['institution'] for row in profile['educations']], ['State'])
+        self.assertEqual([row['name'] for row in profile['certifications']], ['Cloud'])
+
+    def test_render_stores_a_pdf_blob_and_rerender_updates_the_primary_resume(self):
+        user = self.users[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            stats = render_resume(user)
+        self.assertEqual((stats['created'], stats['updated'], stats['failed']), (1, 0, 0))
+
+        resume = Resume.objects.get(user=user, is_primary=True)
+        self.assertTrue(resume.file.name.startswith('cas/'))
+        with resume.file.open('rb') as pdf:
+            self.assertEqual(pdf.read(5), b'%PDF-')
+        self.assertEqual(StoredBlob.objects.get(name=resume.file.name).ref_count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            stats = render_resume(user)
+        self.assertEqual((stats['created'], stats['updated']), (0, 1))
+        resume = Resume.objects.get(user=user, is_primary=True)
+        self.assertEqual(resume.extraction_status, 'pending')
+        self.assertEqual(StoredBlob.objects.get(name=resume.file.name).ref_count, 1)
+        self.assertEqual(sum(StoredBlob.objects.values_list('ref_count', flat=True)), 1)
+
+
+class ResumeAdminSearchTests(TestCase):
+    def test_content_matches_stay_within_the_changelist_filters(self):
+        user = User.objects.create_user(email='seeker@example.com', password='password123')
+        primary = Resume.objects.create(user=user, name='Main', file='resumes/main.pdf', is_primary=True)
+        other = Resume.objects.create(user=user, name='Old', file='resumes/old.pdf')
+        by_name = Resume.objects.create(user=user, name='Kubernetes CV', file='resumes/k8s.pdf')
+        for resume in (primary, other):
+            ResumeTerm.objects.create(resume=resume, term='kubernetes')
+
+        model_admin = ResumeAdmin(Resume, AdminSite())
+        request = RequestFactory().get('/admin/jobs/resume/')
+        filtered = Resume.objects.exclude(pk=other.pk)
+        results, _ = model_admin.get_search_results(request, filtered, 'kubernetes')
+        self.assertEqual(set(results), {primary, by_name})
+
+
+class IndexResumesCommandTests(TestCase):
+    def test_reindexing_queues_forced_extraction_every_run(self):
+        user = User.objects.create_user(email='seeker@example.com', password='password123')
+        resume = Resume.objects.create(user=user, name='Main', file='resumes/main.pdf')
+        Resume.objects.filter(pk=resume.pk).update(extraction_status='done')
+        Task.objects.create(
+            name='jobs.tasks.extract_resume_text', args=[resume.pk], status='failed', run_at=timezone.now(),
+            idempotency_key=f'resume-text:{resume.pk}:{resume.file.name}',
+        )
+
+        call_command('index_resumes', stdout=StringIO())
+        self.assertEqual(Task.objects.filter(status='queued').count(), 0)
+        call_command('index_resumes', '--all', stdout=StringIO())
+        call_command('index_resumes', '--all', stdout=StringIO())
+        queued = Task.objects.filter(name='jobs.tasks.extract_resume_text', status='queued')
+        self.assertEqual(queued.count(), 2)
+        self.assertTrue(all(task.kwargs == {'force': True} for task in queued))
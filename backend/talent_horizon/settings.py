@@ -5,8 +5,6 @@ Django settings for talent_horizon project.
 from pathlib import Path
 from datetime import timedelta
 import os
-import pymysql
-pymysql.install_as_MySQLdb()
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -47,6 +45,7 @@ INSTALLED_APPS = [
     'financial',
     'api',
     'admin_panel',
+    'taskqueue',
 ]
 
 MIDDLEWARE = [
@@ -57,6 +56,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.db_router.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -86,20 +86,101 @@ WSGI_APPLICATION = 'talent_horizon.wsgi.application'
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
 # Use MySQL database (shared with frontend)
+# Django's MySQL backend plus connection metrics and an optional pool
+# (core/db_backends/mysql). Connections are kept open between requests for
+# DB_CONN_MAX_AGE seconds and pinged before reuse; with DB_POOL_SIZE set they
+# are instead returned to a per-process pool after every request, which also
+# lets threads share them.
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.mysql',
+        'ENGINE': 'core.db_backends.mysql',
         'NAME': 'talent_horizon',
         'USER': 'root',
         'PASSWORD': '',
         'HOST': 'localhost',
         'PORT': '3306',
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
         'OPTIONS': {
             'charset': 'utf8mb4',
         },
     }
 }
 
+if os.environ.get('DB_POOL_SIZE'):
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {'max_size': int(os.environ['DB_POOL_SIZE'])}
+
+# Read replicas of 'default': DATABASE_REPLICAS='host[:port][=weight],...'
+# become aliases replica1, replica2, ... that serve the list/retrieve API
+# actions and admin lists (core/db_router.py). Override DATABASES and
+# DATABASE_REPLICAS directly for anything else, e.g. two SQLite files locally.
+DATABASE_REPLICAS = {}
+for _index, _spec in enumerate(filter(None, os.environ.get('DATABASE_REPLICAS', '').split(',')), 1):
+    _address, _, _weight = _spec.strip().partition('=')
+    _host, _, _port = _address.partition(':')
+    DATABASES[f'replica{_index}'] = {
+        **DATABASES['default'],
+        'HOST': _host,
+        'PORT': _port or DATABASES['default']['PORT'],
+        'OPTIONS': {**DATABASES['default']['OPTIONS'], 'connect_timeout': 2},
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS[f'replica{_index}'] = int(_weight or 1)
+
+DATABASE_ROUTERS = ['core.db_router.ReplicaRouter']
+# A writer reads from 'default' for this long after its write
+DATABASE_REPLICA_STICKY_SECONDS = int(os.environ.get('DATABASE_REPLICA_STICKY_SECONDS', 10))
+# Replicas lagging more than this many seconds are skipped (MySQL)
+DATABASE_REPLICA_MAX_LAG = int(os.environ.get('DATABASE_REPLICA_MAX_LAG', 5))
+DATABASE_REPLICA_CHECK_INTERVAL = 10
+# Writes that do not make their request sticky: view counters are never read back
+DATABASE_REPLICA_UNTRACKED_WRITES = ['jobs.jobcountershard']
+
+# MySQL has no partial indexes; the few conditional ones in Meta.indexes are
+# simply not created there and a plain composite index covers the query.
+SILENCED_SYSTEM_CHECKS = ['models.W037']
+
+
+# Cache
+# Two tiers: a per-process LRU ('local') in front of a cache shared by every
+# worker on the box ('shared'): files under CACHE_DIR, or Redis when
+# REDIS_URL is set. Values stay in process memory for at most LOCAL_TIMEOUT
+# seconds. See core/cache_backends.py.
+
+REDIS_URL = os.environ.get('REDIS_URL', '')
+
+CACHES = {
+    'default': {
+        'BACKEND': 'core.cache_backends.TieredCache',
+        'OPTIONS': {
+            'LOCAL': 'local',
+            'SHARED': 'shared',
+            'LOCAL_TIMEOUT': int(os.environ.get('CACHE_LOCAL_TIMEOUT', 5)),
+        },
+    },
+    'local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'talent-horizon',
+        'OPTIONS': {'MAX_ENTRIES': 2000},
+    },
+    'shared': {
+        'BACKEND': 'core.cache_backends.FileBasedCache',
+        'LOCATION': os.environ.get('CACHE_DIR', '/var/tmp/talent-horizon-cache'),
+        'KEY_PREFIX': os.environ.get('CACHE_KEY_PREFIX', 'th'),
+        'TIMEOUT': 300,
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+}
+
+if REDIS_URL:
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': os.environ.get('CACHE_KEY_PREFIX', 'th'),
+        'TIMEOUT': 300,
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -143,6 +224,39 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Protected downloads (resumes, tax documents) are handed off to the web server
+# when configured: '' (stream from Django), 'x-accel-redirect' (nginx) or
+# 'x-sendfile' (Apache/lighttpd). MEDIA_SENDFILE_URL is nginx's internal
+# location aliased to MEDIA_ROOT.
+MEDIA_SENDFILE_BACKEND = os.environ.get('MEDIA_SENDFILE_BACKEND', '')
+MEDIA_SENDFILE_URL = os.environ.get('MEDIA_SENDFILE_URL', '/protected-media/')
+
+# Seconds a cached public job/company API response is kept; writes invalidate
+# it sooner by bumping the cache version (api.caching)
+API_RESPONSE_CACHE_TIMEOUT = int(os.environ.get('API_RESPONSE_CACHE_TIMEOUT', 300))
+
+# Seconds a cached /api/auth/me/ profile is kept; profile writes invalidate it
+# sooner. Also bounds how long an avatar keeps pointing at the original image
+# after its thumbnails are generated.
+PROFILE_CACHE_TIMEOUT = int(os.environ.get('PROFILE_CACHE_TIMEOUT', 600))
+
+# Rows each job's application counter is spread over (jobs.counters); roll
+# them and the views buffered in the cache up into the job rows with
+# `manage.py rollup_job_counters` from cron
+JOB_COUNTER_SHARDS = int(os.environ.get('JOB_COUNTER_SHARDS', 16))
+
+# Audit log (core.audit): events are buffered per process and written in one
+# INSERT at the end of the request that recorded them, once this many are
+# waiting, or (outside requests) AUDIT_FLUSH_SECONDS after the first one.
+# Partition the table by month with `manage.py audit_partitions` from cron.
+AUDIT_BUFFER_SIZE = int(os.environ.get('AUDIT_BUFFER_SIZE', 500))
+AUDIT_FLUSH_SECONDS = float(os.environ.get('AUDIT_FLUSH_SECONDS', 1))
+
+# Chunked, resumable uploads (/api/uploads/): largest file accepted and how
+# long an idle session keeps its partial file
+CHUNKED_UPLOAD_MAX_SIZE = int(os.environ.get('CHUNKED_UPLOAD_MAX_SIZE', 100 * 1024 * 1024))
+CHUNKED_UPLOAD_EXPIRY = timedelta(hours=24)
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
@@ -169,6 +283,16 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    # orjson-backed when installed, DRF's stdlib JSON otherwise (api/renderers.py)
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 
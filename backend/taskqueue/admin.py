@@ -0,0 +1,25 @@
+from django.contrib import admin
+from django.utils import timezone
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ['id', 'name', 'status', 'priority', 'attempts', 'max_attempts', 'run_at', 'finished_at', 'created_at']
+    list_filter = ['status', 'name', 'created_at']
+    search_fields = ['name', 'idempotency_key', 'user__email']
+    ordering = ['-created_at']
+    raw_id_fields = ['user']
+    readonly_fields = ['created_at', 'updated_at', 'finished_at', 'locked_by', 'locked_at', 'result', 'last_error']
+    
+    actions = ['requeue_tasks', 'cancel_tasks']
+    
+    def requeue_tasks(self, request, queryset):
+        count = queryset.exclude(status='running').update(status='queued', attempts=0, run_at=timezone.now(), last_error=None)
+        self.message_user(request, f"{count} tasks requeued.")
+    requeue_tasks.short_description = "Requeue selected tasks"
+    
+    def cancel_tasks(self, request, queryset):
+        count = queryset.filter(status='queued').update(status='cancelled', finished_at=timezone.now())
+        self.message_user(request, f"{count} tasks cancelled.")
+    cancel_tasks.short_description = "Cancel selected tasks"
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from taskqueue.registry import registered_tasks
+from taskqueue.worker import Worker
+
+
+class Command(BaseCommand):
+    help = 'Run the background task worker pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=None, help='Worker processes (default: CPU count)')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to sleep when the queue is empty')
+        parser.add_argument('--once', action='store_true', help='Exit once the queue is drained')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Registered tasks: {', '.join(sorted(registered_tasks())) or 'none'}")
+        worker = Worker(
+            processes=options['processes'],
+            poll_interval=options['poll_interval'],
+            stdout=self.stdout,
+        )
+        worker.run(once=options['once'])
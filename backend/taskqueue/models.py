@@ -0,0 +1,49 @@
+from django.db import models
+from django.conf import settings
+
+
+class Task(models.Model):
+    """Unit of background work executed by ``manage.py run_task_worker``"""
+    
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+        ('cancelled', 'Cancelled'),
+    ]
+    
+    name = models.CharField('Task Name', max_length=255)
+    args = models.JSONField('Arguments', default=list, blank=True)
+    kwargs = models.JSONField('Keyword Arguments', default=dict, blank=True)
+    
+    status = models.CharField('Status', max_length=20, choices=STATUS_CHOICES, default='queued')
+    priority = models.IntegerField('Priority', default=0, help_text='Higher runs first')
+    idempotency_key = models.CharField('Idempotency Key', max_length=255, unique=True, blank=True, null=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='tasks')
+    
+    attempts = models.IntegerField('Attempts', default=0)
+    max_attempts = models.IntegerField('Max Attempts', default=3)
+    run_at = models.DateTimeField('Run At', help_text='Earliest time the task may start')
+    
+    locked_by = models.CharField('Locked By', max_length=255, blank=True, null=True)
+    locked_at = models.DateTimeField('Locked At', blank=True, null=True)
+    
+    result = models.JSONField('Result', blank=True, null=True)
+    last_error = models.TextField('Last Error', blank=True, null=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField('Finished At', blank=True, null=True)
+    
+    class Meta:
+        verbose_name = 'Task'
+        verbose_name_plural = 'Tasks'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', '-priority', 'run_at'], name='taskqueue_task_pending_idx'),
+            models.Index(fields=['status', 'locked_at'], name='taskqueue_task_locked_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
@@ -0,0 +1,88 @@
+"""
+Task registration and enqueueing.
+
+Functions decorated with ``@task`` in an app's ``tasks.py`` are registered
+under ``"<module>.<function>"`` and can then be queued from request code::
+
+    from taskqueue.registry import enqueue
+    enqueue(render_resume, user.id, idempotency_key=f"resume:{user.id}")
+
+Arguments must be JSON-serializable; pass ids rather than model instances.
+"""
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import Task
+
+
+_registry = {}
+
+
+class TaskNotRegistered(KeyError):
+    pass
+
+
+def task(func=None, *, name=None, max_attempts=3, priority=0):
+    """Register a function as a background task"""
+    def decorator(fn):
+        task_name = name or f"{fn.__module__}.{fn.__name__}"
+        fn.task_name = task_name
+        fn.max_attempts = max_attempts
+        fn.priority = priority
+        _registry[task_name] = fn
+        return fn
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def get_task(name):
+    try:
+        return _registry[name]
+    except KeyError:
+        raise TaskNotRegistered(name) from None
+
+
+def registered_tasks():
+    return dict(_registry)
+
+
+def enqueue(func_or_name, *args, priority=None, idempotency_key=None, delay=None,
+            max_attempts=None, user=None, **kwargs):
+    """Queue a registered task and return its Task row.
+
+    When ``idempotency_key`` matches an existing task, that task is returned
+    instead of queueing a duplicate.
+    """
+    name = getattr(func_or_name, 'task_name', func_or_name)
+    func = get_task(name)
+    fields = {
+        'name': name,
+        'args': list(args),
+        'kwargs': kwargs,
+        'priority': func.priority if priority is None else priority,
+        'max_attempts': func.max_attempts if max_attempts is None else max_attempts,
+        'run_at': timezone.now() + (delay or timedelta(0)),
+        'user': user,
+    }
+
+    if idempotency_key is None:
+        return Task.objects.create(**fields)
+
+    existing = Task.objects.filter(idempotency_key=idempotency_key).first()
+    if existing is not None:
+        return existing
+    try:
+        with transaction.atomic():
+            return Task.objects.create(idempotency_key=idempotency_key, **fields)
+    except IntegrityError:
+        # Another request queued the same key concurrently
+        return Task.objects.get(idempotency_key=idempotency_key)
+
+
+def enqueue_on_commit(func_or_name, *args, **kwargs):
+    """Queue a task once the surrounding transaction commits"""
+    transaction.on_commit(lambda: enqueue(func_or_name, *args, **kwargs))
@@ -0,0 +1,67 @@
+import multiprocessing
+import os
+import signal
+import time
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import Task
+from .worker import HEARTBEAT_INTERVAL, LOCK_TIMEOUT, Worker, requeue_stale_tasks
+
+
+def _killed():
+    os.kill(os.getpid(), signal.SIGKILL)
+
+
+class OrphanedTaskTests(TestCase):
+    def make_task(self, **fields):
+        fields = {
+            'locked_by': 'gone:1', 'locked_at': timezone.now() - timedelta(hours=1), 'max_attempts': 3, **fields,
+        }
+        return Task.objects.create(name='tests.noop', status='running', run_at=timezone.now(), **fields)
+
+    def test_requeue_counts_an_attempt_and_fails_the_last_one(self):
+        retried = self.make_task(attempts=0)
+        exhausted = self.make_task(attempts=2)
+
+        self.assertEqual(requeue_stale_tasks(), 1)
+
+        retried.refresh_from_db()
+        exhausted.refresh_from_db()
+        self.assertEqual((retried.status, retried.attempts, retried.locked_by), ('queued', 1, None))
+        self.assertEqual((exhausted.status, exhausted.attempts), ('failed', 3))
+        self.assertIsNotNone(exhausted.finished_at)
+
+    def test_killed_child_frees_its_slot(self):
+        worker = Worker(processes=1)
+        task = self.make_task(locked_by=worker.worker_id, locked_at=timezone.now())
+        process = multiprocessing.get_context('fork').Process(target=_killed)
+        process.start()
+        process.join()
+        worker.in_flight[task.pk] = process
+
+        worker._reap()
+
+        self.assertEqual(worker.in_flight, {})
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), ('queued', 1))
+        self.assertEqual(task.last_error, f'Worker process exited with code {-signal.SIGKILL}')
+
+    def test_tasks_still_running_here_are_kept_alive(self):
+        worker = Worker(processes=1)
+        long_running = self.make_task(locked_by=worker.worker_id)
+        process = multiprocessing.get_context('fork').Process(target=time.sleep, args=(5,))
+        process.start()
+        self.addCleanup(process.join)
+        self.addCleanup(process.kill)
+        worker.in_flight[long_running.pk] = process
+        worker.last_heartbeat -= HEARTBEAT_INTERVAL.total_seconds()
+
+        worker._heartbeat()
+
+        self.assertEqual(requeue_stale_tasks(), 0)
+        long_running.refresh_from_db()
+        self.assertEqual(long_running.status, 'running')
+        self.assertLess(timezone.now() - long_running.locked_at, LOCK_TIMEOUT)
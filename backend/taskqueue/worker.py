@@ -0,0 +1,221 @@
+"""
+Multiprocessing worker for the database-backed task queue.
+
+The parent process polls the ``Task`` table and claims runnable rows with a
+conditional UPDATE (so several workers can share one database without an
+external broker); each claimed task runs in a forked process of its own, with
+its own database connection, at most ``processes`` at a time. While they
+run, the parent refreshes their ``locked_at`` every ``HEARTBEAT_INTERVAL``;
+tasks whose lock goes ``LOCK_TIMEOUT`` without a refresh belonged to a worker
+that died and are released, however long a live task runs. A process that
+dies without recording its task's outcome (killed, out of memory, segfault)
+frees its slot and counts as a failed attempt, so a task that keeps crashing
+its process is eventually marked failed instead of retried forever.
+"""
+import logging
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import time
+import traceback
+from datetime import timedelta
+
+from django.db import close_old_connections, connections
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task
+from .registry import get_task
+
+
+logger = logging.getLogger(__name__)
+
+# Base delay for retries; attempt n waits BACKOFF_BASE * 2**(n-1) (+ jitter)
+BACKOFF_BASE = timedelta(seconds=10)
+BACKOFF_MAX = timedelta(hours=1)
+
+# The worker refreshes locked_at of the tasks its children are running this
+# often; running tasks not refreshed for LOCK_TIMEOUT are assumed orphaned
+HEARTBEAT_INTERVAL = timedelta(minutes=1)
+LOCK_TIMEOUT = timedelta(minutes=5)
+
+
+def backoff_delay(attempt):
+    delay = min(BACKOFF_BASE * (2 ** max(attempt - 1, 0)), BACKOFF_MAX)
+    return delay + timedelta(seconds=random.uniform(0, delay.total_seconds() * 0.1))
+
+
+def claim_tasks(worker_id, limit):
+    """Atomically mark up to ``limit`` runnable tasks as running for this worker"""
+    now = timezone.now()
+    candidates = list(
+        Task.objects.filter(status='queued', run_at__lte=now)
+        .order_by('-priority', 'run_at', 'id')
+        .values_list('id', flat=True)[:limit * 2]
+    )
+    claimed = []
+    for task_id in candidates:
+        updated = Task.objects.filter(id=task_id, status='queued').update(
+            status='running', locked_by=worker_id, locked_at=now,
+        )
+        if updated:
+            claimed.append(task_id)
+            if len(claimed) >= limit:
+                break
+    return claimed
+
+
+def release_tasks(tasks, error):
+    """Requeue the running ``tasks`` whose process went away, counting that as an attempt.
+
+    Tasks out of attempts are marked failed. Returns ``(requeued, failed)``.
+    """
+    now = timezone.now()
+    tasks = tasks.filter(status='running')
+    released = {'attempts': F('attempts') + 1, 'last_error': error, 'locked_by': None, 'locked_at': None}
+    failed = tasks.filter(attempts__gte=F('max_attempts') - 1).update(status='failed', finished_at=now, **released)
+    requeued = tasks.update(status='queued', run_at=now, **released)
+    return requeued, failed
+
+
+def requeue_stale_tasks():
+    """Return tasks orphaned by a crashed worker to the queue"""
+    cutoff = timezone.now() - LOCK_TIMEOUT
+    requeued, failed = release_tasks(
+        Task.objects.filter(locked_at__lt=cutoff), f'No heartbeat for {LOCK_TIMEOUT}; worker presumed dead',
+    )
+    if failed:
+        logger.error("Marked %s stale tasks failed after their last attempt", failed)
+    return requeued
+
+
+def execute_task(task_id):
+    """Run one claimed task and record its outcome. Safe to call in a child process."""
+    close_old_connections()
+    task = Task.objects.get(pk=task_id)
+    task.attempts += 1
+    try:
+        func = get_task(task.name)
+        result = func(*task.args, **task.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning("Task %s #%s failed (attempt %s/%s)", task.name, task.pk, task.attempts, task.max_attempts)
+        fields = {'attempts': task.attempts, 'last_error': error, 'locked_by': None, 'locked_at': None}
+        if task.attempts < task.max_attempts:
+            fields.update(status='queued', run_at=timezone.now() + backoff_delay(task.attempts))
+        else:
+            fields.update(status='failed', finished_at=timezone.now())
+        Task.objects.filter(pk=task.pk).update(**fields)
+        return False
+
+    try:
+        Task.objects.filter(pk=task.pk).update(
+            status='succeeded', attempts=task.attempts, result=result,
+            finished_at=timezone.now(), locked_by=None, locked_at=None,
+        )
+    except TypeError:
+        # Result is not JSON-serializable; keep its repr instead
+        Task.objects.filter(pk=task.pk).update(
+            status='succeeded', attempts=task.attempts, result=repr(result),
+            finished_at=timezone.now(), locked_by=None, locked_at=None,
+        )
+    return True
+
+
+def _init_child():
+    # Drop (without closing) any connection inherited from the parent so the
+    # child opens its own instead of sharing the parent's socket
+    for conn in connections.all(initialized_only=True):
+        conn.connection = None
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+
+def _run_child(task_id):
+    _init_child()
+    try:
+        execute_task(task_id)
+    finally:
+        connections.close_all()
+
+
+class Worker:
+    """Poll loop that runs claimed tasks in child processes"""
+
+    def __init__(self, processes=None, poll_interval=1.0, stdout=None):
+        self.processes = processes or os.cpu_count() or 1
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.stdout = stdout
+        self.stopping = False
+        # task id -> the process running it
+        self.in_flight = {}
+        self.last_heartbeat = time.monotonic()
+
+    def log(self, message):
+        if self.stdout:
+            self.stdout.write(message)
+
+    def stop(self, *args):
+        self.stopping = True
+
+    def run(self, once=False):
+        """Process tasks until stopped (or, with ``once``, until the queue is empty)"""
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        self.log(f"Worker {self.worker_id} started with {self.processes} processes")
+
+        last_stale_check = None
+        while not self.stopping:
+            self._reap()
+            self._heartbeat()
+            if last_stale_check is None or time.monotonic() - last_stale_check > LOCK_TIMEOUT.total_seconds() / 2:
+                requeued = requeue_stale_tasks()
+                if requeued:
+                    self.log(f"Requeued {requeued} stale tasks")
+                last_stale_check = time.monotonic()
+
+            free = self.processes - len(self.in_flight)
+            claimed = claim_tasks(self.worker_id, free) if free > 0 else []
+            for task_id in claimed:
+                process = context.Process(target=_run_child, args=(task_id,), name=f'task-{task_id}')
+                process.start()
+                self.in_flight[task_id] = process
+
+            if once and not claimed and not self.in_flight:
+                break
+            if not claimed:
+                time.sleep(self.poll_interval)
+
+        # Let running tasks finish, still vouching for them meanwhile
+        while self.in_flight:
+            self._reap()
+            self._heartbeat()
+            time.sleep(self.poll_interval)
+        self.log(f"Worker {self.worker_id} stopped")
+
+    def _heartbeat(self):
+        """Refresh the locks of the tasks still running here, so they are not taken for orphans"""
+        if not self.in_flight or time.monotonic() - self.last_heartbeat < HEARTBEAT_INTERVAL.total_seconds():
+            return
+        Task.objects.filter(pk__in=list(self.in_flight), status='running', locked_by=self.worker_id).update(
+            locked_at=timezone.now(),
+        )
+        self.last_heartbeat = time.monotonic()
+
+    def _reap(self):
+        for task_id, process in list(self.in_flight.items()):
+            if process.is_alive():
+                continue
+            process.join()
+            del self.in_flight[task_id]
+            if process.exitcode != 0:
+                logger.error("Worker process exited with code %s while running task #%s", process.exitcode, task_id)
+                release_tasks(
+                    Task.objects.filter(pk=task_id, locked_by=self.worker_id),
+                    f'Worker process exited with code {process.exitcode}',
+                )